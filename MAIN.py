@@ -1,90 +1,399 @@
-'''
-나라장터 개찰 데이터 분석 메인 실행 파일
-- main : 나라장터 데이터를 크롤링하고 처리하여 분석 결과를 저장하는 전체 흐름을 관리하는 함수
-'''
-
-from crawler import check_and_select_mode, update_mode
-from data_handler import calcul_winrate, filtering_underone, rankclass, get_final_df
-from company_info import get_companyinfo, filtering_data
-from spatial_analysis import matching_boundary, calcul_area, area_merge, save_analysis_result
-import os
-import sys
-import pandas as pd
-import shutil
-from tabulate import tabulate
-
-
-def main():
-    while True:
-        # 키워드 폴더 확인 및 모드 선택
-        search_word, selected_mode = check_and_select_mode()
-        if search_word == '#': continue  # 다시 키워드 입력 받음
-        elif search_word is None: return  # 프로그램 종료
-
-        # update_mode 함수 호출
-        result = update_mode(search_word, selected_mode)
-
-        # update_mode에서 None이 반환된 경우 처리
-        if result is None:
-            print("↩️데이터 처리 중 오류가 발생했습니다. 다시 시도하세요.")
-            continue
-
-        new_bid_df, pass_list, new_result_df = result
-    
-        if new_bid_df is not None and not new_bid_df.empty:
-            print(f"✅ 크롤링 된 개찰 공고: {len(new_bid_df)}")
-            break
-        else:
-            print("❌ 새로 추가된 데이터가 없습니다")
-            return
-
-    # 키워드 폴더 접근
-    file_prefix = search_word.replace(" ", "_")
-    data_dir = os.path.join('data', file_prefix)
-
-    try:
-        # 신규 및 업데이트 된 파일 전처리(낙찰률 및 보조지표 계산)
-        bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_result.csv')
-        update_result = pd.read_csv(bid_file)
-        new_winrate = calcul_winrate(update_result)
-        filtered_df = filtering_underone(new_winrate)
-        ranked_df = rankclass(filtered_df)
-
-        # 신규 업체 신상정보 업데이트
-        keplergl_file = os.path.join(data_dir, f'{file_prefix}_keplergl_df.csv')
-        old_col = ['업체명', '사업자등록번호', '참여횟수', '낙찰횟수', '낙찰률(%)', '가중 낙찰률', '가중낙찰률 클래스', 'rank_class', '주소', '사업형태', '위도', '경도', '전화번호']
-        old_df = pd.read_csv(keplergl_file) if os.path.exists(keplergl_file) else pd.DataFrame(columns=old_col)
-        
-        new_company = filtering_data(old_df, ranked_df)
-        newcompany_info = get_companyinfo(new_company)
-        final_df = get_final_df(ranked_df, old_df, newcompany_info)
-        final_df.to_csv(keplergl_file, index=False, encoding='utf-8-sig')
-        print(f"✅ 신규 업체 정보가 업데이트되었습니다: {len(new_company)} 개")
-        print(tabulate(new_company, headers='keys', tablefmt='grid'))
-
-        # 시군구 매칭 및 경계 데이터 처리
-        polygon_file = os.path.join('data', 'polygon.csv')
-        polygon_df = pd.read_csv(polygon_file)
-        polygon_df = polygon_df[['시군구코드명', 'geometry']]
-
-        city_df = matching_boundary(polygon_df, final_df)
-        cityrank_df = calcul_area(city_df)
-        sigunguboundary_df = area_merge(cityrank_df, polygon_df)
-
-        # 결과 저장 함수 호출
-        save_analysis_result(sigunguboundary_df, data_dir, file_prefix)
-
-    except Exception as e:
-        print(f"⚠️ 오류 발생: {e}")
-        
-        # selected_mode가 0인 경우 폴더 삭제 처리
-        if selected_mode == 0:
-            try:
-                shutil.rmtree(data_dir)
-                # print(f"⚠️ 오류로 인해 {data_dir} 디렉토리를 삭제하였습니다.")
-            except OSError as error:
-                print(f"⚠️ 디렉토리 삭제 중 오류가 발생하였습니다: {error}")
-
-if __name__ == "__main__":
-    main()
-    os.system('pause') # 콘솔창 자동꺼짐 방지
+'''
+나라장터 개찰 데이터 분석 메인 실행 파일
+- count_all_results : 전체 result를 나누어 읽으며 업체별 참여/낙찰 횟수를 누적 집계하는 함수
+- get_win_counts : 저장된 업체별 참여/낙찰 집계에 새로 저장된 공고의 result만 더하는 함수 (집계가 없거나 공고 데이터가 바뀐 경우 전체 재계산)
+- analyze_keyword : 키워드 하나의 낙찰률, 업체 정보, 시군구별 분석 결과를 계산해 키워드 폴더에 저장하는 함수
+- main : 나라장터 데이터를 크롤링하고 처리하여 분석 결과를 저장하는 전체 흐름을 관리하는 함수 (대화형)
+- load_batch_jobs : 배치 작업 파일(JSON)을 읽어 키워드별 작업 목록을 만드는 함수
+- run_batch : 여러 키워드를 입력 없이 동시에 수집/분석하고 실행 요약을 JSON으로 저장하는 함수
+
+배치 실행 (입력 대기와 pause 없음, 실패한 키워드가 있으면 종료 코드 1)
+    python MAIN.py --batch jobs.json
+    python MAIN.py --keyword 청소 --keyword 시설관리 --mode 1
+
+jobs.json 예시 (mode를 생략하면 키워드 폴더가 있으면 1번, 없으면 0번 모드)
+    [{"keyword": "청소", "mode": 1},
+     {"keyword": "시설관리", "mode": 0, "start_date": "20240101", "end_date": "20241231"},
+     {"keyword": "경비", "mode": 2, "start_date": "20200101"}]
+
+실행 지표 (대화형/배치 모두, metrics.py)
+    실행이 끝나면 단계별 시간, 처리 건수, 받은 바이트, HTTP 응답 시간 분포, 캐시 적중률, 최대 메모리를
+    data/_metrics/metrics_<시각>.json과 Prometheus textfile(nara_pipeline.prom)로 저장
+    python MAIN.py --batch jobs.json --textfile-dir /var/lib/node_exporter/textfile_collector
+'''
+
+from crawler import (check_and_select_mode, update_mode, find_bidno, process_bids, reparse_from_cache, prefetch_details,
+                     create_search_session, validate_keyword_input, validate_date_format, remove_empty_dir)
+from crawl_queue import queue_remaining
+from html_cache import HtmlCache
+import metrics
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+
+# 무거운 의존성(pandas, geopandas/shapely, geopy, requests, tabulate 등)은 해당 단계를 실행할 때 함수 안에서 불러옴
+# (키워드 입력 전까지는 crawler와 표준 라이브러리만 불러오므로 시작이 빠름, 시작 시간 측정 : benchmarks/bench_startup.py)
+
+VERIFY_WINRATE = False  # True면 증분 집계를 전체 재계산 결과와 비교 (다르면 전체 재계산 결과 사용)
+ANALYSIS_CHUNK_ROWS = 200000  # 전체 재계산 시 result를 이 행 수씩 나누어 읽음 (최대 메모리가 이력 길이와 무관)
+RESULT_COLUMNS = ['입찰공고번호', '순위', '사업자등록번호', '업체명']  # 낙찰률 계산에 필요한 컬럼
+BATCH_WORKERS = 4  # 배치 실행에서 동시에 검색/수집하는 키워드 수
+BATCH_DIR = os.path.join('data', '_batch')  # 배치 실행 요약 저장 폴더
+BATCH_DATE_KEYS = {0: ['start_date', 'end_date'], 2: ['start_date']}  # 배치 실행에서 모드별로 꼭 필요한 날짜
+
+
+### 전체 result 누적 집계 함수 (월별 저장소 또는 기존 CSV를 나누어 읽음)
+def count_all_results(data_dir, file_prefix, chunk_rows=ANALYSIS_CHUNK_ROWS):
+    import pandas as pd
+    from data_handler import update_win_counts
+    from bid_store import iter_results
+
+    win_counts = None
+    for chunk in iter_results(data_dir, file_prefix, columns=RESULT_COLUMNS, chunk_rows=chunk_rows):
+        win_counts = update_win_counts(win_counts, chunk)
+
+    if win_counts is None:  # result가 없는 경우
+        win_counts = update_win_counts(None, pd.DataFrame(columns=RESULT_COLUMNS))
+    return win_counts
+
+
+### 업체별 참여/낙찰 집계 갱신 함수
+# 집계와 함께 집계 기준(bid_store.count_marker : 반영한 소속 공고 파일 목록, 데이터 버전)을 저장하고,
+# 다음 실행에서는 새로 생긴 소속 공고 파일의 공고만 읽어 더함 (실행마다 읽는 양은 새로 저장된 공고 수에 비례)
+# 소속 공고를 다시 만들었거나 다른 키워드의 재파싱으로 공유 공고의 데이터가 바뀐 경우(데이터 버전 변경) 전체 재계산
+# full=True이거나 전체 저장소를 쓰지 않는 경우(pyarrow가 없어 CSV 사용)에도 전체 result로 다시 집계
+def get_win_counts(data_dir, file_prefix, full=False):
+    from data_handler import update_win_counts, load_win_counts, save_win_counts, verify_win_counts
+    from bid_store import count_marker, read_member_results
+
+    counts_file = os.path.join(data_dir, f'{file_prefix}_winrate_counts.json')
+    win_counts, saved_marker = (None, None) if full else load_win_counts(counts_file)
+    marker = count_marker(data_dir)
+
+    if win_counts is not None and (marker is None or saved_marker is None):
+        win_counts = None
+    elif win_counts is not None and (saved_marker['revision'] != marker['revision'] or not set(saved_marker['parts']) <= set(marker['parts'])):
+        print("⚠️집계 후 공고 데이터가 바뀌어 전체 재계산합니다.")
+        win_counts = None
+
+    if win_counts is not None:
+        # 집계 후 새로 저장된 소속 공고의 result만 더함 (저장 후 집계 전에 중단된 실행의 공고도 포함)
+        new_parts = sorted(set(marker['parts']) - set(saved_marker['parts']))
+        if new_parts:
+            win_counts = update_win_counts(win_counts, read_member_results(data_dir, new_parts, columns=RESULT_COLUMNS))
+
+        if VERIFY_WINRATE:
+            mismatch = verify_win_counts(win_counts, count_all_results(data_dir, file_prefix))
+            if not mismatch.empty:
+                print(f"⚠️증분 집계가 전체 재계산과 다른 업체 {len(mismatch)}곳이 있어 전체 재계산합니다.")
+                win_counts = None
+
+    if win_counts is None:
+        # 낙찰률 계산에 필요한 컬럼만 나누어 읽으며 누적 집계
+        win_counts = count_all_results(data_dir, file_prefix)
+
+    save_win_counts(counts_file, win_counts, marker)
+    return win_counts
+
+
+### 키워드 하나의 분석 결과 계산 및 저장 함수 (오류는 호출한 쪽에서 처리)
+# full=True이면 업체별 집계를 전체 result로 다시 계산, polygon_df를 주면 경계 데이터를 다시 읽지 않음
+# 반환값 : 새로 정보를 조회한 업체 수
+def analyze_keyword(search_word, full=False, polygon_df=None):
+    import pandas as pd
+    from tabulate import tabulate
+    from data_handler import winrate_from_counts, filtering_underone, rankclass, get_final_df
+    from company_info import get_companyinfo, filtering_data
+
+    # 키워드 폴더 접근
+    file_prefix = search_word.replace(" ", "_")
+    data_dir = os.path.join('data', file_prefix)
+
+    # 신규 및 업데이트 된 파일 전처리(낙찰률 및 보조지표 계산)
+    # 업체별 참여/낙찰 횟수는 저장된 집계에 집계 후 새로 저장된 공고의 result만 더함
+    win_counts = get_win_counts(data_dir, file_prefix, full=full)
+    new_winrate = winrate_from_counts(win_counts)
+    filtered_df = filtering_underone(new_winrate)
+    ranked_df = rankclass(filtered_df)
+
+    # 신규 업체 신상정보 업데이트
+    keplergl_file = os.path.join(data_dir, f'{file_prefix}_keplergl_df.csv')
+    old_col = ['업체명', '사업자등록번호', '참여횟수', '낙찰횟수', '낙찰률(%)', '가중 낙찰률', '가중낙찰률 클래스', 'rank_class', '주소', '사업형태', '위도', '경도', '전화번호']
+    old_df = pd.read_csv(keplergl_file) if os.path.exists(keplergl_file) else pd.DataFrame(columns=old_col)
+    
+    new_company = filtering_data(old_df, ranked_df)
+    partial_file = os.path.join(data_dir, f'{file_prefix}_companyinfo_partial.csv')  # 중단 시 이어서 수집할 중간 결과
+    newcompany_info = get_companyinfo(new_company, partial_file)
+    final_df = get_final_df(ranked_df, old_df, newcompany_info)
+    with metrics.stage('save'):
+        final_df.to_csv(keplergl_file, index=False, encoding='utf-8-sig')
+        metrics.add('save', items=len(final_df))
+    print(f"✅ 신규 업체 정보가 업데이트되었습니다: {len(new_company)} 개")
+    print(tabulate(new_company, headers='keys', tablefmt='grid'))
+
+    # 시군구 매칭 및 경계 데이터 처리
+    # polygon.csv는 처음 한 번만 GeoParquet으로 변환하고 이후에는 변환된 파일을 사용
+    # geopandas/shapely는 이 단계에서 처음 불러옴
+    from spatial_analysis import matching_boundary, calcul_area, area_merge, save_analysis_result
+    from boundary_store import load_boundaries
+
+    with metrics.stage('spatial_match'):
+        if polygon_df is None:
+            polygon_df = load_boundaries(os.path.join('data', 'polygon.csv'))
+
+        city_df = matching_boundary(polygon_df, final_df)
+        cityrank_df = calcul_area(city_df)
+        sigunguboundary_df = area_merge(cityrank_df, polygon_df)
+        metrics.add('spatial_match', items=len(final_df))  # 처리 건수 : 매칭한 업체 수
+
+    # 결과 저장 함수 호출
+    with metrics.stage('save'):
+        save_analysis_result(sigunguboundary_df, data_dir, file_prefix)
+        metrics.add('save', items=len(sigunguboundary_df))
+    return len(new_company)
+
+
+def main():
+    while True:
+        # 키워드 폴더 확인 및 모드 선택
+        search_word, selected_mode = check_and_select_mode()
+        if search_word == '#': continue  # 다시 키워드 입력 받음
+        elif search_word is None: return  # 프로그램 종료
+
+        # update_mode 함수 호출
+        result = update_mode(search_word, selected_mode)
+
+        # update_mode에서 None이 반환된 경우 처리
+        if result is None:
+            print("↩️데이터 처리 중 오류가 발생했습니다. 다시 시도하세요.")
+            continue
+
+        new_bid_df, pass_list, new_result_df = result
+    
+        if new_bid_df is not None and not new_bid_df.empty:
+            print(f"✅ 크롤링 된 개찰 공고: {len(new_bid_df)}")
+            break
+        else:
+            print("❌ 새로 추가된 데이터가 없습니다")
+            return
+
+    try:
+        analyze_keyword(search_word, full=(selected_mode == 3))
+
+    except Exception as e:
+        # 수집된 데이터는 체크포인트로 저장되어 있으므로 폴더를 삭제하지 않음 (다시 실행하면 남은 공고부터 이어서 수집)
+        print(f"⚠️ 오류 발생: {e}")
+
+
+### 배치 작업 파일 읽기 함수 (작업 : keyword, mode, start_date, end_date)
+def load_batch_jobs(jobs_file):
+    with open(jobs_file, encoding='utf-8') as f:
+        jobs = json.load(f)
+    if isinstance(jobs, dict):  # {"jobs": [...]} 형식도 허용
+        jobs = jobs['jobs']
+    return [job if isinstance(job, dict) else {'keyword': job} for job in jobs]
+
+
+### 여러 키워드를 입력 없이 수집/분석하는 함수
+# 1. 키워드별 검색을 동시에 실행 (검색/상세 페이지 세션, 원본 캐시, 호스트별 속도 제한은 모든 키워드가 공유)
+# 2. 여러 키워드에서 찾은 공고를 합쳐 상세 페이지를 한 번씩만 요청해 캐시에 저장
+# 3. 키워드별로 캐시의 원본을 파싱해 저장 (동시 실행, 출력 파일은 대화형 실행과 같음)
+# 4. 새 공고가 있는 키워드만 순서대로 분석 (업체 정보 저장소와 위경도 캐시를 공유하므로 순서대로 실행)
+# 반환값 : 실행 요약 dict (summary_file에도 JSON으로 저장)
+def run_batch(jobs, workers=BATCH_WORKERS, max_workers=8, processes=None, use_browser=False, summary_file=None):
+    from tabulate import tabulate
+    from fetcher import create_session
+    from bid_store import STORE_ENABLED, known_bidno
+
+    started_at = datetime.now()
+    processes = processes or max(1, (os.cpu_count() or 1) // workers)  # 키워드별 파싱 프로세스 수 (전체 CPU를 나누어 사용)
+
+    # 작업 검증 (mode가 없으면 키워드 폴더 유무로 결정)
+    entries = []
+    for job in jobs:
+        keyword = str(job.get('keyword', '')).strip()
+        data_dir = os.path.join('data', keyword.replace(" ", "_"))
+        mode = job.get('mode')
+        if mode is None:
+            mode = 1 if os.path.exists(data_dir) else 0
+        entry = {'keyword': keyword, 'mode': int(mode), 'start_date': job.get('start_date'), 'end_date': job.get('end_date'),
+                 'status': None, 'found_bids': 0, 'new_bids': 0, 'passed_bids': 0, 'result_rows': 0, 'new_companies': 0,
+                 'queue_remaining': 0, 'search': {}, 'error': None, 'elapsed_seconds': 0.0}
+        if not validate_keyword_input(keyword):
+            entry.update(status='invalid', error='올바르지 않은 키워드')
+        elif entry['mode'] not in [0, 1, 2, 3, 4]:
+            entry.update(status='invalid', error=f"올바르지 않은 모드: {entry['mode']}")
+        elif entry['mode'] in [0, 2] and not all(validate_date_format(str(entry[key] or '')) for key in BATCH_DATE_KEYS[entry['mode']]):
+            entry.update(status='invalid', error=f"{'/'.join(BATCH_DATE_KEYS[entry['mode']])} (YYYYMMDD)가 필요합니다")
+        entries.append(entry)
+    runnable = [entry for entry in entries if entry['status'] is None]
+
+    search_session = create_search_session(pool_size=workers * 4)
+    detail_session = create_session(pool_size=max_workers)
+    cache = HtmlCache()
+    polygon_df = None
+    try:
+        # 1. 키워드별 검색
+        def search(entry):
+            start = time.perf_counter()
+            try:
+                if entry['mode'] == 3:
+                    return []
+                return find_bidno(entry['keyword'], entry['mode'], use_browser, entry['search'],
+                                  entry['start_date'], entry['end_date'], search_session)
+            except Exception as e:
+                entry.update(status='error', error=f'검색 중 오류: {e}')
+                traceback.print_exc()
+                return None
+            finally:
+                entry['elapsed_seconds'] += time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            found = list(executor.map(search, runnable))
+
+        for entry, bidno in zip(runnable, found):
+            entry['bidno'] = bidno
+            entry['found_bids'] = len(bidno or [])
+
+        # 2. 여러 키워드에 걸친 공고는 한 번만 요청 (다른 키워드로 이미 저장된 공고는 저장소에서 연결하므로 요청하지 않음)
+        all_bidno = [bid for entry in runnable for bid in entry['bidno'] or []]
+        unique_bidno = {str(bid) for bid in all_bidno}
+        stored_bidno = known_bidno(unique_bidno) if STORE_ENABLED else set()
+        print(f"⏳ {len(runnable)}개 키워드에서 찾은 공고 {len(all_bidno)}건 (중복 제외 {len(unique_bidno)}건)의 상세 페이지를 수집합니다.")
+        fetched, failed = prefetch_details(unique_bidno - stored_bidno, cache, max_workers, session=detail_session, processes=processes)
+
+        # 3. 키워드별 파싱 및 저장 (검색 결과가 없어도 작업 큐에 남은 공고는 이어서 수집)
+        def collect(entry):
+            keyword = entry['keyword']
+            data_dir = os.path.join('data', keyword.replace(" ", "_"))
+            start = time.perf_counter()
+            try:
+                if entry['status'] is not None:
+                    return None
+                if entry['mode'] == 3:
+                    return reparse_from_cache(keyword, processes=processes)
+                if entry['bidno'] is None and not queue_remaining(data_dir):
+                    return None
+                return process_bids(entry['bidno'] or [], keyword, entry['mode'], max_workers=max_workers, processes=processes,
+                                    cache=cache, session=detail_session)
+            except Exception as e:
+                entry.update(status='error', error=f'수집 중 오류: {e}')
+                traceback.print_exc()
+                return None
+            finally:
+                if entry['mode'] == 0:
+                    remove_empty_dir(data_dir)
+                entry['queue_remaining'] = queue_remaining(data_dir) if os.path.isdir(data_dir) else 0
+                entry['elapsed_seconds'] += time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(collect, runnable))
+
+        # 4. 키워드별 분석
+        for entry, result in zip(runnable, results):
+            del entry['bidno']
+            if entry['status'] is not None:
+                continue
+            if result is None:
+                entry['status'] = 'no_new'
+                continue
+
+            new_bid_df, pass_list, new_result_df = result
+            entry.update(new_bids=len(new_bid_df), passed_bids=len(pass_list), result_rows=len(new_result_df))
+            if new_bid_df.empty:
+                entry['status'] = 'no_new'
+                continue
+
+            start = time.perf_counter()
+            try:
+                if polygon_df is None:
+                    from boundary_store import load_boundaries
+
+                    with metrics.stage('spatial_match'):
+                        polygon_df = load_boundaries(os.path.join('data', 'polygon.csv'))
+                entry['new_companies'] = analyze_keyword(entry['keyword'], full=(entry['mode'] == 3), polygon_df=polygon_df)
+                entry['status'] = 'ok'
+            except Exception as e:
+                entry.update(status='error', error=f'분석 중 오류: {e}')
+                traceback.print_exc()
+            finally:
+                entry['elapsed_seconds'] += time.perf_counter() - start
+
+    finally:
+        search_session.close()
+        detail_session.close()
+        cache.close()
+
+    finished_at = datetime.now()
+    for entry in entries:
+        entry['elapsed_seconds'] = round(entry['elapsed_seconds'], 3)
+    summary = {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'finished_at': finished_at.isoformat(timespec='seconds'),
+        'elapsed_seconds': round((finished_at - started_at).total_seconds(), 3),
+        'keywords': len(entries),
+        'failed_keywords': sum(entry['status'] in ['error', 'invalid'] for entry in entries),
+        'found_bids': sum(entry['found_bids'] for entry in entries),
+        'unique_bids': len(unique_bidno),
+        'detail_pages_fetched': fetched,
+        'detail_pages_failed': len(failed),
+        'jobs': entries,
+    }
+
+    # 실행 요약 저장 (임시 파일에 쓴 뒤 교체)
+    if summary_file is None:
+        summary_file = os.path.join(BATCH_DIR, f"batch_{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(summary_file) or '.', exist_ok=True)
+    tmp_file = f'{summary_file}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, summary_file)
+
+    print(tabulate([[e['keyword'], e['mode'], e['status'], e['new_bids'], e['queue_remaining'], e['error'] or ''] for e in entries],
+                   headers=['키워드', '모드', '상태', '새 공고', '남은 공고', '오류'], tablefmt='grid'))
+    print(f"✅ 실행 요약이 저장되었습니다: {summary_file}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='나라장터 개찰 데이터 분석 (인자 없이 실행하면 대화형 모드)')
+    parser.add_argument('--batch', help='배치 작업 파일 (JSON)')
+    parser.add_argument('--keyword', action='append', help='배치로 실행할 키워드 (여러 번 지정 가능)')
+    parser.add_argument('--mode', type=int, help='--keyword에 적용할 모드 (생략하면 키워드 폴더 유무로 결정)')
+    parser.add_argument('--start-date', help='--keyword에 적용할 시작 날짜 (YYYYMMDD)')
+    parser.add_argument('--end-date', help='--keyword에 적용할 종료 날짜 (YYYYMMDD)')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS, help='동시에 처리할 키워드 수')
+    parser.add_argument('--summary', help='실행 요약 JSON 파일 경로')
+    parser.add_argument('--metrics-dir', default=metrics.METRICS_DIR, help='단계별 실행 지표 JSON 보고서 저장 폴더')
+    parser.add_argument('--textfile-dir', help='Prometheus textfile 저장 폴더 (node exporter의 --collector.textfile.directory, 생략하면 --metrics-dir)')
+    args = parser.parse_args()
+
+    if args.batch or args.keyword:
+        jobs = load_batch_jobs(args.batch) if args.batch else []
+        jobs += [{'keyword': keyword, 'mode': args.mode, 'start_date': args.start_date, 'end_date': args.end_date}
+                 for keyword in args.keyword or []]
+        run_info = {'mode': 'batch', 'keywords': [str(job.get('keyword', '')) for job in jobs]}
+    else:
+        run_info = {'mode': 'interactive'}
+
+    # 실행이 중간에 실패해도 그때까지의 단계별 지표는 저장
+    try:
+        if run_info['mode'] == 'batch':
+            summary = run_batch(jobs, workers=args.workers, summary_file=args.summary)
+        else:
+            main()
+    finally:
+        try:
+            json_file, textfile = metrics.export_metrics(run_info, args.metrics_dir, args.textfile_dir)
+            print(f"✅ 실행 지표가 저장되었습니다: {json_file}, {textfile}")
+        except OSError as e:
+            print(f"⚠️실행 지표 저장 중 오류 발생: {e}")
+
+    if run_info['mode'] == 'batch':
+        sys.exit(1 if summary['failed_keywords'] else 0)
+    os.system('pause') # 콘솔창 자동꺼짐 방지
@@ -0,0 +1,143 @@
+'''
+분석 함수 벤치마크 (합성 데이터 규모별 처리 시간과 최대 메모리)
+- build_inputs : 규모(result 행 수, 업체 수)에 맞는 합성 result, 시군구 경계, 업체 정보를 만드는 함수
+- measure : 함수 하나의 처리 시간(반복 중 최소)과 실행 중 추가로 할당한 최대 메모리(tracemalloc)를 구하는 함수
+- bench_scale : 한 규모에서 분석 단계를 순서대로 실행하며 단계별 시간과 메모리를 측정하는 함수
+- parse_scale : 규모 이름(10k, 1m 등) 또는 '행수:업체수'를 (행 수, 업체 수)로 바꾸는 함수
+
+측정 단계 (MAIN.analyze_keyword와 같은 순서, 앞 단계 결과를 다음 단계 입력으로 사용)
+    calcul_winrate → rankclass(filtering_underone 포함) → get_final_df → matching_boundary → calcul_area → area_merge
+
+최대 메모리는 함수 실행 중 Python/numpy가 새로 할당한 메모리의 최댓값 (입력 데이터 제외, shapely/GEOS 내부 할당은 포함되지 않음)
+메모리 측정은 추적 비용 때문에 시간 측정과 따로 한 번 더 실행함
+
+실행 예시 (저장소 루트에서)
+    python benchmarks/bench_analysis.py                                  # 10k, 100k
+    python benchmarks/bench_analysis.py --scale 1m --scale 10m --repeat 1 --json data/_bench/analysis.json
+    python benchmarks/bench_analysis.py --scale 500000:50000 --skip-memory
+'''
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import pandas as pd
+import geopandas as gpd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import calcul_winrate, filtering_underone, rankclass, get_final_df
+from spatial_analysis import matching_boundary, calcul_area, area_merge
+from metrics import peak_rss
+from synthetic_data import REGIONS, make_regions, make_companies, iter_results, make_company_frames
+
+# 규모 이름 → (result 행 수, 업체 수)
+SCALES = {
+    '10k': (10000, 2000),
+    '100k': (100000, 20000),
+    '1m': (1000000, 100000),
+    '10m': (10000000, 1000000),
+}
+DEFAULT_SCALES = ['10k', '100k']
+
+
+### 규모 이름 또는 '행수:업체수' 해석
+def parse_scale(scale):
+    if scale in SCALES:
+        return SCALES[scale]
+    rows, companies = scale.split(':')
+    return int(rows), int(companies)
+
+
+### 합성 입력 데이터 생성 (result는 저장소에서 읽은 것과 같은 타입의 낙찰률 계산 컬럼만)
+def build_inputs(rows, companies, regions=REGIONS, seed=0):
+    polygon_df, grid = make_regions(regions, seed)
+    companies_df = make_companies(companies, polygon_df, grid, seed)
+    result_df = pd.concat(iter_results(rows, companies_df, seed, full=False), ignore_index=True)
+
+    # load_boundaries와 같이 GeoDataFrame으로 바꾸고 공간 인덱스를 미리 만듦
+    polygon_gdf = gpd.GeoDataFrame(polygon_df[['시군구코드명']], geometry=gpd.GeoSeries.from_wkt(polygon_df['geometry']))
+    polygon_gdf.sindex
+    return result_df, polygon_gdf, companies_df
+
+
+### 처리 시간과 최대 메모리 측정 (make_args는 매번 새 입력을 만들어 입력을 바꾸는 함수도 같은 조건에서 측정)
+# 반환값 : (마지막 실행 결과, 최소 처리 시간(초), 최대 추가 메모리(바이트, skip_memory면 None))
+def measure(func, make_args, repeat=3, skip_memory=False):
+    elapsed = []
+    for _ in range(repeat):
+        args = make_args()
+        gc.collect()
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed.append(time.perf_counter() - start)
+
+    peak = None
+    if not skip_memory:
+        args = make_args()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result, min(elapsed), peak
+
+
+### 한 규모의 단계별 측정 (반환값 : 단계별 {'seconds', 'peak_bytes'} dict)
+def bench_scale(rows, companies, regions=REGIONS, repeat=3, skip_memory=False, seed=0):
+    start = time.perf_counter()
+    result_df, polygon_gdf, companies_df = build_inputs(rows, companies, regions, seed)
+    print(f"\n[result {rows:,}행, 업체 {companies:,}곳, 시군구 {regions}곳] 합성 데이터 생성 {time.perf_counter() - start:.1f}s")
+
+    report = {}
+
+    def run(name, func, make_args):
+        result, seconds, peak = measure(func, make_args, repeat, skip_memory)
+        report[name] = {'seconds': round(seconds, 4), 'peak_bytes': peak}
+        return result
+
+    winrate_df = run('calcul_winrate', calcul_winrate, lambda: (result_df,))
+    ranked_df = run('rankclass', lambda df: rankclass(filtering_underone(df)), lambda: (winrate_df,))
+
+    old_df, newcompany_info = make_company_frames(ranked_df, companies_df, seed=seed)
+    final_df = run('get_final_df', get_final_df, lambda: (ranked_df.copy(), old_df.copy(), newcompany_info.copy()))
+    city_df = run('matching_boundary', matching_boundary, lambda: (polygon_gdf, final_df.copy()))
+    cityrank_df = run('calcul_area', calcul_area, lambda: (city_df,))
+    run('area_merge', area_merge, lambda: (cityrank_df, polygon_gdf))
+
+    print(f"순위 업체 {len(ranked_df):,}곳, 새 업체 정보 {len(newcompany_info):,}곳, 매칭된 업체 {city_df['시군구코드명'].notna().sum():,}곳")
+    print(f"{'단계':<20} {'시간':>10} {'최대 메모리':>12}")
+    for name, entry in report.items():
+        memory = '-' if entry['peak_bytes'] is None else f"{entry['peak_bytes'] / 1024 ** 2:.1f}MB"
+        print(f"{name:<20} {entry['seconds']:9.3f}s {memory:>12}")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='분석 함수 벤치마크 (합성 데이터 규모별 시간/최대 메모리)')
+    parser.add_argument('--scale', action='append', help=f"규모 ({', '.join(SCALES)} 또는 행수:업체수, 여러 번 지정 가능)")
+    parser.add_argument('--regions', type=int, default=REGIONS, help='시군구 수')
+    parser.add_argument('--repeat', type=int, default=3, help='시간 측정 반복 횟수 (최소값 사용)')
+    parser.add_argument('--skip-memory', action='store_true', help='최대 메모리 측정 생략 (큰 규모에서 시간 단축)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 seed')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 (최적화 전후 비교용)')
+    args = parser.parse_args()
+
+    results = {}
+    for scale in args.scale or DEFAULT_SCALES:
+        rows, companies = parse_scale(scale)
+        results[scale] = {'rows': rows, 'companies': companies,
+                          'stages': bench_scale(rows, companies, args.regions, args.repeat, args.skip_memory, args.seed)}
+    print(f"\n프로세스 최대 메모리: {peak_rss() / 1024 ** 2:.0f}MB" if peak_rss() else '')
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'regions': args.regions, 'seed': args.seed, 'peak_rss_bytes': peak_rss(), 'scales': results}, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과가 저장되었습니다: {args.json}")
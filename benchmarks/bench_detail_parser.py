@@ -0,0 +1,106 @@
+'''
+상세 페이지 파서 벤치마크
+- make_detail_page : 실제 개찰결과 상세 페이지와 비슷한 구조의 합성 HTML을 만드는 함수
+- load_cached_pages : html_cache에 저장된 실제 상세 페이지 원본을 불러오는 함수
+- bench : 기존 파서(bs4)와 새 파서(lxml, lxml + 프로세스 풀)의 초당 처리 페이지 수를 비교하는 함수
+
+실행 예시 (저장소 루트에서)
+    python benchmarks/bench_detail_parser.py --pages 2000
+    python benchmarks/bench_detail_parser.py --cache   # 캐시된 실제 페이지 사용
+'''
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detail_parser import parse_bid_detail_bs4, parse_page, parse_pages
+
+
+### 합성 상세 페이지 생성 함수 (bidders : 투찰 업체 수)
+def make_detail_page(bid, bidders=40, seed=None):
+    rng = random.Random(seed if seed is not None else bid)
+
+    menu = ''.join(f'<li><a href="/menu{i}.do">메뉴 {i}</a></li>' for i in range(60))
+    info = f'''
+    <table class="table_info">
+      <tr><th>입찰공고번호</th><td>{bid}-00</td><th>참조번호</th><td>REF-{bid}</td></tr>
+      <tr><th>공고명</th><td colspan="3"> <a href="#">{rng.choice(["청소", "시설관리", "경비"])} 용역 &amp; 관리 </a> </td></tr>
+      <tr><th>수요기관</th><td>{rng.choice(["서울특별시", "부산광역시", "한국전력공사"])} 본부</td><th>집행관</th><td>김 철수</td></tr>
+      <tr><th>실제개찰일시</th><td>2024/0{rng.randint(1, 9)}/1{rng.randint(0, 9)} 1{rng.randint(0, 7)}:00</td><th>예정가격</th><td>{rng.randint(10**7, 10**9):,}</td></tr>
+    </table>'''
+    rows = []
+    for rank in range(1, bidders + 1):
+        amount = rng.randint(10**7, 10**9)
+        rows.append(
+            f'<tr><td>{rank}</td><td>{rng.randint(10**9, 10**10 - 1)}</td><td>(주){rng.choice("가나다라마바사")}업체{rank}</td>'
+            f'<td>대표{rank}</td><td>{amount:,}</td><td>{rng.uniform(80, 100):.3f}</td><td>{rng.randint(1, 15)}</td>'
+            f'<td>2024-01-0{rng.randint(1, 9)} 10:{rng.randint(10, 59)}</td><td>{rng.choice(["", "낙찰하한선 미달", ""])}</td></tr>'
+        )
+    results = f'''
+    <table class="table_list">
+      <thead><tr><th>순위</th><th>사업자등록번호</th><th>업체명</th><th>대표자명</th><th>입찰금액</th><th>투찰률(%)</th><th>추첨번호</th><th>투찰일시</th><th>비고</th></tr></thead>
+      <tbody>{''.join(rows)}</tbody>
+    </table>'''
+    return f'''<!DOCTYPE html><html><head><meta charset="utf-8"><title>개찰결과</title>
+    <script>var x = "<td>가짜</td>"; function go(){{}}</script><style>td {{ color: red }}</style></head>
+    <body><div id="header"><ul>{menu}</ul></div><div id="container">{info}{results}</div>
+    <div id="footer"><table><tr><td>주소</td><td>전화</td></tr></table></div></body></html>'''
+
+
+### 캐시된 실제 상세 페이지 원본 불러오기
+def load_cached_pages(limit):
+    from html_cache import HtmlCache
+
+    with HtmlCache() as cache:
+        keys = cache.keys()[:limit]
+        return [cache.get(bidno, bidseq) for bidno, bidseq in keys]
+
+
+### 파서별 처리 속도 측정 및 결과 일치 여부 확인
+def bench(pages, processes):
+    report = {}
+
+    start = time.perf_counter()
+    old = []
+    for html in pages:
+        try:
+            old.append(parse_bid_detail_bs4(html))
+        except Exception:
+            old.append(None)
+    report['bs4 (html.parser)'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = [parse_page(html) for html in pages]
+    report['lxml'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = parse_pages(pages, processes=processes)
+    report[f'lxml + 프로세스 풀({processes or os.cpu_count()})'] = time.perf_counter() - start
+
+    mismatch = sum(1 for a, b, c in zip(old, new, pooled) if not (a == b == c))
+
+    print(f"페이지 수: {len(pages)}")
+    for name, elapsed in report.items():
+        print(f"{name:<28} {elapsed:8.3f}s  {len(pages) / elapsed:10.1f} pages/sec")
+    print(f"결과 불일치 페이지: {mismatch}")
+    return report, mismatch
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='개찰결과 상세 페이지 파서 벤치마크')
+    parser.add_argument('--pages', type=int, default=1000, help='측정할 페이지 수')
+    parser.add_argument('--bidders', type=int, default=40, help='합성 페이지의 투찰 업체 수')
+    parser.add_argument('--processes', type=int, default=None, help='프로세스 풀 크기 (기본: CPU 코어 수)')
+    parser.add_argument('--cache', action='store_true', help='합성 페이지 대신 캐시된 실제 페이지 사용')
+    args = parser.parse_args()
+
+    if args.cache:
+        pages = load_cached_pages(args.pages)
+    else:
+        pages = [make_detail_page(20240000000 + i, args.bidders) for i in range(args.pages)]
+
+    bench(pages, args.processes)
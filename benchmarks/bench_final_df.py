@@ -0,0 +1,114 @@
+'''
+get_final_df 벤치마크
+- make_frames : 업체 수에 맞춰 순위 데이터, 기존 업체 정보, 새로 조회한 업체 정보를 합성하는 함수
+- get_final_df_loop : 업체마다 마스크를 만들어 .loc로 값을 바꾸던 기존 방식 (비교 기준)
+- bench : 기존 방식과 현재 get_final_df의 처리 시간을 비교하고 결과가 같은지 확인하는 함수
+
+실행 예시 (저장소 루트에서)
+    python benchmarks/bench_final_df.py --companies 100000 --new 2000
+    python benchmarks/bench_final_df.py --companies 500000 --new 50000 --skip-loop   # 기존 방식 생략
+'''
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import get_final_df, INFO_COLUMNS
+
+
+### 합성 데이터 생성 함수 (companies : 순위 데이터 업체 수, new : 새로 조회한 업체 수)
+def make_frames(companies, new, seed=0):
+    rng = np.random.default_rng(seed)
+    bizno = rng.permutation(1000000000 + np.arange(companies) * 7919)  # 서로 다른 10자리 번호
+
+    ranked_df = pd.DataFrame({
+        '업체명': [f'업체{i}' for i in range(companies)],
+        '사업자등록번호': bizno,
+        '가중 낙찰률': rng.random(companies).round(3),
+    })
+
+    def company_info(numbers):
+        count = len(numbers)
+        lat = rng.uniform(33, 38, count)
+        lat[rng.random(count) < 0.05] = np.nan  # 위치를 찾지 못한 업체
+        return pd.DataFrame({
+            '사업자등록번호': numbers,
+            '주소': [f'서울특별시 중구 세종대로 {i}' for i in range(count)],
+            '사업형태': rng.choice(['중소기업', '소기업', '대기업'], count),
+            '위도': lat,
+            '경도': rng.uniform(126, 130, count),
+            '전화번호': [f'02-{i:04d}-0000' for i in range(count)],
+        })
+
+    # 기존 업체 정보는 새로 조회한 업체와 일부 겹치도록 만들어 덮어쓰기 규칙도 확인
+    old_df = company_info(bizno[: companies - new // 2])
+    newcompany_info = company_info(bizno[companies - new:])
+    return ranked_df, old_df, newcompany_info
+
+
+### 기존 방식 (업체마다 전체 데이터에 대한 마스크 생성)
+def get_final_df_loop(ranked_df, old_df, newcompany_info):
+    ranked_df['사업자등록번호'] = ranked_df['사업자등록번호'].astype(str)
+    old_df['사업자등록번호'] = old_df['사업자등록번호'].astype(str)
+    newcompany_info['사업자등록번호'] = newcompany_info['사업자등록번호'].astype(str)
+
+    if not old_df.empty:
+        updated_df = ranked_df.merge(old_df[['사업자등록번호'] + INFO_COLUMNS], on='사업자등록번호', how='left')
+    else:
+        updated_df = ranked_df.copy()
+
+    if newcompany_info.empty:
+        return updated_df
+
+    for idx, row in newcompany_info.iterrows():
+        mask = updated_df['사업자등록번호'] == row['사업자등록번호']
+        if mask.any():
+            for column in INFO_COLUMNS:
+                updated_df.loc[mask, column] = row[column]
+
+    return updated_df.sort_values(by='가중 낙찰률', ascending=False)
+
+
+### 처리 시간 비교 및 결과 일치 여부 확인
+def bench(companies, new, skip_loop=False):
+    report = {}
+    frames = make_frames(companies, new)
+
+    start = time.perf_counter()
+    final_df = get_final_df(*(df.copy() for df in frames))
+    report['get_final_df'] = time.perf_counter() - start
+
+    same = None
+    if not skip_loop:
+        start = time.perf_counter()
+        loop_df = get_final_df_loop(*(df.copy() for df in frames))
+        report['기존 방식 (iterrows + .loc)'] = time.perf_counter() - start
+
+        try:
+            pd.testing.assert_frame_equal(final_df, loop_df)
+            same = True
+        except AssertionError as e:
+            print(f"⚠️결과 불일치: {e}")
+            same = False
+
+    print(f"업체 수: {companies}, 새로 조회한 업체 수: {new}")
+    for name, elapsed in report.items():
+        print(f"{name:<28} {elapsed:8.3f}s")
+    if same is not None:
+        print(f"결과 일치: {same}")
+    return report, same
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='get_final_df 벤치마크')
+    parser.add_argument('--companies', type=int, default=100000, help='순위 데이터의 업체 수')
+    parser.add_argument('--new', type=int, default=2000, help='새로 조회한 업체 수')
+    parser.add_argument('--skip-loop', action='store_true', help='기존 방식 측정 생략 (업체 수가 많을 때)')
+    args = parser.parse_args()
+
+    bench(args.companies, args.new, args.skip_loop)
@@ -0,0 +1,88 @@
+'''
+MAIN.py 시작 시간 벤치마크 (python -X importtime 기준)
+- measure : 새 인터프리터에서 모듈을 불러오며 모듈별 누적 import 시간과 불러온 무거운 의존성을 구하는 함수
+- bench : 여러 번 측정해 중앙값과 오래 걸린 모듈을 출력하고 기준을 넘으면 실패로 판단하는 함수
+
+키워드를 입력하기 전에는 crawler와 표준 라이브러리만 불러와야 하므로
+HEAVY_MODULES 중 하나라도 불러오거나 시간이 --max-ms를 넘으면 종료 코드 1 (CI 등에서 회귀 확인용)
+기본으로 MAIN과 DEFAULT_MODULES를 각각 새 인터프리터에서 확인 (MAIN이 함수 안에서 불러오는 모듈도 불러오는 것만으로는 가벼워야 함)
+
+실행 예시 (저장소 루트에서)
+    python benchmarks/bench_startup.py                                  # MAIN, company_info, fetcher
+    python benchmarks/bench_startup.py --module company_info --repeat 10
+    python benchmarks/bench_startup.py --module crawler --repeat 10 --max-ms 150
+'''
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시점에 불러오면 안 되는 모듈 (각 단계를 실행할 때 불러옴)
+HEAVY_MODULES = ['pandas', 'numpy', 'geopandas', 'shapely', 'pyproj', 'pyarrow', 'selenium', 'geopy',
+                 'bs4', 'lxml', 'requests', 'tqdm', 'tabulate']
+
+# 기본 확인 모듈 (--module을 주지 않을 때)
+DEFAULT_MODULES = ['MAIN', 'company_info', 'fetcher']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+### 새 인터프리터에서 한 번 측정 (반환값 : 전체 시간(ms), {모듈: 누적 시간(ms)}, 불러온 무거운 의존성 목록)
+def measure(module='MAIN'):
+    code = f"import sys, {module}; print(' '.join(sorted(m for m in sys.modules if '.' not in m)))"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f'{module} import 실패')
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and match.group(4) == 'site' and not match.group(3):
+            cumulative = {}  # 인터프리터 시작 시 불러오는 모듈(site 이하)은 제외
+        elif match:
+            cumulative[match.group(4)] = int(match.group(2)) / 1000
+
+    loaded = set(proc.stdout.split())
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    return cumulative.get(module, 0.0), cumulative, heavy
+
+
+### 여러 번 측정한 결과 출력 및 기준 확인 (반환값 : 기준 통과 여부)
+def bench(module='MAIN', repeat=5, top=10, max_ms=None):
+    totals = []
+    for _ in range(repeat):
+        total, cumulative, heavy = measure(module)
+        totals.append(total)
+
+    print(f"{module} import 시간 (중앙값, {repeat}회): {statistics.median(totals):8.1f}ms  (최소 {min(totals):.1f}ms, 최대 {max(totals):.1f}ms)")
+    print(f"오래 걸린 모듈 (마지막 측정, 누적 기준 상위 {top}개)")
+    for name, elapsed in sorted(cumulative.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<40} {elapsed:8.1f}ms")
+
+    passed = True
+    if heavy:
+        print(f"⚠️시작 시점에 무거운 의존성을 불러왔습니다: {', '.join(heavy)}")
+        passed = False
+    if max_ms is not None and statistics.median(totals) > max_ms:
+        print(f"⚠️import 시간이 기준({max_ms}ms)을 넘었습니다.")
+        passed = False
+    if passed:
+        print("✅ 시작 시간 기준을 통과했습니다.")
+    return passed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MAIN.py 시작 시간 벤치마크 (python -X importtime)')
+    parser.add_argument('--module', action='append', help=f"측정할 모듈 (여러 번 지정 가능, 기본 {', '.join(DEFAULT_MODULES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='측정 횟수 (중앙값 사용)')
+    parser.add_argument('--top', type=int, default=10, help='출력할 모듈 수')
+    parser.add_argument('--max-ms', type=float, default=None, help='import 시간 기준 (ms, 넘으면 종료 코드 1)')
+    args = parser.parse_args()
+
+    results = [bench(module, args.repeat, args.top, args.max_ms) for module in args.module or DEFAULT_MODULES]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,223 @@
+'''
+분석 함수 벤치마크용 합성 데이터 생성
+- warp : 규칙적인 격자 좌표를 물결 모양으로 휘게 하는 함수 (이웃한 지역의 경계가 정확히 겹치도록 전체 좌표에 같은 변환 적용)
+- make_regions : 전국 범위를 휜 격자로 나눈 합성 시군구 경계(WKT)와 지역별 업체 분포 가중치를 만드는 함수
+- make_companies : 지역에 분포한 업체의 사업자등록번호, 업체명, 주소, 사업형태, 위경도, 전화번호를 만드는 함수
+- iter_results : 공고별 투찰 업체 수와 업체별 참여 빈도를 반영한 result 행을 chunk 단위로 만드는 함수
+- make_company_frames : 순위 데이터를 이전 실행의 keplergl_df와 새로 조회한 업체 정보로 나누는 함수
+- write_dataset : result CSV, keplergl_df CSV, 새 업체 정보 CSV, polygon.csv를 저장하는 함수
+
+합성 규칙 (실제 데이터와 비슷한 분포)
+- 공고별 투찰 업체 수는 평균 AVG_BIDDERS의 기하 분포, 업체별 참여 빈도는 지프 분포 (소수 업체가 많이 참여)
+- 업체는 인구가 많은 지역에 몰리도록 지역별 가중치(지프 분포)로 배치, 일부는 위경도 없음(MISSING_RATIO) 또는 경계 밖(OUTSIDE_RATIO)
+- 같은 seed면 같은 데이터 (벤치마크 결과 비교용)
+
+실행 예시 (저장소 루트에서)
+    python benchmarks/synthetic_data.py --rows 1000000 --companies 100000 --out data/_synthetic
+    → data/_synthetic/polygon.csv, data/_synthetic/합성/합성_개찰결과_result.csv, 합성_keplergl_df.csv, 합성_newcompany_info.csv
+'''
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import update_win_counts, winrate_from_counts, filtering_underone, rankclass
+
+RESULT_COLUMNS = ['입찰공고번호', '순위', '사업자등록번호', '업체명', '대표자명', '입찰금액', '투찰률(%)', '추첨번호', '투찰일시', '비고']
+ANALYSIS_COLUMNS = ['순위', '사업자등록번호', '업체명']  # 낙찰률 계산에 쓰는 컬럼 (full=False일 때 저장소와 같은 타입으로 생성)
+KEPLERGL_COLUMNS = ['업체명', '사업자등록번호', '참여횟수', '낙찰횟수', '낙찰률(%)', '가중 낙찰률', '가중낙찰률 클래스', 'rank_class', '주소', '사업형태', '위도', '경도', '전화번호']
+COMPANYINFO_COLUMNS = ['사업자등록번호', '주소', '사업형태', '전화번호', '위도', '경도']  # company_info.get_companyinfo 반환 컬럼
+
+BOUNDS = (126.0, 34.3, 129.6, 38.3)  # 합성 경계 범위 (경도, 위도)
+REGIONS = 250  # 시군구 수
+SEGMENTS = 16  # 경계 한 변의 꼭짓점 수 (실제 경계처럼 꼭짓점이 많은 폴리곤)
+AVG_BIDDERS = 40  # 공고당 평균 투찰 업체 수
+PARTICIPATION_EXPONENT = 0.8  # 업체별 참여 빈도 지프 지수
+REGION_EXPONENT = 1.0  # 지역별 업체 수 지프 지수
+MISSING_RATIO = 0.03  # 위경도를 찾지 못한 업체 비율
+OUTSIDE_RATIO = 0.01  # 경계 밖(해상 등) 위치 업체 비율
+UNRANKED_RATIO = 0.02  # 순위가 없는 result 행 비율
+NEW_RATIO = 0.1  # keplergl_df에 없는(새로 조회하는) 업체 비율
+FIRST_BIDNO = 20240000000
+CHUNK_ROWS = 1000000  # result 생성 단위 (최대 메모리가 전체 행 수와 무관)
+
+
+### 격자 좌표 휘기 (셀 크기에 비례한 사인파, 야코비안이 항상 양수라 폴리곤이 겹치거나 뒤집히지 않음)
+def warp(x, y, cell):
+    cw, ch = cell
+    return (x + 0.12 * cw * np.sin(np.pi * y / ch),
+            y + 0.12 * ch * np.sin(np.pi * x / cw + 1.0))
+
+
+### 합성 시군구 경계 생성 (반환값 : (시군구코드명/geometry(WKT) DataFrame, 격자 정보 dict))
+def make_regions(regions=REGIONS, seed=0, segments=SEGMENTS):
+    rng = np.random.default_rng(seed)
+    lng0, lat0, lng1, lat1 = BOUNDS
+    nx = int(np.ceil(np.sqrt(regions)))
+    ny = int(np.ceil(regions / nx))
+    cell = ((lng1 - lng0) / nx, (lat1 - lat0) / ny)
+
+    # 모든 셀이 같은 꼭짓점 배열을 공유해야 이웃 경계가 정확히 겹침
+    X = np.linspace(lng0, lng1, nx * segments + 1)
+    Y = np.linspace(lat0, lat1, ny * segments + 1)
+
+    names, geometries = [], []
+    for k in range(regions):
+        i, j = k % nx, k // nx
+        a0, a1, b0, b1 = i * segments, (i + 1) * segments, j * segments, (j + 1) * segments
+        xi = np.concatenate([np.arange(a0, a1), np.full(segments, a1), np.arange(a1, a0, -1), np.full(segments, a0), [a0]])
+        yi = np.concatenate([np.full(segments, b0), np.arange(b0, b1), np.full(segments, b1), np.arange(b1, b0, -1), [b0]])
+        lng, lat = warp(X[xi], Y[yi], cell)
+        names.append(f'합성{k:03d}구')
+        geometries.append('POLYGON ((' + ', '.join(f'{x:.6f} {y:.6f}' for x, y in zip(lng, lat)) + '))')
+
+    weights = rng.permutation(1.0 / np.arange(1, regions + 1) ** REGION_EXPONENT)
+    grid = {'shape': (nx, ny), 'cell': cell, 'weights': weights / weights.sum()}
+    return pd.DataFrame({'시군구코드명': names, 'geometry': geometries}), grid
+
+
+### 합성 업체 정보 생성 (사업자등록번호는 서로 다른 10자리 번호)
+def make_companies(companies, polygon_df, grid, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    nx, _ = grid['shape']
+    lng0, lat0, _, _ = BOUNDS
+
+    # 지역을 고른 뒤 휘기 전 셀 안쪽에 배치 (휜 뒤에도 같은 지역 경계 안에 있음)
+    region = rng.choice(len(polygon_df), size=companies, p=grid['weights'])
+    x = lng0 + (region % nx + rng.uniform(0.1, 0.9, companies)) * grid['cell'][0]
+    y = lat0 + (region // nx + rng.uniform(0.1, 0.9, companies)) * grid['cell'][1]
+    lng, lat = warp(x, y, grid['cell'])
+    lng[rng.random(companies) < OUTSIDE_RATIO] = lng0 - 0.5
+    missing = rng.random(companies) < MISSING_RATIO
+    lng[missing], lat[missing] = np.nan, np.nan
+
+    region_names = polygon_df['시군구코드명'].to_numpy()
+    return pd.DataFrame({
+        '사업자등록번호': rng.permutation(1000000000 + np.arange(companies, dtype=np.int64) * 7919),
+        '업체명': [f'(주){"가나다라마바사아자차카타파하"[k % 14]}{k}산업' for k in range(companies)],
+        '주소': [f'{name} 합성로 {k % 500 + 1}' for k, name in enumerate(region_names[region])],
+        '사업형태': rng.choice(['중소기업', '소기업', '소상공인', '중견기업', '대기업'], companies, p=[0.5, 0.3, 0.15, 0.04, 0.01]),
+        '전화번호': [f'0{k % 60 + 2}-{k % 9000 + 1000}-{k % 10000:04d}' for k in range(companies)],
+        '위도': lat,
+        '경도': lng,
+    })
+
+
+### result 행을 chunk_rows개씩 생성 (full=False면 ANALYSIS_COLUMNS만 저장소와 같은 타입으로 생성)
+# 공고 하나의 투찰 업체는 연속된 행이며 순위는 1부터 매김 (chunk 경계에서 공고가 나뉘면 다음 chunk는 새 공고로 시작)
+def iter_results(rows, companies_df, seed=0, chunk_rows=CHUNK_ROWS, avg_bidders=AVG_BIDDERS, full=True):
+    rng = np.random.default_rng(seed + 2)
+    n = len(companies_df)
+    participation = rng.permutation(1.0 / np.arange(1, n + 1) ** PARTICIPATION_EXPONENT)
+    participation /= participation.sum()
+    bizno = companies_df['사업자등록번호'].to_numpy()
+    names = pd.Index(companies_df['업체명'])
+    ceo_names = np.array([f'대표{k}' for k in range(1000)], dtype=object)
+    lottery = np.array([' '.join(map(str, sorted(rng.choice(15, 4, replace=False) + 1))) for _ in range(64)], dtype=object)
+
+    next_bid = FIRST_BIDNO
+    done = 0
+    while done < rows:
+        size = min(chunk_rows, rows - done)
+
+        # 공고별 투찰 업체 수 (마지막 공고는 chunk 크기에 맞춰 자름)
+        bidders = 1 + rng.geometric(1 / avg_bidders, size=size // avg_bidders + 16)
+        while bidders.sum() < size:
+            bidders = np.concatenate([bidders, 1 + rng.geometric(1 / avg_bidders, size=size // avg_bidders + 16)])
+        ends = np.cumsum(bidders)
+        count = int(np.searchsorted(ends, size)) + 1
+        bidders = bidders[:count]
+        bidders[-1] -= ends[count - 1] - size
+
+        bid = np.repeat(np.arange(count), bidders)
+        rank = pd.array(np.arange(size) - np.repeat(np.cumsum(bidders) - bidders, bidders) + 1, dtype='Int64')
+        rank[rng.random(size) < UNRANKED_RATIO] = pd.NA
+        company = rng.choice(n, size=size, p=participation)
+        name = pd.Categorical.from_codes(company, categories=names)
+
+        if full:
+            opened = np.datetime64('2024-01-01T10:00') + (next_bid - FIRST_BIDNO + bid) * np.timedelta64(37, 'm')
+            chunk = pd.DataFrame({
+                '입찰공고번호': pd.Series(next_bid + bid).astype(str) + '-00',
+                '순위': rank,
+                '사업자등록번호': bizno[company],
+                '업체명': name,
+                '대표자명': ceo_names[company % len(ceo_names)],
+                '입찰금액': rng.integers(10 ** 7, 10 ** 9, size),
+                '투찰률(%)': rng.uniform(86, 100, size).round(3),
+                '추첨번호': lottery[rng.integers(0, len(lottery), size)],
+                '투찰일시': opened - rng.integers(1, 72 * 60, size) * np.timedelta64(1, 'm'),
+                '비고': np.where(rng.random(size) < 0.05, '낙찰하한선 미달', ''),
+            })
+        else:
+            chunk = pd.DataFrame({'순위': rank, '사업자등록번호': pd.array(bizno[company], dtype='Int64'), '업체명': name})
+
+        yield chunk
+        next_bid += count
+        done += size
+
+
+### 순위 데이터를 이전 실행의 keplergl_df(old_df)와 새로 조회한 업체 정보(newcompany_info)로 나누는 함수
+# 새 업체 정보에는 기존 업체 일부(주소가 바뀐 업체)도 넣어 get_final_df의 덮어쓰기 규칙도 측정에 포함
+def make_company_frames(ranked_df, companies_df, new_ratio=NEW_RATIO, seed=0):
+    rng = np.random.default_rng(seed + 3)
+    info = companies_df[COMPANYINFO_COLUMNS]
+    numbers = ranked_df['사업자등록번호'].astype('int64').to_numpy()
+
+    is_new = rng.random(len(numbers)) < new_ratio
+    changed = ~is_new & (rng.random(len(numbers)) < new_ratio / 10)
+
+    old_df = ranked_df[~is_new].astype({'사업자등록번호': 'int64'}).merge(info, on='사업자등록번호', how='left')
+    newcompany_info = info[info['사업자등록번호'].isin(numbers[is_new | changed])].reset_index(drop=True)
+    return old_df[KEPLERGL_COLUMNS], newcompany_info
+
+
+### 합성 데이터 파일 저장 (반환값 : 저장한 파일 경로 dict)
+def write_dataset(out_dir, rows, companies, regions=REGIONS, keyword='합성', seed=0, chunk_rows=CHUNK_ROWS):
+    keyword_dir = os.path.join(out_dir, keyword)
+    os.makedirs(keyword_dir, exist_ok=True)
+    files = {
+        'polygon': os.path.join(out_dir, 'polygon.csv'),
+        'result': os.path.join(keyword_dir, f'{keyword}_개찰결과_result.csv'),
+        'keplergl': os.path.join(keyword_dir, f'{keyword}_keplergl_df.csv'),
+        'newcompany_info': os.path.join(keyword_dir, f'{keyword}_newcompany_info.csv'),
+    }
+
+    polygon_df, grid = make_regions(regions, seed)
+    polygon_df.to_csv(files['polygon'], index=False, encoding='utf-8-sig')
+    companies_df = make_companies(companies, polygon_df, grid, seed)
+
+    # result는 chunk 단위로 이어 쓰고 업체별 집계도 chunk마다 누적 (최대 메모리가 행 수와 무관)
+    win_counts = None
+    for pos, chunk in enumerate(iter_results(rows, companies_df, seed, chunk_rows)):
+        chunk.to_csv(files['result'], mode='w' if pos == 0 else 'a', header=pos == 0, index=False,
+                     encoding='utf-8-sig' if pos == 0 else 'utf-8')
+        win_counts = update_win_counts(win_counts, chunk[ANALYSIS_COLUMNS])
+
+    ranked_df = rankclass(filtering_underone(winrate_from_counts(win_counts)))
+    old_df, newcompany_info = make_company_frames(ranked_df, companies_df, seed=seed)
+    old_df.to_csv(files['keplergl'], index=False, encoding='utf-8-sig')
+    newcompany_info.to_csv(files['newcompany_info'], index=False, encoding='utf-8-sig')
+    return files
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='분석 함수 벤치마크용 합성 데이터 생성')
+    parser.add_argument('--rows', type=int, default=100000, help='result 행 수 (10k ~ 10M)')
+    parser.add_argument('--companies', type=int, default=20000, help='업체 수 (최대 1M)')
+    parser.add_argument('--regions', type=int, default=REGIONS, help='시군구 수')
+    parser.add_argument('--keyword', default='합성', help='키워드 폴더 이름')
+    parser.add_argument('--seed', type=int, default=0, help='난수 seed (같으면 같은 데이터)')
+    parser.add_argument('--out', default=os.path.join('data', '_synthetic'), help='저장 폴더')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files = write_dataset(args.out, args.rows, args.companies, args.regions, args.keyword, args.seed)
+    for name, path in files.items():
+        print(f"{name:<16} {path} ({os.path.getsize(path) / 1024 ** 2:.1f}MB)")
+    print(f"✅ 합성 데이터 생성 완료 ({time.perf_counter() - start:.1f}s)")
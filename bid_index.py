@@ -0,0 +1,258 @@
+'''
+입찰공고번호 인덱스 (저장소 파일을 읽지 않고 공고 수집 여부를 바로 확인)
+- BloomFilter : 입찰공고번호 집합에 "확실히 없음"을 빠르게 판단하는 블룸 필터 클래스
+- BidIndex : 전체 저장소의 공고와 키워드별 소속 공고를 기록하는 SQLite 인덱스 클래스
+    - add_bids : 전체 저장소에 추가한 공고와 파티션 파일을 한 트랜잭션으로 기록
+    - add_members / clear_members : 키워드 소속 공고 기록 / 삭제
+    - forget_parts : 삭제된 파티션 파일 기록 제거
+    - indexed_parts : 인덱스에 반영된 파티션 파일 목록
+    - has_bid : 전체 저장소에 있는 공고인지 확인 (블룸 필터에 없으면 DB를 조회하지 않음)
+    - known_bidno : 주어진 번호 중 전체 저장소에 있는 번호 set
+    - key_months : 입찰공고번호(차수 포함) 또는 번호(차수 제외)로 공고의 개찰 월 조회
+    - is_member / member_keys : 키워드 소속 여부 확인 / 주어진 키 중 이미 소속된 키 set
+    - members : 키워드 소속 여부를 `in`으로 확인하는 KeywordBids 반환
+    - bump_revisions / revision : 저장된 데이터가 바뀐 공고를 가진 키워드의 데이터 버전 변경 / 조회 (낙찰 집계 재계산 판단용)
+- KeywordBids : 키워드 하나의 소속 공고 조회용 클래스 (`번호 in 객체` 형태로 사용)
+
+저장 구조 (data/_global/bid_index.sqlite)
+- bids : 입찰공고번호(차수 포함, PRIMARY KEY), 번호(차수 제외), 개찰 월
+- members : 키워드, 입찰공고번호, 번호
+- parts : 인덱스에 반영된 Parquet 파티션 파일 경로 (저장 도중 중단된 파일을 찾아 다시 반영하는 데 사용)
+- revisions : 키워드, 데이터 버전 (소속 공고의 데이터가 바뀔 때마다 새 값, 인덱스를 다시 만들면 기록이 없어져 바뀐 것으로 봄)
+- meta : 블룸 필터 비트와 용량
+
+번호 : 차수를 제외한 입찰공고번호 (검색 결과와 작업 큐에서 쓰는 형식, 예: 20240000000)
+'''
+
+import os
+import math
+import sqlite3
+import hashlib
+import uuid
+import threading
+
+INDEX_FILE = os.path.join('data', '_global', 'bid_index.sqlite')
+BLOOM_CAPACITY = 1000000  # 블룸 필터 초기 용량 (공고 수가 넘으면 두 배로 다시 만듦)
+BLOOM_ERROR_RATE = 0.01  # 블룸 필터 오탐률
+SQL_CHUNK = 500  # IN 조건 하나에 넣는 최대 값 수 (SQLite 변수 개수 제한)
+
+
+### 입력값 나누기 (SQL IN 조건용)
+def chunked(values, size=SQL_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+### 입찰공고번호에서 차수 제거
+def base_bidno(bid_key):
+    return str(bid_key).split('-')[0]
+
+
+class BloomFilter:
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE, bits=None):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))  # 비트 수
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))  # 해시 함수 수
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.size + 7) // 8)
+
+    ### 항목의 비트 위치 (해시 하나를 두 값으로 나누어 k개 위치를 만듦)
+    def positions(self, item):
+        digest = hashlib.blake2b(str(item).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for pos in self.positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self.positions(item))
+
+
+class BidIndex:
+    def __init__(self, index_file=INDEX_FILE, use_bloom=True):
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(index_file) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(index_file, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS bids (bid_key TEXT PRIMARY KEY, bidno TEXT, month TEXT);
+            CREATE INDEX IF NOT EXISTS bids_bidno ON bids (bidno);
+            CREATE TABLE IF NOT EXISTS members (keyword TEXT, bid_key TEXT, bidno TEXT, PRIMARY KEY (keyword, bid_key));
+            CREATE INDEX IF NOT EXISTS members_bidno ON members (keyword, bidno);
+            CREATE TABLE IF NOT EXISTS parts (path TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB);
+            CREATE TABLE IF NOT EXISTS revisions (keyword TEXT PRIMARY KEY, value TEXT);
+        ''')
+        self.conn.commit()
+        self.bloom = self.load_bloom() if use_bloom else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    ### 저장된 블룸 필터 읽기 (없거나 공고 수가 용량을 넘으면 bids 테이블로 다시 만듦)
+    def load_bloom(self):
+        count = self.conn.execute('SELECT COUNT(*) FROM bids').fetchone()[0]
+        row = self.conn.execute("SELECT value FROM meta WHERE name='bloom_capacity'").fetchone()
+        bits = self.conn.execute("SELECT value FROM meta WHERE name='bloom'").fetchone()
+        if row is not None and bits is not None and count <= int(row[0]):
+            return BloomFilter(int(row[0]), bits=bits[0])
+        return self.rebuild_bloom(count)
+
+    ### 블룸 필터 다시 만들기 (용량은 공고 수의 두 배 이상)
+    def rebuild_bloom(self, count):
+        capacity = BLOOM_CAPACITY
+        while capacity < count * 2:
+            capacity *= 2
+        bloom = BloomFilter(capacity)
+        for (bidno,) in self.conn.execute('SELECT DISTINCT bidno FROM bids'):
+            bloom.add(bidno)
+        self.save_bloom(bloom)
+        self.conn.commit()
+        return bloom
+
+    ### 블룸 필터 저장 (호출한 쪽에서 commit)
+    def save_bloom(self, bloom):
+        self.conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                              [('bloom_capacity', str(bloom.capacity)), ('bloom', bytes(bloom.bits))])
+
+    ### 전체 저장소에 추가한 공고 기록 (key_months : [(입찰공고번호, 개찰 월)], parts : 새로 쓴 파티션 파일)
+    def add_bids(self, key_months, parts=()):
+        rows = [(str(key), base_bidno(key), month) for key, month in key_months]
+        with self.lock:
+            self.conn.executemany('INSERT OR REPLACE INTO bids VALUES (?, ?, ?)', rows)
+            self.conn.executemany('INSERT OR IGNORE INTO parts VALUES (?)', [(os.path.normpath(path),) for path in parts])
+            if self.bloom is not None:
+                count = self.conn.execute('SELECT COUNT(*) FROM bids').fetchone()[0]
+                if count > self.bloom.capacity:
+                    self.bloom = self.rebuild_bloom(count)
+                else:
+                    for _, bidno, _ in rows:
+                        self.bloom.add(bidno)
+                    self.save_bloom(self.bloom)
+            self.conn.commit()
+
+    ### 키워드 소속 공고 기록
+    def add_members(self, keyword, keys, parts=()):
+        rows = [(keyword, str(key), base_bidno(key)) for key in keys]
+        with self.lock:
+            self.conn.executemany('INSERT OR IGNORE INTO members VALUES (?, ?, ?)', rows)
+            self.conn.executemany('INSERT OR IGNORE INTO parts VALUES (?)', [(os.path.normpath(path),) for path in parts])
+            self.conn.commit()
+
+    ### 키워드 소속 공고 삭제 (소속 공고를 다시 만들 때 사용)
+    def clear_members(self, keyword):
+        with self.lock:
+            self.conn.execute('DELETE FROM members WHERE keyword=?', (keyword,))
+            self.conn.commit()
+
+    ### 삭제된 파티션 파일 기록 제거
+    def forget_parts(self, parts):
+        with self.lock:
+            self.conn.executemany('DELETE FROM parts WHERE path=?', [(os.path.normpath(path),) for path in parts])
+            self.conn.commit()
+
+    ### 인덱스에 반영된 파티션 파일 (prefix로 시작하는 경로만)
+    def indexed_parts(self, prefix):
+        prefix = os.path.normpath(prefix)
+        with self.lock:
+            rows = self.conn.execute('SELECT path FROM parts WHERE substr(path, 1, ?)=?', (len(prefix), prefix)).fetchall()
+        return {row[0] for row in rows}
+
+    ### 전체 저장소에 있는 공고인지 확인 (번호 기준)
+    def has_bid(self, bidno):
+        bidno = base_bidno(bidno)
+        if self.bloom is not None and bidno not in self.bloom:
+            return False
+        with self.lock:
+            return self.conn.execute('SELECT 1 FROM bids WHERE bidno=? LIMIT 1', (bidno,)).fetchone() is not None
+
+    ### 주어진 번호 중 전체 저장소에 있는 번호
+    def known_bidno(self, bidnos):
+        candidates = {base_bidno(bid) for bid in bidnos}
+        if self.bloom is not None:
+            candidates = {bid for bid in candidates if bid in self.bloom}
+
+        known = set()
+        with self.lock:
+            for chunk in chunked(candidates):
+                rows = self.conn.execute(f"SELECT DISTINCT bidno FROM bids WHERE bidno IN ({','.join('?' * len(chunk))})", chunk)
+                known.update(row[0] for row in rows)
+        return known
+
+    ### 공고의 개찰 월 조회 (keys : 입찰공고번호, bidnos : 번호), 반환값 : {입찰공고번호: 개찰 월}
+    def key_months(self, keys=None, bidnos=None):
+        if bidnos is not None:
+            column, values = 'bidno', self.known_bidno(bidnos)
+        else:
+            column, values = 'bid_key', [str(key) for key in keys]
+            if self.bloom is not None:
+                values = [key for key in values if base_bidno(key) in self.bloom]
+
+        months = {}
+        with self.lock:
+            for chunk in chunked(values):
+                rows = self.conn.execute(f"SELECT bid_key, month FROM bids WHERE {column} IN ({','.join('?' * len(chunk))})", chunk)
+                months.update(rows)
+        return months
+
+    ### 키워드 소속 여부 확인 (번호 기준, 전체 저장소에 없는 번호는 DB를 조회하지 않음)
+    def is_member(self, keyword, bidno):
+        bidno = base_bidno(bidno)
+        if self.bloom is not None and bidno not in self.bloom:
+            return False
+        with self.lock:
+            return self.conn.execute('SELECT 1 FROM members WHERE keyword=? AND bidno=? LIMIT 1', (keyword, bidno)).fetchone() is not None
+
+    ### 주어진 입찰공고번호 중 키워드에 이미 소속된 키
+    def member_keys(self, keyword, keys):
+        found = set()
+        with self.lock:
+            for chunk in chunked(map(str, keys)):
+                rows = self.conn.execute(f"SELECT bid_key FROM members WHERE keyword=? AND bid_key IN ({','.join('?' * len(chunk))})", [keyword] + chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    ### 키워드 소속 공고 수
+    def member_count(self, keyword):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM members WHERE keyword=?', (keyword,)).fetchone()[0]
+
+    def members(self, keyword):
+        return KeywordBids(self, keyword)
+
+    ### 주어진 입찰공고번호를 소속 공고로 가진 모든 키워드의 데이터 버전 변경 (반환값 : 변경한 키워드 목록)
+    def bump_revisions(self, keys):
+        keywords = set()
+        with self.lock:
+            for chunk in chunked(map(str, keys)):
+                rows = self.conn.execute(f"SELECT DISTINCT keyword FROM members WHERE bid_key IN ({','.join('?' * len(chunk))})", chunk)
+                keywords.update(row[0] for row in rows)
+            self.conn.executemany('INSERT OR REPLACE INTO revisions VALUES (?, ?)', [(keyword, uuid.uuid4().hex) for keyword in keywords])
+            self.conn.commit()
+        return sorted(keywords)
+
+    ### 키워드의 데이터 버전 (한 번도 바뀌지 않았으면 빈 문자열)
+    def revision(self, keyword):
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM revisions WHERE keyword=?', (keyword,)).fetchone()
+        return '' if row is None else row[0]
+
+
+class KeywordBids:
+    def __init__(self, index, keyword):
+        self.index = index
+        self.keyword = keyword
+
+    def __contains__(self, bidno):
+        return self.index.is_member(self.keyword, bidno)
+
+    def __len__(self):
+        return self.index.member_count(self.keyword)
@@ -0,0 +1,690 @@
+'''
+개찰결과 목록/result 저장소 (개찰 월별로 나뉜 Parquet 파일)
+- apply_schema : 수집한 문자열 데이터를 컬럼별 타입(숫자, 일시, category)으로 한 번만 변환하는 함수
+- has_store : 키워드 폴더에 Parquet 저장소가 있는지 확인하는 함수
+- uses_global : 키워드 저장소가 공고 데이터를 전체 저장소에 두고 소속 공고 목록만 가지는 형식인지 확인하는 함수
+- bid_months : 실제개찰일시로부터 파티션 이름(YYYY-MM)을 구하는 함수
+- append_partitions : 새로 수집한 데이터를 월별 파티션 파일로 추가하는 함수 (기존 파일은 다시 쓰지 않음)
+- clear_store : 저장소를 비우는 함수
+- get_index : 전체 저장소와 키워드 소속 공고의 입찰공고번호 인덱스(bid_index)를 반환하는 함수
+- sync_index : 인덱스에 반영되지 않은 파티션 파일을 찾아 반영하는 함수
+- known_bidno : 주어진 번호 중 전체 저장소에 있는 번호를 반환하는 함수
+- bid_lookup : 키워드에서 이미 수집한 공고인지 `in`으로 확인하는 객체를 반환하는 함수 (저장소 파일을 읽지 않음)
+- read_members : 키워드에 속한 공고의 입찰공고번호와 개찰 월을 읽는 함수
+- count_marker : 키워드 데이터의 집계 기준(소속 공고 파일 목록, 데이터 버전)을 반환하는 함수 (증분 낙찰 집계용)
+- read_member_results : 주어진 소속 공고 파일에 기록된 공고의 result만 전체 저장소에서 읽는 함수
+- add_members : 키워드에 공고를 연결하는 함수 (이미 연결된 공고는 건너뜀)
+- append_bids : 새로 수집한 공고 중 전체 저장소에 없는 공고만 추가하고 키워드에 연결하는 함수
+- replace_bids : 키워드에 속한 공고만 전체 저장소에서 새로 파싱한 데이터로 바꾸는 함수 (캐시 재파싱용, 다른 키워드의 공고는 연결만 함)
+- link_global_bids : 다른 키워드에서 이미 수집한 공고를 키워드에 연결하고 그 데이터를 반환하는 함수
+- migrate_to_global : 공고 데이터를 직접 가진 기존 키워드 저장소를 전체 저장소로 옮기는 함수
+- prepare_store : 키워드의 기존 CSV/저장소를 전체 저장소 형식으로 옮기는 함수 (저장 전에 호출)
+- recover_store : replace_bids가 중간에 멈춘 저장소를 복구하는 함수 (전체 저장소 파일 교체를 마저 끝내고, 키워드 소속 공고 폴더 교체를 마무리)
+- list_months : 저장소에 있는 개찰 월 목록을 반환하는 함수
+- read_table : 저장소의 bids/results 테이블에서 필요한 월, 컬럼, 공고만 읽는 함수
+- read_bids / read_results : 저장소가 있으면 저장소에서, 없으면 기존 CSV에서 개찰결과 목록/result를 읽는 함수
+- iter_results : 개찰결과 result를 정해진 행 수 이하씩 나누어 읽는 함수 (이력이 긴 키워드의 분석용)
+- get_date_range : 가장 오래된 월과 가장 최근 월 파티션만 읽어 개찰일시 범위를 구하는 함수
+- migrate_csv_to_store : 기존 CSV 파일을 저장소로 옮기는 함수
+- attach_bid_key : Index로 연결된 기존 result를 입찰공고번호로 연결되도록 바꾸는 함수 (호환용)
+
+저장 구조
+- data/_global/store : 모든 키워드가 공유하는 전체 저장소 (같은 공고는 키워드 수와 관계없이 한 번만 저장)
+    - bids/month=YYYY-MM/part-*.parquet : 개찰결과 목록
+    - results/month=YYYY-MM/part-*.parquet : 개찰결과 result (해당 공고의 개찰 월 파티션에 저장)
+- data/<키워드>/store : 키워드 저장소
+    - members/month=YYYY-MM/part-*.parquet : 키워드에 속한 공고의 입찰공고번호 (전체 저장소와 같은 개찰 월 파티션)
+    - meta.json : 저장소 형식 버전과 형식(layout='members')
+- data/_global/store/replace_journal.json : replace_bids가 공개할 새 파일(.staged)과 삭제할 기존 파일 목록 (교체 중에만 존재)
+- data/_global/bid_index.sqlite : 입찰공고번호 인덱스 (공고/소속 여부 확인용, 파티션 파일로 언제든 다시 만들 수 있음)
+- 이전 버전의 키워드 저장소(bids/results를 직접 가진 형식)는 그대로 읽을 수 있고, 다음 저장 때 전체 저장소로 옮김
+
+result 행은 위치 기반 Index가 아니라 입찰공고번호(차수 포함)로 공고와 연결되므로 모든 수집 모드는 파일 추가만 함
+Index 컬럼을 쓰던 기존 CSV와 파티션 파일은 읽을 때 같은 월의 공고 목록으로 입찰공고번호를 찾아 붙임
+'''
+
+import os
+import glob
+import json
+import uuid
+import shutil
+import threading
+import importlib.util
+import pandas as pd
+from bid_index import BidIndex
+
+if importlib.util.find_spec('pyarrow') is not None:
+    import pyarrow.parquet as pq
+
+STORE_ENABLED = importlib.util.find_spec('pyarrow') is not None  # Parquet 저장에는 pyarrow 필요
+
+BID_KEY = '입찰공고번호'  # 공고와 result를 연결하는 키 (예: 20240000000-00)
+BID_COLUMNS = ['입찰공고번호', '공고명', '수요기관', '집행관', '실제개찰일시']
+RESULT_COLUMNS = ['입찰공고번호', '순위', '사업자등록번호', '업체명', '대표자명', '입찰금액', '투찰률(%)', '추첨번호', '투찰일시', '비고']
+STORE_VERSION = 4
+GLOBAL_DIR = os.path.join('data', '_global')  # 전체 저장소 폴더 (store_dir(GLOBAL_DIR)에 저장)
+JOURNAL_FILE = 'replace_journal.json'  # store_dir 안의 파일 교체 기록 (replace_bids)
+STAGED_SUFFIX = '.staged'  # 교체가 끝나기 전까지 읽히지 않도록 새 파티션 파일에 붙이는 확장자
+GLOBAL_LOCK = threading.Lock()  # 전체 저장소 쓰기 잠금 (배치 실행에서 여러 키워드가 동시에 저장)
+INDEX_FILE = 'bid_index.sqlite'  # GLOBAL_DIR 안의 입찰공고번호 인덱스 파일
+INDEXES = {}  # 인덱스 파일 경로 → BidIndex
+INDEX_LOCK = threading.Lock()
+CHUNK_ROWS = 200000  # 나누어 읽을 때 한 번에 읽는 최대 행 수 (파티션 파일의 row group 크기로도 사용)
+UNKNOWN_MONTH = 'unknown'  # 개찰일시를 해석할 수 없는 공고의 파티션
+
+# 컬럼별 저장 타입 (수집 시 한 번만 변환, 이후 단계는 변환된 값을 그대로 사용)
+# 금액은 쉼표를 제거한 정수(원), 업체명/기관명처럼 반복되는 문자열은 category
+SCHEMA = {
+    '입찰공고번호': 'string', '공고명': 'string', '수요기관': 'category', '집행관': 'category', '실제개찰일시': 'datetime',
+    '순위': 'Int64', '사업자등록번호': 'Int64', '업체명': 'category', '대표자명': 'category', '입찰금액': 'Int64',
+    '투찰률(%)': 'float64', '추첨번호': 'string', '투찰일시': 'datetime', '비고': 'category',
+}
+NUMBER_SEPARATORS = {'사업자등록번호': ',-'}  # 숫자 컬럼별로 제거할 구분 문자 (기본은 쉼표, 사업자등록번호는 123-45-67890 형식도 허용)
+DATETIME_FORMAT = 'ISO8601' if int(pd.__version__.split('.')[0]) >= 2 else None  # 2024-01-01 10:00 / 2024-01-01 10:00:00 모두 허용
+
+
+### 저장소 경로
+def store_dir(data_dir):
+    return os.path.join(data_dir, 'store')
+
+
+### 저장소 존재 여부 확인
+def has_store(data_dir):
+    return os.path.exists(os.path.join(store_dir(data_dir), 'meta.json'))
+
+
+### 저장소 메타 정보 읽기 (없으면 빈 dict)
+def read_meta(data_dir):
+    meta_file = os.path.join(store_dir(data_dir), 'meta.json')
+    if not os.path.exists(meta_file):
+        return {}
+    with open(meta_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+### 공고 데이터를 전체 저장소에 두는 키워드 저장소인지 확인
+def uses_global(data_dir):
+    return read_meta(data_dir).get('layout') == 'members'
+
+
+### 저장소 메타 정보 쓰기
+def write_meta(data_dir, meta):
+    meta_file = os.path.join(store_dir(data_dir), 'meta.json')
+    tmp_file = f'{meta_file}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_file, meta_file)
+
+
+### 실제개찰일시로 파티션 이름(YYYY-MM) 구하기
+def bid_months(when):
+    dates = pd.to_datetime(when, errors='coerce')
+    return dates.dt.strftime('%Y-%m').fillna(UNKNOWN_MONTH)
+
+
+### 숫자 컬럼 변환 (구분 문자(separators), 공백 제거 후 변환, 해석할 수 없는 값은 결측치)
+def parse_number(values, separators=','):
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    text = values.astype('string')
+    for separator in separators:
+        text = text.str.replace(separator, '', regex=False)
+    return pd.to_numeric(text.str.strip(), errors='coerce')
+
+
+### 일시 컬럼 변환 (2024/01/01 형식도 허용, 해석할 수 없는 값은 NaT)
+def parse_datetime(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.astype('string').str.strip().str.replace('/', '-', regex=False)
+    return pd.to_datetime(text, errors='coerce', format=DATETIME_FORMAT)
+
+
+### 수집한 문자열 데이터를 SCHEMA의 타입으로 변환하는 함수 (이미 변환된 컬럼은 다시 변환하지 않음)
+def apply_schema(df):
+    df = df.copy()
+    for column in df.columns:
+        kind = SCHEMA.get(column)
+        values = df[column]
+
+        if kind == 'datetime':
+            df[column] = parse_datetime(values)
+        elif kind in ('Int64', 'float64'):
+            parsed = parse_number(values, NUMBER_SEPARATORS.get(column, ','))
+            # 값이 있었는데 숫자로 바꾸지 못한 행은 결측치가 되므로 알림 (사업자등록번호가 결측치인 행은 집계에서 빠짐)
+            lost = parsed.isna() & values.notna() & values.astype('string').str.strip().ne('')
+            if lost.any():
+                print(f"⚠️'{column}' 값 {lost.sum()}건을 숫자로 바꾸지 못해 결측치로 저장합니다. (예: {values[lost].iloc[0]})")
+            df[column] = parsed.astype(kind)
+        elif kind == 'category' and not isinstance(values.dtype, pd.CategoricalDtype):
+            df[column] = values.astype('string').astype('category')
+        elif kind == 'string' and values.dtype != 'string':
+            df[column] = values.astype('string')
+    return df
+
+
+### DataFrame 하나를 파티션 파일로 저장 (임시 파일에 쓴 뒤 교체, 저장한 파일 경로 반환)
+# staged=True이면 읽히지 않는 이름(.staged)으로 저장 (replace_bids에서 교체 기록 후 공개)
+def write_part(data_dir, table, month, df, staged=False):
+    part_dir = os.path.join(store_dir(data_dir), table, f'month={month}')
+    os.makedirs(part_dir, exist_ok=True)
+
+    part_file = os.path.join(part_dir, f'part-{pd.Timestamp.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet')
+    if staged:
+        part_file += STAGED_SUFFIX
+    tmp_file = f'{part_file}.tmp'
+    df.to_parquet(tmp_file, index=False, row_group_size=CHUNK_ROWS)
+    os.replace(tmp_file, part_file)
+    return part_file
+
+
+### 새로 수집한 데이터를 월별 파티션으로 추가하는 함수 (기존 파티션 파일은 건드리지 않음, 새로 쓴 파일 목록 반환)
+def append_partitions(data_dir, new_bid_df, new_result_df, staged=False):
+    os.makedirs(store_dir(data_dir), exist_ok=True)
+
+    bid_df = apply_schema(new_bid_df[BID_COLUMNS])
+    result_df = apply_schema(new_result_df[RESULT_COLUMNS])
+
+    # result는 해당 공고의 개찰 월 파티션에 저장
+    bid_df['month'] = bid_months(bid_df['실제개찰일시']).to_numpy()
+    month_of_bid = bid_df.drop_duplicates(BID_KEY).set_index(BID_KEY)['month']
+    result_df['month'] = result_df[BID_KEY].map(month_of_bid).fillna(UNKNOWN_MONTH)
+
+    parts = []
+    for table, df in (('bids', bid_df), ('results', result_df)):
+        for month, part in df.groupby('month'):
+            parts.append(write_part(data_dir, table, month, part.drop(columns='month'), staged))
+
+    write_meta(data_dir, {'version': STORE_VERSION})
+    return parts
+
+
+### 저장소 비우기
+def clear_store(data_dir):
+    if os.path.exists(store_dir(data_dir)):
+        shutil.rmtree(store_dir(data_dir))
+
+
+### 저장소의 개찰 월 목록 (오름차순, 전체 저장소를 쓰는 키워드는 소속 공고가 있는 월)
+def list_months(data_dir, table='bids'):
+    if table != 'members' and uses_global(data_dir):
+        table = 'members'
+    part_dirs = glob.glob(os.path.join(store_dir(data_dir), table, 'month=*'))
+    return sorted(os.path.basename(path).split('=', 1)[1] for path in part_dirs)
+
+
+### 월 파티션의 파일 목록
+def month_files(data_dir, table, month):
+    return sorted(glob.glob(os.path.join(store_dir(data_dir), table, f'month={month}', 'part-*.parquet')))
+
+
+### Index로 연결된 기존 result에 입찰공고번호를 붙이고 Index를 제거하는 함수 (호환용)
+def attach_bid_key(result_df, bid_df):
+    if 'Index' not in result_df.columns:
+        return result_df
+
+    result_df = result_df.copy()
+    if BID_KEY not in result_df.columns:
+        bid_index = pd.to_numeric(bid_df['Index'], errors='coerce')
+        keys = pd.Series(bid_df[BID_KEY].to_numpy(), index=bid_index).groupby(level=0).first()
+        result_df.insert(0, BID_KEY, pd.to_numeric(result_df['Index'], errors='coerce').map(keys).to_numpy())
+    return result_df.drop(columns='Index')
+
+
+### 파티션 파일 하나 읽기 (Index를 쓰던 기존 result 파일은 같은 월의 공고 목록으로 입찰공고번호를 찾아 붙임)
+# keys를 주면 해당 입찰공고번호의 행만 읽음 (입찰공고번호가 있는 파일은 Parquet을 읽을 때 바로 걸러냄)
+def read_part(data_dir, table, month, path, columns, legacy_keys, keys=None):
+    file_columns = pq.read_schema(path).names
+
+    if table == 'results' and BID_KEY not in file_columns:
+        wanted = None if columns is None else [c for c in columns if c != BID_KEY] + ['Index']
+        df = pd.read_parquet(path, columns=wanted)
+
+        if month not in legacy_keys:
+            legacy_parts = [pd.read_parquet(bid_path, columns=['Index', BID_KEY])
+                            for bid_path in month_files(data_dir, 'bids', month) if 'Index' in pq.read_schema(bid_path).names]
+            legacy_keys[month] = pd.concat(legacy_parts, ignore_index=True) if legacy_parts else pd.DataFrame(columns=['Index', BID_KEY])
+        df = attach_bid_key(df, legacy_keys[month])
+        if keys is not None:
+            df = df[df[BID_KEY].isin(keys)]
+    else:
+        df = pd.read_parquet(path, columns=columns, filters=None if keys is None else [(BID_KEY, 'in', keys)])
+
+    if 'Index' in df.columns:
+        df = df.drop(columns='Index')
+    return df if columns is None else df[columns]
+
+
+### 저장소 테이블 읽기 (months, columns, keys를 주면 해당 파티션, 컬럼, 입찰공고번호의 행만 읽음)
+# 전체 저장소를 쓰는 키워드는 같은 월의 전체 저장소 파티션에서 소속 공고의 행만 읽음
+def read_table(data_dir, table, columns=None, months=None, keys=None):
+    if uses_global(data_dir):
+        members = read_members(data_dir, months)
+        member_keys = members[BID_KEY].astype(str)
+        if keys is not None:
+            member_keys = member_keys[member_keys.isin(list(keys))]
+        return read_table(GLOBAL_DIR, table, columns, sorted(members['month'].unique()), member_keys.tolist())
+
+    months = list_months(data_dir, table) if months is None else months
+    default_columns = BID_COLUMNS if table == 'bids' else RESULT_COLUMNS
+    legacy_keys = {}  # 월별 (Index, 입찰공고번호) 대응표 (기존 형식 파일이 있을 때만 사용)
+    if keys is not None:
+        keys = [str(key) for key in keys]
+        months = months if keys else []  # 읽을 공고가 없으면 파일을 열지 않음
+
+    parts = [read_part(data_dir, table, month, path, columns, legacy_keys, keys)
+             for month in months for path in month_files(data_dir, table, month)]
+    if keys is not None:
+        parts = [part for part in parts if not part.empty]  # 소속 공고가 없는 파일 제외
+
+    if not parts:
+        return pd.DataFrame(columns=columns or default_columns)
+    return apply_schema(pd.concat(parts, ignore_index=True))  # 파티션마다 다른 category와 기존 문자열 파티션 통일
+
+
+### 개찰결과 목록 읽기 (저장소가 없으면 기존 CSV 사용)
+def read_bids(data_dir, file_prefix, columns=None, months=None, **csv_options):
+    if has_store(data_dir):
+        return read_table(data_dir, 'bids', columns, months)
+
+    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+    if not os.path.exists(bid_file):
+        return pd.DataFrame(columns=columns or BID_COLUMNS)
+
+    bid_df = pd.read_csv(bid_file, usecols=columns, **csv_options)
+    return apply_schema(bid_df.drop(columns='Index') if 'Index' in bid_df.columns else bid_df)
+
+
+### 개찰결과 result 읽기 (저장소가 없으면 기존 CSV 사용, Index를 쓰던 CSV는 입찰공고번호를 찾아 붙임)
+def read_results(data_dir, file_prefix, columns=None, months=None, **csv_options):
+    if has_store(data_dir):
+        return read_table(data_dir, 'results', columns, months)
+
+    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+    result_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_result.csv')
+    if not os.path.exists(result_file):
+        return pd.DataFrame(columns=columns or RESULT_COLUMNS)
+
+    file_columns = pd.read_csv(result_file, nrows=0).columns
+    if BID_KEY in file_columns:
+        return apply_schema(pd.read_csv(result_file, usecols=columns, **csv_options))
+
+    # 기존 형식: Index로 공고 목록과 연결
+    wanted = None if columns is None else [c for c in columns if c != BID_KEY] + ['Index']
+    result_df = pd.read_csv(result_file, usecols=wanted, **csv_options)
+    result_df = attach_bid_key(result_df, pd.read_csv(bid_file, usecols=['Index', BID_KEY], dtype=str))
+    return apply_schema(result_df if columns is None else result_df[columns])
+
+
+### 개찰결과 result를 chunk_rows 행 이하씩 나누어 읽는 제너레이터 (전체 이력을 한 번에 메모리에 올리지 않음)
+def iter_results(data_dir, file_prefix, columns=None, chunk_rows=CHUNK_ROWS):
+    if uses_global(data_dir):
+        # 월별로 소속 공고를 확인하며 전체 저장소 파티션을 나누어 읽음
+        wanted = columns if columns is None or BID_KEY in columns else columns + [BID_KEY]
+        for month, keys in read_members(data_dir).groupby('month')[BID_KEY]:
+            keys = set(keys)
+            for path in month_files(GLOBAL_DIR, 'results', month):
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=wanted):
+                    chunk = batch.to_pandas()
+                    chunk = chunk[chunk[BID_KEY].isin(keys)]
+                    if not chunk.empty:
+                        yield apply_schema(chunk if columns is None else chunk[columns])
+        return
+
+    if has_store(data_dir):
+        legacy_keys = {}
+        for month in list_months(data_dir, 'results'):
+            for path in month_files(data_dir, 'results', month):
+                if BID_KEY not in pq.read_schema(path).names:  # Index를 쓰던 기존 파일은 파일 단위로 읽음
+                    yield apply_schema(read_part(data_dir, 'results', month, path, columns, legacy_keys))
+                    continue
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+                    yield apply_schema(batch.to_pandas())
+        return
+
+    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+    result_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_result.csv')
+    if not os.path.exists(result_file):
+        return
+
+    if BID_KEY in pd.read_csv(result_file, nrows=0).columns:
+        for chunk in pd.read_csv(result_file, usecols=columns, chunksize=chunk_rows):
+            yield apply_schema(chunk)
+        return
+
+    # 기존 형식: Index로 공고 목록과 연결
+    wanted = None if columns is None else [c for c in columns if c != BID_KEY] + ['Index']
+    bid_keys = pd.read_csv(bid_file, usecols=['Index', BID_KEY], dtype=str)
+    for chunk in pd.read_csv(result_file, usecols=wanted, chunksize=chunk_rows):
+        chunk = attach_bid_key(chunk, bid_keys)
+        yield apply_schema(chunk if columns is None else chunk[columns])
+
+
+### 가장 최근/오래된 개찰일시 구하기 (양 끝 월 파티션만 읽음, 데이터가 없으면 (None, None))
+def get_date_range(data_dir):
+    months = [month for month in list_months(data_dir, 'bids') if month != UNKNOWN_MONTH]
+    edge_months = sorted({months[0], months[-1]}) if months else None
+
+    when = read_table(data_dir, 'bids', ['실제개찰일시'], edge_months)['실제개찰일시']
+    if when.isna().all():
+        return None, None
+    return when.max(), when.min()
+
+
+### 기존 CSV 파일을 저장소로 옮기는 함수 (옮긴 CSV는 .migrated 확장자를 붙여 보관)
+def migrate_csv_to_store(data_dir, file_prefix):
+    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+    result_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_result.csv')
+    if has_store(data_dir) or not (os.path.exists(bid_file) and os.path.exists(result_file)):
+        return False
+
+    bid_df = pd.read_csv(bid_file, dtype=str, keep_default_na=False)
+    result_df = pd.read_csv(result_file, dtype=str, keep_default_na=False)
+    append_bids(data_dir, bid_df, attach_bid_key(result_df, bid_df))
+
+    os.replace(bid_file, f'{bid_file}.migrated')
+    os.replace(result_file, f'{result_file}.migrated')
+    print(f"✅ 기존 CSV 데이터를 월별 저장소로 옮겼습니다: {store_dir(data_dir)}")
+    return True
+
+
+### 입찰공고번호 인덱스 반환 (프로그램 전체에서 하나만 생성, 처음 열 때 인덱스에 없는 전체 저장소 파일을 반영)
+def get_index():
+    index_file = os.path.join(GLOBAL_DIR, INDEX_FILE)
+    with INDEX_LOCK:
+        if index_file not in INDEXES:
+            recover_store(GLOBAL_DIR)
+            INDEXES[index_file] = BidIndex(index_file)
+            sync_index(INDEXES[index_file])
+        return INDEXES[index_file]
+
+
+### 키워드 이름 (키워드 폴더 이름)
+def keyword_of(data_dir):
+    return os.path.basename(os.path.normpath(data_dir))
+
+
+### 파티션 파일 경로에서 개찰 월 구하기
+def month_of_part(path):
+    return os.path.basename(os.path.dirname(path)).split('=', 1)[1]
+
+
+### 인덱스에 반영되지 않은 파티션 파일을 찾아 반영하는 함수 (파일 저장 후 인덱스 기록 전에 중단된 경우 복구)
+# data_dir을 주면 그 키워드의 소속 공고 파일도 확인
+def sync_index(index, data_dir=None):
+    targets = [(GLOBAL_DIR, 'bids', None)]
+    if data_dir is not None and uses_global(data_dir):
+        targets.append((data_dir, 'members', keyword_of(data_dir)))
+
+    for source_dir, table, keyword in targets:
+        files = {os.path.normpath(path) for month in list_months(source_dir, table) for path in month_files(source_dir, table, month)}
+        indexed = index.indexed_parts(os.path.join(store_dir(source_dir), table))
+        for path in sorted(files - indexed):
+            keys = pd.read_parquet(path, columns=[BID_KEY])[BID_KEY].astype(str)
+            if keyword is None:
+                index.add_bids([(key, month_of_part(path)) for key in keys], [path])
+            else:
+                index.add_members(keyword, keys, [path])
+        if indexed - files:
+            index.forget_parts(indexed - files)
+
+
+### 주어진 번호(차수 제외) 중 전체 저장소에 있는 번호 set
+def known_bidno(bidno):
+    return get_index().known_bidno(bidno)
+
+
+### 키워드에서 이미 수집한 공고 확인용 객체 (`번호 in 객체`, 번호는 차수 제외)
+# 저장소를 쓰면 입찰공고번호 인덱스로 바로 확인하고, CSV만 쓰는 경우 목록 파일의 번호 set을 반환
+def bid_lookup(data_dir, file_prefix):
+    if not STORE_ENABLED:
+        bids = read_bids(data_dir, file_prefix, columns=[BID_KEY])[BID_KEY]
+        return set(bids.astype(str).str.split('-').str[0])
+
+    prepare_store(data_dir, file_prefix)
+    if not uses_global(data_dir):  # 아직 저장된 공고가 없는 키워드
+        return set()
+    index = get_index()
+    sync_index(index, data_dir)
+    return index.members(keyword_of(data_dir))
+
+
+### 키워드 소속 공고 읽기 (입찰공고번호, month)
+def read_members(data_dir, months=None):
+    months = list_months(data_dir, 'members') if months is None else months
+    parts = [pd.read_parquet(path, columns=[BID_KEY]).assign(month=month)
+             for month in months for path in month_files(data_dir, 'members', month)]
+    if not parts:
+        return pd.DataFrame(columns=[BID_KEY, 'month'])
+    return pd.concat(parts, ignore_index=True).drop_duplicates(BID_KEY)
+
+
+### 증분 낙찰 집계 기준 (전체 저장소를 쓰지 않는 키워드는 None)
+# parts : 소속 공고 파일 목록 (저장할 때마다 파일이 추가되므로 새 파일의 공고만 새로 집계, 목록이 줄면 소속 공고를 다시 만든 것)
+# revision : 소속 공고의 데이터 버전 (다른 키워드의 재파싱으로 공유 공고가 바뀌면 달라짐)
+def count_marker(data_dir):
+    if not uses_global(data_dir):
+        return None
+    members_dir = os.path.join(store_dir(data_dir), 'members')
+    parts = [os.path.relpath(path, members_dir).replace(os.sep, '/')
+             for month in list_months(data_dir, 'members') for path in month_files(data_dir, 'members', month)]
+    return {'revision': get_index().revision(keyword_of(data_dir)), 'parts': sorted(parts)}
+
+
+### 소속 공고 파일(count_marker의 parts 형식)에 기록된 공고의 result만 읽는 함수 (월별로 해당 공고의 행만 읽음)
+def read_member_results(data_dir, parts, columns=None):
+    members_dir = os.path.join(store_dir(data_dir), 'members')
+    keys = pd.DataFrame({'part': list(parts)})
+    keys['month'] = keys['part'].str.split('/').str[0].str.split('=', n=1).str[1]
+
+    frames = []
+    for month, group in keys.groupby('month'):
+        month_keys = pd.concat([pd.read_parquet(os.path.join(members_dir, part), columns=[BID_KEY])[BID_KEY] for part in group['part']])
+        frames.append(read_table(GLOBAL_DIR, 'results', columns, [month], month_keys.astype(str).tolist()))
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return apply_schema(pd.DataFrame(columns=columns or RESULT_COLUMNS))
+    return pd.concat(frames, ignore_index=True)
+
+
+### 키워드에 공고 연결 (key_months : 입찰공고번호 → 개찰 월 Series, 이미 연결된 공고는 건너뜀)
+def add_members(data_dir, key_months):
+    os.makedirs(store_dir(data_dir), exist_ok=True)
+    index = get_index()
+    keyword = keyword_of(data_dir)
+    if uses_global(data_dir):
+        existing = index.member_keys(keyword, key_months.index)
+    else:  # 처음 연결하는 키워드는 이전에 같은 이름으로 남은 인덱스 기록을 지움
+        index.clear_members(keyword)
+        existing = set()
+
+    members = pd.DataFrame({BID_KEY: key_months.index.astype(str), 'month': key_months.to_numpy()})
+    members = members[~members[BID_KEY].isin(existing)].drop_duplicates(BID_KEY)
+    parts = [write_part(data_dir, 'members', month, part[[BID_KEY]].astype('string')) for month, part in members.groupby('month')]
+
+    write_meta(data_dir, {'version': STORE_VERSION, 'layout': 'members'})
+    index.add_members(keyword, members[BID_KEY], parts)
+
+
+### 공고별 개찰 월 (known : 전체 저장소에 이미 있는 공고의 {입찰공고번호: 개찰 월}, 이 공고는 저장된 월을 따름)
+def key_months_of(bid_df, known=None):
+    months = pd.Series(bid_months(bid_df['실제개찰일시']).to_numpy(), index=bid_df[BID_KEY].astype(str).to_numpy())
+    months = months[~months.index.duplicated()]
+    if known:
+        stored = months.index.isin(list(known))
+        months[stored] = [known[key] for key in months.index[stored]]
+    return months
+
+
+### 새로 수집한 공고를 전체 저장소에 추가하고 키워드에 연결하는 함수 (전체 저장소에 이미 있는 공고는 연결만 함)
+# 파티션 파일을 모두 쓴 뒤 입찰공고번호 인덱스를 한 트랜잭션으로 갱신
+def append_bids(data_dir, new_bid_df, new_result_df):
+    bid_df = apply_schema(new_bid_df[BID_COLUMNS]).drop_duplicates(BID_KEY)
+    result_df = apply_schema(new_result_df[RESULT_COLUMNS])
+
+    with GLOBAL_LOCK:
+        index = get_index()
+        known = index.key_months(keys=bid_df[BID_KEY])
+        months = key_months_of(bid_df, known)
+
+        fresh = ~bid_df[BID_KEY].isin(list(known))
+        if fresh.any():
+            fresh_keys = bid_df.loc[fresh, BID_KEY]
+            parts = append_partitions(GLOBAL_DIR, bid_df[fresh], result_df[result_df[BID_KEY].isin(fresh_keys)])
+            index.add_bids(months[fresh_keys.astype(str)].items(), parts)
+        add_members(data_dir, months)
+
+
+### 교체 기록에 따라 새 파일(.staged)을 공개하고 기존 파일을 삭제하는 함수 (여러 번 실행해도 같은 결과, 공개한 파일 목록 반환)
+def apply_journal(data_dir):
+    journal_file = os.path.join(store_dir(data_dir), JOURNAL_FILE)
+    with open(journal_file, encoding='utf-8') as f:
+        journal = json.load(f)
+
+    published = []
+    for path in journal['publish']:
+        final = path[:-len(STAGED_SUFFIX)]
+        if os.path.exists(path):
+            os.replace(path, final)
+        published.append(final)
+    for path in journal['remove']:
+        if os.path.exists(path):
+            os.remove(path)
+    os.remove(journal_file)
+    return published
+
+
+### replace_bids가 중간에 멈춘 저장소 복구
+# 교체 기록이 있으면 기록된 교체를 마저 끝내고, 기록 전에 멈춰 남은 .staged 파일은 삭제 (인덱스는 sync_index가 파일 기준으로 맞춤)
+# 키워드 소속 공고 폴더는 새 폴더(members.tmp) 교체 도중 멈춘 경우 마무리
+def recover_store(data_dir):
+    root = store_dir(data_dir)
+    if os.path.exists(os.path.join(root, JOURNAL_FILE)):
+        apply_journal(data_dir)
+        print("✅ 중단된 재파싱 저장을 마저 반영했습니다.")
+    for path in glob.glob(os.path.join(root, '*', 'month=*', f'part-*.parquet{STAGED_SUFFIX}')):
+        os.remove(path)
+
+    members_dir = os.path.join(root, 'members')
+    if not os.path.exists(members_dir) and os.path.exists(f'{members_dir}.tmp'):
+        os.replace(f'{members_dir}.tmp', members_dir)
+    shutil.rmtree(f'{members_dir}.tmp', ignore_errors=True)
+    shutil.rmtree(f'{members_dir}.old', ignore_errors=True)
+
+
+### 키워드 소속 공고를 새 폴더에 만든 뒤 기존 폴더와 바꾸는 함수 (members : 입찰공고번호 → 개찰 월 Series)
+# 교체 전에 멈추면 기존 소속 공고가 그대로 남음
+def rebuild_members(data_dir, members):
+    index = get_index()
+    keyword = keyword_of(data_dir)
+    members_dir = os.path.join(store_dir(data_dir), 'members')
+
+    shutil.rmtree(f'{members_dir}.tmp', ignore_errors=True)
+    members = pd.DataFrame({BID_KEY: members.index.astype(str), 'month': members.to_numpy()}).drop_duplicates(BID_KEY)
+    parts = [write_part(data_dir, 'members.tmp', month, part[[BID_KEY]].astype('string')) for month, part in members.groupby('month')]
+
+    old_parts = index.indexed_parts(members_dir)
+    shutil.rmtree(f'{members_dir}.old', ignore_errors=True)
+    if os.path.exists(members_dir):
+        os.replace(members_dir, f'{members_dir}.old')
+    os.replace(f'{members_dir}.tmp', members_dir)
+    shutil.rmtree(f'{members_dir}.old', ignore_errors=True)
+
+    parts = [os.path.join(members_dir, os.path.relpath(path, f'{members_dir}.tmp')) for path in parts]
+    write_meta(data_dir, {'version': STORE_VERSION, 'layout': 'members'})
+    index.forget_parts(old_parts)
+    index.clear_members(keyword)
+    index.add_members(keyword, members[BID_KEY], parts)
+
+
+### 키워드에 속한 공고만 전체 저장소에서 새로 파싱한 데이터로 바꾸는 함수 (해당 공고가 있는 월 파티션만 다시 씀)
+# 다른 키워드에서만 수집한 공고는 전체 저장소 데이터를 유지하고 연결만 하며, 전체 저장소에 없는 공고는 새로 추가
+# 새 파일을 모두 .staged로 쓰고 교체 기록을 남긴 뒤 공개/삭제하므로 중간에 멈춰도 기존 공고가 사라지지 않음 (recover_store에서 마저 반영)
+# 키워드의 소속 공고는 기존 소속 공고에 바뀐 개찰 월을 반영해 새 폴더에 만든 뒤 교체
+def replace_bids(data_dir, new_bid_df, new_result_df):
+    bid_df = apply_schema(new_bid_df[BID_COLUMNS]).drop_duplicates(BID_KEY)
+    result_df = apply_schema(new_result_df[RESULT_COLUMNS])
+    keyword = keyword_of(data_dir)
+
+    with GLOBAL_LOCK:
+        index = get_index()
+        recover_store(GLOBAL_DIR)
+        recover_store(data_dir)
+        known = index.key_months(keys=bid_df[BID_KEY])
+        owned = index.member_keys(keyword, known) if uses_global(data_dir) else set()
+        foreign = set(known) - owned
+        if foreign:
+            print(f"⚠️다른 키워드에서 수집한 공고 {len(foreign)}건은 전체 저장소 데이터를 유지하고 키워드에 연결만 합니다.")
+
+        # 1. 바꿀 공고를 뺀 기존 행과 다시 파싱한 공고를 읽히지 않는 새 파일로 저장
+        staged, old_files = [], []
+        for month in sorted({known[key] for key in owned}):
+            for table in ('bids', 'results'):
+                files = month_files(GLOBAL_DIR, table, month)
+                kept = read_table(GLOBAL_DIR, table, months=[month])
+                kept = kept[~kept[BID_KEY].isin(owned)]
+                if not kept.empty:
+                    staged.append(write_part(GLOBAL_DIR, table, month, kept, staged=True))
+                old_files.extend(files)
+
+        # 다시 파싱한 공고는 새 개찰일시 기준 월에 저장 (다른 키워드의 공고는 저장된 월을 따름)
+        months = key_months_of(bid_df, {key: known[key] for key in foreign})
+        replaced = ~bid_df[BID_KEY].astype(str).isin(foreign)
+        replaced_keys = bid_df.loc[replaced, BID_KEY].astype(str)
+        if replaced.any():
+            staged += append_partitions(GLOBAL_DIR, bid_df[replaced], result_df[result_df[BID_KEY].astype(str).isin(replaced_keys)], staged=True)
+
+        # 2. 바뀌는 공고를 가진 키워드의 데이터 버전을 먼저 바꾸고(저장된 낙찰 집계 재계산), 교체 기록을 남긴 뒤 새 파일 공개, 기존 파일 삭제
+        index.bump_revisions(owned)
+        journal_file = os.path.join(store_dir(GLOBAL_DIR), JOURNAL_FILE)
+        with open(f'{journal_file}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'publish': staged, 'remove': old_files}, f, ensure_ascii=False)
+        os.replace(f'{journal_file}.tmp', journal_file)
+        published = apply_journal(GLOBAL_DIR)
+
+        index.add_bids(months[replaced_keys].items(), published)
+        index.forget_parts(old_files)
+
+        # 3. 키워드 소속 공고 교체
+        members = read_members(data_dir) if uses_global(data_dir) else pd.DataFrame(columns=[BID_KEY, 'month'])
+        members = pd.Series(members['month'].to_numpy(), index=members[BID_KEY].astype(str).to_numpy(), dtype=object)
+        rebuild_members(data_dir, pd.concat([members[~members.index.isin(months.index)], months]))
+
+
+### 다른 키워드에서 이미 수집한 공고를 키워드에 연결하는 함수 (bidno : 차수를 제외한 입찰공고번호)
+# 반환값 : 새로 연결한 공고의 (개찰결과 목록, result)
+def link_global_bids(data_dir, bidno):
+    index = get_index()
+    known = pd.Series(index.key_months(bidnos=bidno), dtype=object)
+    if uses_global(data_dir):
+        known = known[~known.index.isin(list(index.member_keys(keyword_of(data_dir), known.index)))]
+    if known.empty:
+        return apply_schema(pd.DataFrame(columns=BID_COLUMNS)), apply_schema(pd.DataFrame(columns=RESULT_COLUMNS))
+
+    months = sorted(set(known))
+    bid_df = read_table(GLOBAL_DIR, 'bids', months=months, keys=known.index)
+    result_df = read_table(GLOBAL_DIR, 'results', months=months, keys=known.index)
+
+    with GLOBAL_LOCK:
+        add_members(data_dir, known)
+    return bid_df, result_df
+
+
+### 공고 데이터를 직접 가진 기존 키워드 저장소를 전체 저장소로 옮기는 함수
+# 소속 공고를 모두 기록한 뒤 기존 bids/results 폴더를 삭제하므로 중간에 멈춰도 데이터는 남음
+def migrate_to_global(data_dir):
+    if os.path.abspath(data_dir) == os.path.abspath(GLOBAL_DIR) or not has_store(data_dir) or uses_global(data_dir):
+        return False
+
+    append_bids(data_dir, read_table(data_dir, 'bids'), read_table(data_dir, 'results'))
+    for table in ('bids', 'results'):
+        shutil.rmtree(os.path.join(store_dir(data_dir), table), ignore_errors=True)
+    print(f"✅ 키워드 저장소를 전체 저장소로 옮겼습니다: {store_dir(GLOBAL_DIR)}")
+    return True
+
+
+### 키워드의 기존 CSV/저장소를 전체 저장소 형식으로 옮기는 함수
+def prepare_store(data_dir, file_prefix):
+    recover_store(data_dir)
+    migrate_csv_to_store(data_dir, file_prefix)
+    migrate_to_global(data_dir)
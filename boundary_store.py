@@ -0,0 +1,95 @@
+'''
+시군구 경계 데이터 저장소
+- file_fingerprint : 원본 CSV의 크기, 수정 시각, 내용 해시(sha256)를 구하는 함수
+- build_boundary_store : polygon.csv를 한 번 파싱하여 GeoParquet(WKB + bbox) 파일로 변환하는 함수
+- load_boundaries : 시군구 경계를 GeoDataFrame으로 반환하는 함수 (필요할 때 한 번만 읽고, 원본이 바뀌면 다시 변환)
+
+저장 구조
+- data/polygon.parquet : 시군구코드명, geometry(WKB), bbox(공간 필터용 경계 상자) 컬럼
+- data/polygon.meta.json : 변환에 사용한 원본 CSV의 지문 (크기, 수정 시각, sha256)
+'''
+
+import os
+import json
+import hashlib
+import pandas as pd
+import geopandas as gpd
+
+SOURCE_FILE = os.path.join('data', 'polygon.csv')
+STORE_FILE = os.path.join('data', 'polygon.parquet')
+META_FILE = os.path.join('data', 'polygon.meta.json')
+
+BOUNDARIES = {}  # 이미 읽은 경계 데이터 (원본 파일 경로 → (지문, GeoDataFrame))
+
+
+### 원본 파일 지문 계산 함수 (with_hash=False면 크기와 수정 시각만)
+def file_fingerprint(path, with_hash=True):
+    stat = os.stat(path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    if with_hash:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+        fingerprint['sha256'] = sha.hexdigest()
+
+    return fingerprint
+
+
+### 저장된 변환 파일이 현재 원본에서 만들어진 것인지 확인하는 함수
+def is_store_fresh(source_file, store_file, meta_file):
+    if not (os.path.exists(store_file) and os.path.exists(meta_file)):
+        return False
+
+    with open(meta_file, encoding='utf-8') as f:
+        saved = json.load(f)
+
+    # 크기와 수정 시각이 같으면 해시 계산 없이 최신으로 판단
+    current = file_fingerprint(source_file, with_hash=False)
+    if current['size'] == saved.get('size') and current['mtime_ns'] == saved.get('mtime_ns'):
+        return True
+
+    # 수정 시각만 바뀐 경우(복사 등)에는 내용 해시로 다시 확인하고 지문 갱신
+    current = file_fingerprint(source_file)
+    if current['sha256'] != saved.get('sha256'):
+        return False
+
+    with open(meta_file, 'w', encoding='utf-8') as f:
+        json.dump(current, f)
+    return True
+
+
+### polygon.csv를 GeoParquet으로 변환하는 함수
+def build_boundary_store(source_file=SOURCE_FILE, store_file=STORE_FILE, meta_file=META_FILE):
+    polygon_df = pd.read_csv(source_file)
+    polygon_df = polygon_df[['시군구코드명', 'geometry']]
+    gdf = gpd.GeoDataFrame(polygon_df[['시군구코드명']], geometry=gpd.GeoSeries.from_wkt(polygon_df['geometry']))
+
+    # 임시 파일에 쓴 뒤 교체하여 변환 도중 중단되어도 기존 파일이 깨지지 않도록 함
+    tmp_file = f'{store_file}.tmp'
+    gdf.to_parquet(tmp_file, index=False, write_covering_bbox=True)
+    os.replace(tmp_file, store_file)
+
+    with open(meta_file, 'w', encoding='utf-8') as f:
+        json.dump(file_fingerprint(source_file), f)
+
+    return gdf
+
+
+### 시군구 경계 GeoDataFrame 반환 함수 (프로그램 실행 중에는 한 번만 읽음)
+def load_boundaries(source_file=SOURCE_FILE, store_file=STORE_FILE, meta_file=META_FILE):
+    fingerprint = file_fingerprint(source_file, with_hash=False)
+    cached = BOUNDARIES.get(source_file)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    if is_store_fresh(source_file, store_file, meta_file):
+        gdf = gpd.read_parquet(store_file, columns=['시군구코드명', 'geometry'])
+    else:
+        print("시군구 경계 데이터를 변환합니다 (원본이 바뀐 경우 한 번만 실행).")
+        gdf = build_boundary_store(source_file, store_file, meta_file)
+
+    gdf.sindex  # 공간 인덱스를 미리 생성하여 이후 매칭에서 재사용
+    BOUNDARIES[source_file] = (fingerprint, gdf)
+    return gdf
@@ -1,100 +1,269 @@
-'''
-신규 업체 정보 크롤링 및 위경도 변환
-- filtering_data : 기존 데이터와 비교하여 신규 업체 데이터를 필터링하는 함수
-- get_api_info : 공공 API를 통해 업체의 사업자등록번호, 주소, 사업형태, 전화번호 등의 기본 정보를 가져오는 함수
-- translocation : 주소를 위도와 경도로 변환하는 함수
-- get_companyinfo : 신규 업체 리스트에서 기본 정보와 위경도 정보를 수집하여 데이터 프레임으로 반환하는 함수
-'''
-
-import json
-import requests
-import pandas as pd
-from tqdm import tqdm
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup as bs
-import time
-import random
-import re
-
-### 기존 데이터와 새로운 데이터 비교 후 신규 업체 필터링
-def filtering_data(old_df, new_df):
-    return new_df[~new_df['사업자등록번호'].isin(old_df['사업자등록번호'])]
-
-### 공공 API를 통해 업체의 기본 정보를 가져오는 함수
-def get_api_info(number):
-    company_info = []
-   
-    servicekey = 'YOUR_SERVICEKEY'
-    url = f'http://apis.data.go.kr/1230000/UsrInfoService/getPrcrmntCorpBasicInfo?serviceKey={servicekey}&numOfRows=10&inqryDiv=3&bizno={number}&type=json&pageNo=1'
-   
-    response = requests.get(url)
-    contents = response.text
- 
-    json_ob = json.loads(contents) # 문자열 JSON형태로 변경
-    body = json_ob['response']['body']['items'][0] # 필요한 정보가 담겨있는 텍스트만 딕셔너리로
- 
-    bizno = body['bizno']
-    corpBsnsDivNm = body['corpBsnsDivNm']
-    telNo = body['telNo']
- 
-    # 주소 전처리
-    address1 = body['adrs']
-    address2 = body['dtlAdrs'].split(',') # 상세주소 제거
-    address2= re.sub(r'\(.*?\)', '',  address2[0]).strip() #괄호가 있다면 안에 값까지 제거
- 
-    address = address1 + ' ' +address2
- 
-    company_info.append(bizno)
-    company_info.append(address)
-    company_info.append(corpBsnsDivNm)
-    company_info.append(telNo)
- 
-    return company_info
-
-
-### 주소 위경도 변환 함수
-def translocation(address): 
-    # Nominatim 객체 생성
-    geo_local = Nominatim(user_agent='South Korea')
-    
-    # RateLimiter 사용
-    geocode = RateLimiter(geo_local.geocode, min_delay_seconds=1)
-    location = geocode(address)
-
-    # 첫 번째 시도: 전체 주소로 위치 데이터 요청
-    location = geocode(address)
-    if location:
-        return location.latitude, location.longitude
-
-    # 두 번째 시도: 호수만 제거하고 위치 데이터 재요청
-    simplified_address = re.sub(r'\s\d+층?\s?\d*호$', '', address)  # 예: '1120호' 또는 '11층 120호' 제거
-    location = geocode(simplified_address)
-    if location:
-        return location.latitude, location.longitude
-    
-    # 위치를 찾을 수 없는 경우
-    return None, None
-
-
-### 신규 업체 정보 수집 함수
-def get_companyinfo(new_company):
-    companyinfo_list = []
-
-    # if len(new_company) == 0:
-    #     return pd.DataFrame(columns=['사업자등록번호', '주소', '사업형태', '전화번호','위도','경도'])
-
-    for idx, row in tqdm(new_company.iterrows(), desc='신규 업체 정보 수집 진행', total=new_company.shape[0]):  # 새로운 업체 정보를 반복문으로 처리
-        number = row['사업자등록번호']
-        company_info = get_api_info(number)  # 크롤링 작동
-        
-        lat, lng = translocation(company_info[1])  # 위경도 반환 함수를 호출해 위도, 경도 반환 (input은 주소)
-        company_info.append(lat)
-        company_info.append(lng)
-        companyinfo_list.append(company_info)
-
-    newcompany_info = pd.DataFrame(companyinfo_list, columns=['사업자등록번호', '주소', '사업형태', '전화번호','위도','경도'])
-   
-    return newcompany_info
+'''
+신규 업체 정보 크롤링 및 위경도 변환
+- filtering_data : 기존 데이터와 비교하여 신규 업체 데이터를 필터링하는 함수
+- get_api_info : 공공 API를 통해 업체의 사업자등록번호, 주소, 사업형태, 전화번호 등의 기본 정보를 가져오는 함수
+- get_geocoder : 프로그램 전체에서 공유하는 위경도 변환기(Nominatim + 호스트별 속도 제한)를 반환하는 함수
+- translocation : 주소를 위도와 경도로 변환하는 함수 (geocode_cache에 결과를 저장해 재사용)
+- enrich_companies : 업체 기본 정보 조회와 위경도 변환을 큐로 연결된 별도 단계에서 동시에 처리하는 함수
+- load_partial_companyinfo : 중단된 수집의 중간 결과 파일에서 이미 수집된 업체 정보를 읽는 함수
+- get_companyinfo : 신규 업체 리스트에서 기본 정보와 위경도 정보를 수집하여 데이터 프레임으로 반환하는 함수
+'''
+
+import json
+import time
+import re
+import os
+import csv
+import queue
+import threading
+from contextlib import nullcontext
+from geocode_cache import GeocodeCache, normalize_address
+from company_store import CompanyStore
+from fetcher import create_session, get_limiter, get_with_retry, call_with_retry
+import metrics
+
+GEOCODER = None  # get_geocoder에서 한 번만 생성되는 위경도 변환기
+
+# 신규 업체 정보 데이터 프레임 컬럼
+COMPANYINFO_COLUMNS = ['사업자등록번호', '주소', '사업형태', '전화번호', '위도', '경도']
+
+# 조달청 사용자정보 서비스 업체 기본정보 조회 url
+API_URL = 'http://apis.data.go.kr/1230000/UsrInfoService/getPrcrmntCorpBasicInfo?serviceKey={servicekey}&numOfRows=10&inqryDiv=3&bizno={bizno}&type=json&pageNo=1'
+
+### 기존 데이터와 새로운 데이터 비교 후 신규 업체 필터링
+def filtering_data(old_df, new_df):
+    return new_df[~new_df['사업자등록번호'].isin(old_df['사업자등록번호'])]
+
+### 공공 API를 통해 업체의 기본 정보를 가져오는 함수
+def get_api_info(number, session=None, timeout=10):
+    import requests
+
+    company_info = []
+   
+    servicekey = 'YOUR_SERVICEKEY'
+    url = API_URL.format(servicekey=servicekey, bizno=number)
+   
+    response = get_with_retry(session or requests, url, timeout)  # 429/5xx/타임아웃은 속도를 줄여 재시도
+    contents = response.text
+ 
+    json_ob = json.loads(contents) # 문자열 JSON형태로 변경
+    body = json_ob['response']['body']['items'][0] # 필요한 정보가 담겨있는 텍스트만 딕셔너리로
+ 
+    bizno = body['bizno']
+    corpBsnsDivNm = body['corpBsnsDivNm']
+    telNo = body['telNo']
+ 
+    # 주소 전처리
+    address1 = body['adrs']
+    address2 = body['dtlAdrs'].split(',') # 상세주소 제거
+    address2= re.sub(r'\(.*?\)', '',  address2[0]).strip() #괄호가 있다면 안에 값까지 제거
+ 
+    address = address1 + ' ' +address2
+ 
+    company_info.append(bizno)
+    company_info.append(address)
+    company_info.append(corpBsnsDivNm)
+    company_info.append(telNo)
+ 
+    return company_info
+
+
+### 위경도 변환 요청 중 다시 시도할 오류 (타임아웃, 서버 오류, 요청 제한)
+def is_geocoder_transient(error):
+    from geopy.exc import GeocoderTimedOut, GeocoderUnavailable, GeocoderRateLimited
+
+    return isinstance(error, (GeocoderTimedOut, GeocoderUnavailable, GeocoderRateLimited))
+
+
+### 위경도 변환기 반환 함수 (Nominatim 객체는 프로그램 전체에서 하나만 생성)
+# 요청 간격은 Nominatim 호스트의 속도 제한(초당 1건 이하)을 따르고, 요청 제한/타임아웃이면 속도를 줄여 재시도
+def get_geocoder():
+    global GEOCODER
+    if GEOCODER is None:
+        from geopy.geocoders import Nominatim  # 위경도 변환을 처음 할 때만 불러옴
+
+        geo_local = Nominatim(user_agent='South Korea')
+        limiter = get_limiter(geo_local.domain)
+
+        # 시도마다 응답 시간을 Nominatim 호스트의 HTTP 지표로 기록 (응답 크기는 geopy가 알려주지 않음)
+        def request(address):
+            start = time.perf_counter()
+            try:
+                location = geo_local.geocode(address)
+            except Exception:
+                metrics.observe_http(geo_local.domain, time.perf_counter() - start, status='error')
+                raise
+            metrics.observe_http(geo_local.domain, time.perf_counter() - start, status=200)
+            return location
+
+        def geocode(address):
+            return call_with_retry(limiter, lambda: request(address), transient=is_geocoder_transient)
+
+        GEOCODER = geocode
+    return GEOCODER
+
+
+### 주소 위경도 변환 함수 (정규화된 주소 기준으로 캐시를 먼저 확인)
+def translocation(address, cache=None):
+    own_cache = cache is None
+    if own_cache:
+        cache = GeocodeCache()
+
+    try:
+        cached = cache.get(address)
+        metrics.cache('geocode_cache', hits=cached is not None, misses=cached is None)
+        if cached is not None:
+            return cached
+
+        geocode = get_geocoder()
+
+        # 첫 번째 시도: 전체 주소로 위치 데이터 요청
+        location = geocode(address)
+
+        # 두 번째 시도: 호수만 제거하고 위치 데이터 재요청
+        if not location:
+            simplified_address = normalize_address(address)  # 예: '1120호' 또는 '11층 120호' 제거
+            if simplified_address != address:
+                location = geocode(simplified_address)
+
+        # 위치를 찾을 수 없는 경우도 (None, None)으로 캐시
+        lat, lng = (location.latitude, location.longitude) if location else (None, None)
+        cache.put(address, lat, lng)
+        return lat, lng
+
+    finally:
+        if own_cache:
+            cache.close()
+
+
+### 업체 기본 정보 조회와 위경도 변환을 서로 다른 단계로 동시에 처리하는 함수
+# API 단계(api_workers개 스레드, 호스트별 속도 제한) → 크기가 제한된 큐 → 위경도 단계(Nominatim 속도 제한)
+# api_rps를 주면 이 호출이 끝날 때까지 API 호스트의 최대 속도를 그 값으로 제한
+# 완성된 업체 정보는 on_result(조회한 번호, [사업자등록번호, 주소, 사업형태, 전화번호, 위도, 경도])로 바로 전달
+def enrich_companies(numbers, on_result, api_workers=4, api_rps=None, queue_size=64):
+    store = CompanyStore()  # 업체 기본 정보 저장소 (키워드 간 공유)
+    geocode_cache = GeocodeCache()  # 위경도 변환 결과 캐시 (업체 간 공유)
+    session = create_session(pool_size=api_workers)
+    api_limit = get_limiter(API_URL).limit(api_rps) if api_rps else nullcontext()
+
+    work = queue.Queue()
+    for number in numbers:
+        work.put(number)
+    located = queue.Queue(maxsize=queue_size)  # API 단계 → 위경도 단계
+    errors = []
+
+    # 1단계: 저장소에 없는 업체만 API로 조회
+    def api_stage():
+        while True:
+            try:
+                number = work.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                with metrics.stage('enrichment'):
+                    company_info = store.get(number)
+                    metrics.cache('company_store', hits=company_info is not None, misses=company_info is None)
+                    if company_info is None:
+                        company_info = get_api_info(number, session)
+                        store.put(number, company_info)
+                    metrics.add('enrichment', items=1)
+                located.put((number, company_info))
+            except Exception as e:
+                errors.append(e)
+
+    # 2단계: 주소를 위경도로 변환
+    def geocode_stage():
+        while True:
+            item = located.get()
+            if item is None:
+                return
+            number, company_info = item
+
+            try:
+                with metrics.stage('geocoding'):
+                    lat, lng = translocation(company_info[1], geocode_cache)
+                    metrics.add('geocoding', items=1)
+                on_result(number, list(company_info) + [lat, lng])
+            except Exception as e:
+                errors.append(e)
+
+    try:
+        with api_limit:
+            api_threads = [threading.Thread(target=api_stage) for _ in range(api_workers)]
+            geocode_thread = threading.Thread(target=geocode_stage)
+            for thread in api_threads + [geocode_thread]:
+                thread.start()
+
+            for thread in api_threads:
+                thread.join()
+            located.put(None)  # 위경도 단계 종료 신호
+            geocode_thread.join()
+
+    finally:
+        session.close()
+        store.close()
+        geocode_cache.close()
+
+    # 실패한 업체가 있으면 완성된 업체는 이미 전달된 상태에서 첫 번째 오류를 다시 발생시킴
+    if errors:
+        print(f"⚠️업체 정보 수집 실패: {len(errors)}건")
+        raise errors[0]
+
+
+### 중간 결과 파일에서 이미 수집된 업체 정보를 읽는 함수
+def load_partial_companyinfo(partial_file):
+    import pandas as pd
+
+    if partial_file is None or not os.path.exists(partial_file):
+        return {}
+
+    partial_df = pd.read_csv(partial_file, dtype={'사업자등록번호': str, '전화번호': str})
+    partial_df = partial_df.astype(object).where(partial_df.notna(), None)
+    return {row[0]: row for row in partial_df.values.tolist()}
+
+
+### 신규 업체 정보 수집 함수
+# partial_file을 주면 완성된 업체 정보를 한 줄씩 기록하고, 중단 후 다시 실행하면 기록된 업체는 건너뜀
+def get_companyinfo(new_company, partial_file=None, api_workers=4, api_rps=None):
+    import pandas as pd
+    from tqdm import tqdm
+
+    companyinfo = load_partial_companyinfo(partial_file)
+    numbers = list(dict.fromkeys(str(number) for number in new_company['사업자등록번호']))
+    todo = [number for number in numbers if number not in companyinfo]
+
+    if todo:
+        progress = tqdm(desc='신규 업체 정보 수집 진행', total=len(todo))
+        partial = None
+        if partial_file is not None:
+            new_file = not os.path.exists(partial_file)
+            partial = open(partial_file, 'a', newline='', encoding='utf-8')
+            writer = csv.writer(partial)
+            if new_file:
+                writer.writerow(COMPANYINFO_COLUMNS)
+
+        # 위경도 단계에서 업체 하나가 완성될 때마다 호출됨
+        def on_result(number, company_info):
+            companyinfo[number] = company_info
+            if partial is not None:
+                writer.writerow(company_info)
+                partial.flush()
+            progress.update(1)
+
+        try:
+            enrich_companies(todo, on_result, api_workers, api_rps)
+        finally:
+            progress.close()
+            if partial is not None:
+                partial.close()
+
+    # 입력 순서대로 결과 구성
+    companyinfo_list = [list(companyinfo[str(number)]) for number in new_company['사업자등록번호']]
+    newcompany_info = pd.DataFrame(companyinfo_list, columns=COMPANYINFO_COLUMNS)
+
+    # 모든 업체가 수집되었으면 중간 결과 파일 삭제
+    if partial_file is not None and os.path.exists(partial_file):
+        os.remove(partial_file)
+   
+    return newcompany_info
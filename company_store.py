@@ -0,0 +1,64 @@
+'''
+업체 기본 정보 저장소
+- CompanyStore : 사업자등록번호를 키로 조달청 업체 기본 정보 조회 결과를 저장하는 SQLite 저장소 클래스
+    - get : 유효기간 안의 업체 정보를 [사업자등록번호, 주소, 사업형태, 전화번호] 리스트로 반환 (없으면 None)
+    - get_many : 여러 사업자등록번호를 한 번에 조회하여 {사업자등록번호: 업체 정보} 딕셔너리로 반환
+    - put : 업체 정보 저장
+
+모든 키워드가 같은 저장소(data/company_cache.sqlite)를 공유하므로, 이미 조회된 업체는 API를 다시 호출하지 않음
+'''
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+STORE_FILE = os.path.join('data', 'company_cache.sqlite')
+FRESH_TTL = 90 * 24 * 3600  # 업체 정보는 90일이 지나면 다시 조회
+
+
+class CompanyStore:
+    def __init__(self, store_file=STORE_FILE, ttl=FRESH_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(store_file) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(store_file, check_same_thread=False)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS company (bizno TEXT PRIMARY KEY, info TEXT, updated_at REAL)')
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    ### 유효기간 안의 업체 정보 반환 (없거나 오래된 경우 None)
+    def get(self, bizno):
+        return self.get_many([bizno]).get(str(bizno))
+
+    ### 여러 업체 정보를 한 번에 반환 (유효한 정보가 있는 사업자등록번호만 포함)
+    def get_many(self, biznos):
+        keys = list({str(b) for b in biznos})
+        fresh_after = time.time() - self.ttl
+        found = {}
+
+        with self.lock:
+            for start in range(0, len(keys), 500):  # SQLite 파라미터 개수 제한
+                chunk = keys[start:start + 500]
+                rows = self.conn.execute(
+                    f'SELECT bizno, info FROM company WHERE updated_at >= ? AND bizno IN ({",".join("?" * len(chunk))})',
+                    [fresh_after, *chunk]).fetchall()
+                found.update((bizno, json.loads(info)) for bizno, info in rows)
+
+        return found
+
+    ### 업체 정보 저장
+    def put(self, bizno, info):
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO company VALUES (?, ?, ?)', (str(bizno), json.dumps(info, ensure_ascii=False), time.time()))
+            self.conn.commit()
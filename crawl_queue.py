@@ -0,0 +1,136 @@
+'''
+개찰결과 상세 페이지 수집 작업 큐 (중단된 수집을 이어서 진행)
+- queue_remaining : 키워드 폴더의 작업 큐에 남은 공고 수를 반환하는 함수 (큐 파일이 없으면 0)
+- queue_failed : 키워드 폴더의 작업 큐에서 재시도 횟수를 모두 사용한 공고 수를 반환하는 함수 (큐 파일이 없으면 0)
+- CrawlQueue : 키워드별 수집 대상 입찰공고번호와 처리 상태를 저장하는 SQLite 작업 큐 클래스
+    - add : 수집 대상 공고를 대기 상태로 추가 (이미 큐에 있는 공고는 상태를 유지하고, failed 공고는 시도 횟수를 초기화해 다시 대기)
+    - due : 지금 처리할 공고 목록 (대기 중이거나 재시도 시각이 지난 공고, 추가된 순서)
+    - mark_done / mark_passed : 저장까지 마친 공고, 개찰 결과가 없는 공고 표시
+    - mark_retry : 일시적인 오류로 실패한 공고의 시도 횟수와 다음 시도 시각 기록 (횟수를 넘으면 failed)
+    - next_retry_in : 재시도할 공고가 모두 시도 가능해질 때까지 남은 시간 (재시도할 공고가 없으면 None)
+    - requeue_failed : failed 공고를 모두 시도 횟수를 초기화해 다시 대기 상태로 변경
+    - remaining : 아직 끝나지 않은 공고 수 (pending + retry)
+    - failed_count : 재시도 횟수를 모두 사용한 공고 수
+
+공고 상태
+- pending : 아직 처리하지 않은 공고
+- done : 개찰 결과를 저장한 공고
+- passed : 페이지는 받았지만 개찰 결과가 없는 공고 (투찰한 모든 업체가 낙찰하한선 미달 등)
+- retry : 타임아웃, 연결 오류, 429/5xx 응답 등 일시적인 오류로 다시 시도할 공고
+- failed : 재시도 횟수를 모두 사용한 공고 (다시 검색되거나 4번 모드로 이어서 수집하면 pending으로 돌아감)
+'''
+
+import os
+import time
+import sqlite3
+import threading
+
+QUEUE_FILE = 'crawl_queue.sqlite'  # 키워드 폴더 안의 작업 큐 파일
+MAX_ATTEMPTS = 5  # 일시적인 오류 재시도 횟수 (실행을 여러 번 거쳐도 합산)
+BACKOFF_BASE = 2.0  # 첫 재시도 대기 시간 (초)
+BACKOFF_MAX = 60.0  # 재시도 대기 시간 상한 (초)
+
+
+### 작업 큐에 남은 공고 수 (큐 파일을 새로 만들지 않음)
+def queue_remaining(data_dir):
+    queue_file = os.path.join(data_dir, QUEUE_FILE)
+    if not os.path.exists(queue_file):
+        return 0
+    with CrawlQueue(queue_file) as queue:
+        return queue.remaining()
+
+
+### 작업 큐에서 재시도 횟수를 모두 사용한 공고 수 (큐 파일을 새로 만들지 않음)
+def queue_failed(data_dir):
+    queue_file = os.path.join(data_dir, QUEUE_FILE)
+    if not os.path.exists(queue_file):
+        return 0
+    with CrawlQueue(queue_file) as queue:
+        return queue.failed_count()
+
+
+class CrawlQueue:
+    def __init__(self, queue_file, max_attempts=MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(queue_file) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(queue_file, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS bids (
+                bidno TEXT PRIMARY KEY, status TEXT, attempts INTEGER, next_try_at REAL, last_error TEXT);
+            CREATE INDEX IF NOT EXISTS bids_status ON bids (status);
+        ''')
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    ### 수집 대상 공고 추가 (이전 실행에서 failed가 된 공고가 다시 검색되면 처음부터 다시 시도)
+    def add(self, bidnos):
+        rows = [(str(bid),) for bid in bidnos]
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO bids VALUES (?, 'pending', 0, 0, NULL)", rows)
+            self.conn.executemany("UPDATE bids SET status='pending', attempts=0, next_try_at=0 WHERE bidno=? AND status='failed'", rows)
+            self.conn.commit()
+
+    ### failed 공고를 모두 다시 대기 상태로 변경 (반환값 : 변경한 공고 수)
+    def requeue_failed(self):
+        with self.lock:
+            count = self.conn.execute("UPDATE bids SET status='pending', attempts=0, next_try_at=0 WHERE status='failed'").rowcount
+            self.conn.commit()
+        return count
+
+    ### 지금 처리할 공고 목록
+    def due(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT bidno FROM bids WHERE status='pending' OR (status='retry' AND next_try_at<=?) ORDER BY rowid", (time.time(),)).fetchall()
+        return [row[0] for row in rows]
+
+    ### 상태 변경
+    def set_status(self, bidnos, status):
+        with self.lock:
+            self.conn.executemany('UPDATE bids SET status=? WHERE bidno=?', [(status, str(bid)) for bid in bidnos])
+            self.conn.commit()
+
+    def mark_done(self, bidnos):
+        self.set_status(bidnos, 'done')
+
+    def mark_passed(self, bidnos):
+        self.set_status(bidnos, 'passed')
+
+    ### 일시적인 오류 기록 (errors : {입찰공고번호: 오류})
+    def mark_retry(self, errors):
+        from fetcher import backoff_delay  # 작업 큐 확인만 할 때는 fetcher(동시 요청, 재시도 처리)를 불러오지 않음
+
+        now = time.time()
+        with self.lock:
+            for bid, error in errors.items():
+                row = self.conn.execute('SELECT attempts FROM bids WHERE bidno=?', (str(bid),)).fetchone()
+                attempts = (row[0] if row else 0) + 1
+                status = 'retry' if attempts < self.max_attempts else 'failed'
+                self.conn.execute('UPDATE bids SET status=?, attempts=?, next_try_at=?, last_error=? WHERE bidno=?',
+                                  (status, attempts, now + backoff_delay(attempts, BACKOFF_BASE, BACKOFF_MAX), repr(error), str(bid)))
+            self.conn.commit()
+
+    ### 재시도할 공고가 모두 시도 가능해질 때까지 남은 시간 (초)
+    def next_retry_in(self):
+        with self.lock:
+            next_try_at = self.conn.execute("SELECT MAX(next_try_at) FROM bids WHERE status='retry'").fetchone()[0]
+        return None if next_try_at is None else max(0.0, next_try_at - time.time())
+
+    ### 아직 끝나지 않은 공고 수
+    def remaining(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM bids WHERE status IN ('pending', 'retry')").fetchone()[0]
+
+    ### 재시도 횟수를 모두 사용한 공고 수
+    def failed_count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM bids WHERE status='failed'").fetchone()[0]
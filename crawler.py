@@ -1,467 +1,995 @@
-'''
-나라장터 개찰 데이터 크롤러 파일
-- get_max_page : 나라장터 페이지 내비게이션에서 최대 페이지 번호를 찾는 함수
-- nara_crawler : 나라장터에서 검색 키워드와 날짜 범위에 따른 입찰 공고 번호를 크롤링하는 함수
-- update_existing_data : 기존 데이터와 새로운 데이터를 비교하여 업데이트하는 함수
-- save_to_csv : 업데이트된 개찰 데이터를 CSV 파일로 저장하는 함수
-
-- process_bids : 입찰공고 번호를 기반으로 개찰 결과를 크롤링하는 함수
-- check_and_select_mode : 키워드 검색 모드를 선택하고 기존 데이터의 유무를 확인하는 함수
-- get_most_date : 파일에서 가장 최근 또는 가장 오래된 개찰 일시를 가져오는 함수
-- update_mode : 설정된 모드에 따라 새로운 데이터를 추가하거나 기존 데이터를 업데이트하는 함수
-
-# 유효성 검사 함수
-- validate_keyword_input : 입력된 키워드의 유효성을 검사하는 함수
-- validate_date_format : 입력된 날짜가 올바른 형식(YYYYMMDD)인지 확인하는 함수
-- validate_date_range : 시작 날짜가 종료 날짜보다 나중인지 확인하는 함수
-'''
-
-import os
-import sys
-import time
-import random
-import re
-import urllib.parse
-import pandas as pd
-import requests
-from datetime import datetime
-import errno
-from bs4 import BeautifulSoup as bs
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from tqdm import tqdm
-from selenium.common.exceptions import NoSuchElementException
-
-
-### 페이지 네비게이션 영역에서 최대 페이지 번호를 찾는 함수
-def get_max_page(driver):
-    try:
-        # 페이지 네비게이션의 페이지 번호 리스트를 찾음
-        page_elements = driver.find_elements(By.CSS_SELECTOR, ".pagination .page a")
-
-        try:
-            # 마지막 페이지 번호 확인 (페이지 네비게이션 마지막 부분에 있는 'page_last' 클래스를 기준으로 최대 페이지 구함)
-            last_page_element = driver.find_element(By.CSS_SELECTOR, ".pagination .page_last")
-            max_page = int(last_page_element.get_attribute("href").split("'")[1])
-            return max_page
-        except NoSuchElementException:
-            # 'page_last' 요소가 없는 경우 page_elements의 길이만큼 페이지를 반환
-            return len(page_elements)
-
-    except Exception as e:
-        print(f"페이지 탐색 중 오류 발생: {e}")
-        return 1
-
-
-### 나라장터에서 검색 결과(개찰 공고) 확인 후 입찰공고번호 크롤링하는 함수
-def nara_crawler(search_word, start_date, end_date):
-    bidno = [] # 식별번호 저장 리스트
-    search_query = search_word
-    file_prefix = search_word.replace(" ", "_")
-    data_dir = os.path.join('data', file_prefix)
-    existing_list_file_path = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
-
-    # 데이터 디렉토리 존재 여부 확인 및 생성
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
-    # 기존 데이터에서 입찰공고번호 불러오기 (기존 파일이 있는지 확인)
-    if not os.path.exists(existing_list_file_path):
-        # print(f"'{existing_list_file_path}' 파일이 없습니다. 새로운 데이터를 수집합니다.")
-        existing_bidno = []
-    else:
-        try:
-            existing_list_df = pd.read_csv(existing_list_file_path)
-            # 기존 입찰공고번호 리스트에서 '-00'을 제거한 번호로 저장
-            existing_bidno = existing_list_df['입찰공고번호'].apply(lambda x: x.split('-')[0]).tolist()
-        except Exception as e:
-            print(f"기존 데이터를 불러오는 중 오류 발생: {e}")
-            raise
-
-    euc_kr_encoded = search_query.encode('euc-kr') # 문자열을 EUC-KR로 인코딩
-    query = urllib.parse.quote(euc_kr_encoded) # URL 인코딩
-
-    #헤더 변경으로 크롤링 차단 우회
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "TE": "Trailers",
-        "DNT": "1",
-    }
-    url = 'https://www.g2b.go.kr:8340/search.do?kwd=' + query + f'&category=GC&subCategory=ALL&detailSearch=true&reSrchFlag=false&pageNum=1&sort=ODD&srchFd=ALL&date=&startDate={start_date}&endDate={end_date}'
-    driver = webdriver.Chrome()
-    driver.get(url)
-    time.sleep(3)
-
-    # 팝업창이 뜨면 닫기
-    main = driver.window_handles
-    for i in main:
-        if i != main[0]:
-            driver.switch_to.window(i)
-            driver.close()
-
-    # 개찰결과 검색 결과가 0건인 경우 예외처리
-    result_element = driver.find_element(By.CSS_SELECTOR, 'h3.tit')
-    if result_element:
-        result_text = result_element.text
-        # 검색 결과 개수 추출
-        match = re.search(r'\((\d+)건\)', result_text)
-        if match:
-            result_count = int(match.group(1))
-            if result_count == 0:
-                print("⚠️검색 결과가 없습니다.")
-                driver.quit()  # 드라이버 종료
-                return None
-    else:
-        print("⚠️검색 결과 개수를 확인할 수 없습니다.")
-        driver.quit()  # 드라이버 종료
-        return None
-
-
-    # 실제 검색 결과의 최대 페이지 수 탐색
-    max_page = get_max_page(driver)
-
-    for i in tqdm(range(1,max_page+1), desc="페이지 크롤링 진행"):
-
-        url = 'https://www.g2b.go.kr:8340/search.do?kwd=' + query + f'&category=GC&subCategory=ALL&detailSearch=true&reSrchFlag=false&pageNum={i}&sort=ODD&srchFd=ALL&date=&startDate={start_date}&endDate={end_date}'
-        driver.get(url)
-        time.sleep(random.randint(2, 3))
-
-        # 팝업창이 뜨면 닫기
-        main = driver.window_handles
-        for i in main:
-            if i != main[0]:
-                driver.switch_to.window(i)
-                driver.close()
-
-        # 한 페이지의 결과 리스트
-        ul_element = driver.find_element(By.XPATH, '//*[@id="contents"]/div[1]/ul')
-        pattern = re.compile(r'\[([^\]]+)\]')
-
-        # 리스트에서 각각의 결과 요소 추출
-        li_elements = ul_element.find_elements(By.CSS_SELECTOR, 'ul.search_list > li')
-
-        for li in li_elements:
-            text = li.text
-            match = pattern.search(text) # findall -> search 변경
-            split_values = match.group(1).split('-')
-            if len(split_values) == 2:
-                value1, value2 = split_values
-                bidno.append(value1.strip())
-            else:
-                pass
-
-    # 중복되는 입찰공고번호 제거 및 정렬 (기존 데이터와 중복되는 공고 제거)
-    unique_bidno = [int(b) for b in bidno if b not in existing_bidno]
-    # unique_bidno_sorted = sorted(unique_bidno, reverse=True)
-
-    # 새로운 입찰공고가 없을 경우 None 반환
-    if not unique_bidno:
-        return None
-
-    driver.quit()  # 드라이버 종료
-
-    return unique_bidno
-
-
-### 기존 데이터와 새로운 데이터를 비교하여 업데이트하는 함수
-def update_existing_data(existing_bid_df, existing_result_df, new_bid_df, new_result_df, latest_mode=0):
-    try:
-        # 최신화 모드: 새로운 데이터를 기존 데이터 앞에 추가
-        if latest_mode == 1:
-            # 기존 데이터의 인덱스를 새로 추가된 데이터 수만큼 밀어서 할당
-            existing_bid_df['Index'] = existing_bid_df['Index'] + len(new_bid_df)
-            existing_result_df['Index'] = existing_result_df['Index'] + len(new_bid_df)
-
-            updated_bid_df = pd.concat([new_bid_df, existing_bid_df], ignore_index=True)
-            updated_result_df = pd.concat([new_result_df, existing_result_df], ignore_index=True)
-
-        # 과거 추가 모드: 새로운 데이터를 기존 데이터 뒤에 추가
-        elif latest_mode == 2:
-            last_index_bid = existing_bid_df['Index'].max() if not existing_bid_df.empty else -1 # 기존 데이터의 마지막 인덱스 찾기
-             # 새로운 데이터의 인덱스를 기존 데이터 마지막 인덱스부터 시작하도록 조정
-            new_bid_df['Index'] += (last_index_bid + 1)
-            new_result_df['Index'] += (last_index_bid + 1)
-
-            updated_bid_df = pd.concat([existing_bid_df, new_bid_df], ignore_index=True)
-            updated_result_df = pd.concat([existing_result_df, new_result_df], ignore_index=True)
-
-        return updated_bid_df, updated_result_df
-    
-    except Exception as e:
-        print(f"데이터 업데이트 중 오류 발생: {e}")
-        return existing_bid_df, existing_result_df
-
-
-### CSV 저장 함수 (신규 생성 또는 업데이트 모두 처리)
-def save_to_csv(data_dir, file_prefix, new_bid_df, new_result_df, latest_mode=0):
-    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
-    result_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_result.csv')
-
-    # 데이터 디렉토리 존재 여부 확인 및 생성
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
-    try:
-        # 기존 파일이 있는지 확인하여 업데이트 또는 새로 저장
-        if os.path.exists(bid_file) and os.path.exists(result_file): # 기존 파일을 읽어서 업데이트
-            existing_bid_df = pd.read_csv(bid_file)
-            existing_result_df = pd.read_csv(result_file)
-            updated_bid_df, updated_result_df = update_existing_data(existing_bid_df, existing_result_df, new_bid_df, new_result_df, latest_mode)
-        else: # 파일이 없으면 새로운 데이터로 저장
-            updated_bid_df, updated_result_df = new_bid_df, new_result_df
-
-        # 업데이트된 데이터를 CSV 파일에 저장
-        updated_bid_df.to_csv(bid_file, index=False, encoding='utf-8-sig')
-        updated_result_df.to_csv(result_file, index=False, encoding='utf-8-sig')
-    
-    except PermissionError as e:
-        if e.errno == errno.EACCES:
-            print(f"⚠️파일 접근 권한 오류: {e.filename}에 접근할 수 없습니다.")
-            print("⚠️다른 프로그램에서 파일을 열고 있는지 확인한 후 다시 시도하세요.")
-        else:
-            print(f"⚠️파일 저장 중 오류 발생: {e}")
-    
-    except Exception as e:
-        print(f"⚠️파일 저장 중 오류 발생: {e}")
-
-
-### 입찰공고 번호 조회하여 개찰 결과를 크롤링하는 함수
-def process_bids(bidno, search_word, latest_mode=0):
-    bid_list = []
-    result_list = []
-    pass_list = []  # 유찰된 데이터 개수 확인용
-
-    for index, bid in tqdm(enumerate(bidno), desc="개찰 결과 크롤링 진행", total=len(bidno)):
-        detail_url = f'https://www.g2b.go.kr:8101/ep/result/serviceBidResultDtl.do?bidno={bid}&bidseq=00&whereAreYouFrom=piser'  # 개찰결과 상세조회 url
-        r = requests.get(detail_url)
-        soup = bs(r.text, "html.parser")
-
-        try:
-            bid_number = soup.find('th', string="입찰공고번호").find_next('td').get_text(strip=True)
-            bid_name = soup.find('th', string="공고명").find_next('td').get_text(strip=True)
-            bid_where = soup.find('th', string="수요기관").find_next('td').get_text(strip=True)
-            bid_who = soup.find('th', string="집행관").find_next('td').get_text(strip=True)
-            bid_when = soup.find('th', string="실제개찰일시").find_next('td').get_text(strip=True)
-            bid_list.append([index, bid_number, bid_name, bid_where, bid_who, bid_when])
-
-            rows = soup.find_all('tr')  # 결과 테이블 데이터
-            for row in rows:
-                row_data = [cell.get_text(strip=True) for cell in row.find_all('td')]
-                if len(row_data) >= 9:  # 개찰 순위 데이터만 추가
-                    row_data.insert(0, index)  # 리스트 맨 앞에 인덱스 추가
-                    result_list.append(row_data)
-
-        except Exception as e:  # 투찰한 모든 업체가 낙찰하한선 미달일 경우 예외처리
-            pass_list.append(bid)
-
-    new_bid_df = pd.DataFrame(bid_list, columns=['Index', '입찰공고번호', '공고명', '수요기관', '집행관', '실제개찰일시'])
-    new_result_df = pd.DataFrame(result_list, columns=['Index', '순위', '사업자등록번호', '업체명', '대표자명', '입찰금액', '투찰률(%)', '추첨번호', '투찰일시', '비고'])
-
-    # 파일 저장 함수 호출 (latest_mode 전달)
-    file_prefix = search_word.replace(" ", "_")
-    data_dir = os.path.join('data', file_prefix)
-    save_to_csv(data_dir, file_prefix, new_bid_df, new_result_df, latest_mode)
-
-    return new_bid_df, pass_list, new_result_df
-
-
-### 키워드 입력 검증 및 형식 확인 함수
-def validate_keyword_input(keyword):
-    # 키워드의 앞뒤 공백 제거
-    keyword = keyword.strip()
-
-    # 1. 키워드가 한 글자만 입력된 경우
-    if len(keyword) < 2:
-        print("키워드는 최소 두 글자 이상이어야 합니다.")
-        return False
-
-    # 2. 키워드가 공백만으로 이루어진 경우
-    if not keyword:
-        print("키워드는 공백만 입력할 수 없습니다.")
-        return False
-
-    # 3. 키워드 형식이 올바르지 않은 경우 (한글, 영문, 숫자, 공백만 허용)
-    if not re.match(r"^[가-힣a-zA-Z0-9\s]+$", keyword):
-        print("키워드는 한글, 영문, 숫자, 공백만 포함해야 합니다.")
-        return False
-
-    # 모든 조건을 통과하면 True 반환
-    return True
-
-
-### 키워드 폴더 존재 여부 확인 및 모드 선택 함수
-def check_and_select_mode():
-    while True:
-        search_word = input(">>> 찾으시는 키워드를 입력하세요 (종료는 *): ").strip()
-
-        if search_word == '*':
-            print("\n프로그램을 종료합니다.")
-            return None, None
-
-        # 입력된 키워드에 대한 예외 처리
-        if not validate_keyword_input(search_word):
-            continue  # 키워드가 유효하지 않으면 다시 입력받음
-
-        file_prefix = search_word.replace(" ", "_")
-        data_dir = os.path.join('data', file_prefix)
-
-        if os.path.exists(data_dir):
-            # 최신 및 오래된 일시 둘 다 가져오기
-            bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
-            recent_date, oldest_date = get_most_date(bid_file, mode=999)
-            print(f"\n'{data_dir}' 폴더가 존재합니다. 다음 메뉴에서 선택하세요:")
-            print(f"해당 키워드는 현재 {oldest_date}부터 {recent_date}까지 수집되어있습니다.")
-            print("1: 최신 데이터 추가")
-            print("2: 기존 데이터의 과거 데이터 추가")
-            print("*: 종료")
-            print("#: 키워드 재입력")
-            
-            while True:
-                menu_choice = input(">>> 메뉴를 선택하세요 (1, 2, *, #): ").strip()
-
-                if menu_choice == '*':
-                    print("\n프로그램을 종료합니다.")
-                    return None, None
-                elif menu_choice == '#':
-                    break  # 재입력 시 다시 키워드 입력으로 돌아감
-                elif menu_choice in ['1', '2']:
-                    return search_word, int(menu_choice)
-                else:
-                    print("올바른 메뉴를 선택하세요.")
-        else:
-            # 폴더가 없으면 새로운 데이터 크롤링 여부 물어보기
-            print(f"'{data_dir}' 폴더가 존재하지 않습니다.")
-            user_input = input(f">>> '{search_word}'에 대한 데이터를 새로 크롤링하시겠습니까? (Y/N): ").strip().upper()
-
-            if user_input in ['Y', 'y']:
-                return search_word, 0  # 0번 모드로 실행
-            else:
-                print("프로그램을 종료합니다.")
-                return None, None
-
-
-### 파일을 읽어 가장 최근/오래된 개찰일시를 가져오는 함수
-def get_most_date(file_name, mode):
-    if os.path.exists(file_name):
-        # 파일이 존재하면 데이터를 읽어 가장 최근/오래된 일시 확인
-        df = pd.read_csv(file_name)
-        df['실제개찰일시'] = pd.to_datetime(df['실제개찰일시'])  # 실제개찰일시를 datetime 타입으로 변환
-
-        if mode == 1:
-            # 최신 데이터 (가장 최근 일시)
-            return df['실제개찰일시'].max().strftime('%Y%m%d')
-        elif mode == 2:
-            # 오래된 데이터 (가장 오래된 일시)
-            return df['실제개찰일시'].min().strftime('%Y%m%d')
-        elif mode == 999: #모드가 아님
-            return df['실제개찰일시'].max().strftime('%Y%m%d'), df['실제개찰일시'].min().strftime('%Y%m%d')
-    else:
-        return None if mode in [1, 2] else (None, None)
-
-
-### 날짜 형식 검증 함수
-def validate_date_format(date_str):
-    try:
-        datetime.strptime(date_str, '%Y%m%d')
-        return True
-    except ValueError:
-        print("⚠️ 잘못된 날짜 형식입니다. 'YYYYMMDD' 형식으로 입력해 주세요.")
-        return False
-
-
-### 날짜 범위 검증 함수 (start_date가 end_date보다 이전인지 확인)
-def validate_date_range(start_date, end_date):
-    if start_date > end_date:
-        print("⚠️ 시작 날짜는 종료 날짜보다 나중일 수 없습니다.")
-        return False
-    return True
-
-
-### 파일 업데이트 모드 설정
-def update_mode(search_word, latest_mode=0):
-    # 기본 경로 설정
-    file_prefix = search_word.replace(" ", "_")
-    data_dir = os.path.join('data', file_prefix)
-    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
-
-    # 오늘 날짜 계산
-    today = datetime.now().strftime('%Y%m%d')
-
-    try:
-        # 0번 모드: 새로운 키워드에 대한 데이터 크롤링
-        if latest_mode == 0:
-            print("새로운 키워드에 대한 데이터를 생성합니다.")
-            start_date = input(">>> 시작 날짜를 입력하세요 (YYYYMMDD 형식): ").strip()
-            end_date = input(">>> 종료 날짜를 입력하세요 (YYYYMMDD 형식): ").strip()
-
-            # 날짜 형식과 범위 검증
-            if not (validate_date_format(start_date) and validate_date_format(end_date)) or not validate_date_range(start_date, end_date):
-                return None
-            
-            print(f"새로운 키워드 수집: {start_date}부터 {end_date}까지 데이터를 크롤링합니다.")
-            bidno = nara_crawler(search_word, start_date, end_date)
-
-            # 검색 결과가 없을 경우 폴더 삭제 및 None 반환
-            if bidno is None:
-                if os.path.exists(data_dir):
-                    os.rmdir(data_dir)  # 폴더 삭제
-                    print(f"⚠️검색 결과가 없습니다.")
-                return None
-
-        # 1번 모드: 가장 최근 데이터 이후부터 오늘까지 추가 크롤링
-        elif latest_mode == 1:
-            most_recent_date = get_most_date(bid_file, latest_mode)
-
-            if not most_recent_date:
-                print(f"'{bid_file}' 파일이 비어있거나 데이터에 문제가 있습니다.")
-                return None
-            # start_date = most_recent_date.strftime('%Y%m%d')
-            print(f"최신 데이터 추가: {most_recent_date}부터 {today}까지 크롤링합니다.")
-            bidno = nara_crawler(search_word, most_recent_date, today)
-
-            # 검색 결과가 없을 경우 예외처리
-            if bidno is None:
-                print("⚠️이미 최신화 상태입니다.")
-                return None
-        
-        # 2번 모드: 기존 데이터의 과거 데이터 추가 크롤링
-        elif latest_mode == 2:
-            most_old_date = get_most_date(bid_file, latest_mode)
-            if not most_old_date:
-                print(f"'{bid_file}' 파일이 비어있거나 데이터에 문제가 있습니다.")
-                return None
-            # end_date = most_old_date.strftime('%Y%m%d')
-            start_date = input(">>> 추가할 데이터의 시작 날짜를 입력하세요 (YYYYMMDD 형식): ").strip()
-
-            # 날짜 형식과 범위 검증
-            if not validate_date_format(start_date) or not validate_date_range(start_date, most_old_date):
-                return None
-
-            print(f"기존보다 오래된 데이터 추가: {start_date}부터 {most_old_date}까지 크롤링합니다.")
-            bidno = nara_crawler(search_word, start_date, most_old_date)
-
-            # 검색 결과가 없을 경우 예외처리
-            if bidno is None:
-                print("⚠️해당하는 기간의 데이터가 없습니다.")
-                return None
-
-        else:
-            print(f"'{latest_mode}'는 올바른 모드가 아닙니다.")
-            return None
-        
-        # 새로운 데이터 처리 및 반환
-        new_bid_df, pass_list, new_result_df = process_bids(bidno, search_word, latest_mode)
-        return new_bid_df, pass_list, new_result_df
-        
-    except Exception as e:
-        # 검색 결과가 없을 경우 폴더 삭제
-        if latest_mode == 0:
-            if os.path.exists(data_dir):
-                os.rmdir(data_dir)  # 폴더 삭제
-        print(f"오류 발생: {e}")
-        return None
\ No newline at end of file
+'''
+나라장터 개찰 데이터 크롤러 파일
+- get_max_page : 나라장터 페이지 내비게이션에서 최대 페이지 번호를 찾는 함수 (브라우저 모드)
+- get_max_page_html : 검색 결과 HTML의 페이지 내비게이션에서 최대 페이지 번호를 찾는 함수
+- parse_search_page : 검색 결과 페이지 HTML에서 결과 건수, 입찰공고번호, 최대 페이지를 추출하는 함수
+- create_search_session : 검색 결과 페이지 요청용 헤더를 가진 세션을 생성하는 함수
+- search_bidno_http : HTTP 요청만으로 검색 결과 페이지를 동시에 수집하는 함수
+- search_bidno_browser : Selenium 브라우저로 검색 결과 페이지를 수집하는 함수 (선택 사항)
+- nara_crawler : 나라장터에서 검색 키워드와 날짜 범위에 따른 입찰 공고 번호를 크롤링하는 함수
+- save_to_csv : 업데이트된 개찰 데이터를 CSV 파일로 저장하는 함수 (pyarrow가 없을 때 사용)
+- save_to_store : 개찰 데이터를 전체 저장소(bid_store)에 추가하고 키워드에 연결하는 함수 (같은 공고는 한 번만 저장)
+- save_bid_data : 저장 방식을 골라 개찰 데이터를 저장하는 함수
+
+- fetch_details : 공고 묶음의 상세 페이지를 캐시에서 찾고, 없는 페이지만 요청하는 함수
+- cache_parsed : 파싱에 성공한 페이지만 캐시에 저장하고, 파싱할 수 없는 캐시 페이지는 삭제하는 함수
+- prefetch_details : 여러 키워드에서 찾은 공고의 상세 페이지를 한 번씩만 요청해 캐시에 미리 저장하는 함수 (배치 실행)
+- crawl_batch : 공고 묶음 하나의 상세 페이지를 가져와 파싱하고 결과 없는 공고와 일시적인 오류를 구분하는 함수 (파싱할 수 없는 캐시 페이지는 다시 요청)
+- process_bids : 입찰공고 번호를 기반으로 개찰 결과를 크롤링하는 함수 (작업 큐와 체크포인트 저장으로 중단 후 이어서 수집, 상세 페이지 원본은 html_cache에 저장)
+- reparse_from_cache : 캐시된 상세 페이지 원본만으로 개찰결과 목록/result 파일을 다시 만드는 함수 (파싱할 수 없는 캐시 페이지만 다시 요청)
+- check_and_select_mode : 키워드 검색 모드를 선택하고 기존 데이터의 유무를 확인하는 함수
+- get_most_date : 파일에서 가장 최근 또는 가장 오래된 개찰 일시를 가져오는 함수
+- queued_only : 새로 찾은 공고가 없어도 작업 큐에 남은 공고가 있으면 그 공고만 수집하도록 빈 리스트를 반환하는 함수
+- find_bidno : 설정된 모드에 따라 수집할 입찰공고번호를 찾는 함수 (날짜를 주면 입력을 받지 않음)
+- update_mode : 설정된 모드에 따라 새로운 데이터를 추가하거나 기존 데이터를 업데이트하는 함수
+- remove_empty_dir : 수집된 데이터가 없는 빈 키워드 폴더만 삭제하는 함수
+
+# 유효성 검사 함수
+- validate_keyword_input : 입력된 키워드의 유효성을 검사하는 함수
+- validate_date_format : 입력된 날짜가 올바른 형식(YYYYMMDD)인지 확인하는 함수
+- validate_date_range : 시작 날짜가 종료 날짜보다 나중인지 확인하는 함수
+'''
+
+import os
+import sys
+import time
+import re
+import urllib.parse
+from datetime import datetime
+import errno
+from crawl_queue import CrawlQueue, QUEUE_FILE, queue_remaining, queue_failed
+from html_cache import HtmlCache
+import metrics
+
+# pandas, requests, bs4/lxml, tqdm은 해당 단계를 실행할 때 함수 안에서 불러옴 (키워드 입력 전 시작 시간 단축)
+# 저장소(bid_store)와 상세 페이지 파서(detail_parser)도 pandas/lxml을 불러오므로 같은 방식으로 사용
+
+#헤더 변경으로 크롤링 차단 우회
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "TE": "Trailers",
+    "DNT": "1",
+}
+
+# 검색 결과 페이지 url
+SEARCH_URL = 'https://www.g2b.go.kr:8340/search.do?kwd={query}&category=GC&subCategory=ALL&detailSearch=true&reSrchFlag=false&pageNum={page}&sort=ODD&srchFd=ALL&date=&startDate={start_date}&endDate={end_date}'
+
+# 개찰결과 상세조회 url
+DETAIL_URL = 'https://www.g2b.go.kr:8101/ep/result/serviceBidResultDtl.do?bidno={bidno}&bidseq={bidseq}&whereAreYouFrom=piser'
+
+CHECKPOINT_SIZE = 200  # 이 개수의 공고를 수집할 때마다 저장하고 작업 큐에 완료 표시
+RETRY_ROUNDS = 3  # 한 번 실행에서 일시적인 오류로 실패한 공고를 다시 시도하는 횟수
+
+
+### 페이지 네비게이션 영역에서 최대 페이지 번호를 찾는 함수 (브라우저 모드)
+def get_max_page(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
+    try:
+        # 페이지 네비게이션의 페이지 번호 리스트를 찾음
+        page_elements = driver.find_elements(By.CSS_SELECTOR, ".pagination .page a")
+
+        try:
+            # 마지막 페이지 번호 확인 (페이지 네비게이션 마지막 부분에 있는 'page_last' 클래스를 기준으로 최대 페이지 구함)
+            last_page_element = driver.find_element(By.CSS_SELECTOR, ".pagination .page_last")
+            max_page = int(last_page_element.get_attribute("href").split("'")[1])
+            return max_page
+        except NoSuchElementException:
+            # 'page_last' 요소가 없는 경우 page_elements의 길이만큼 페이지를 반환
+            return len(page_elements)
+
+    except Exception as e:
+        print(f"페이지 탐색 중 오류 발생: {e}")
+        return 1
+
+
+### 검색 결과 HTML의 페이지 네비게이션에서 최대 페이지 번호를 찾는 함수 (HTTP 모드)
+def get_max_page_html(soup):
+    try:
+        page_elements = soup.select(".pagination .page a")
+
+        # 'page_last' 링크가 있으면 href에 들어있는 페이지 번호 사용
+        last_page_element = soup.select_one(".pagination .page_last")
+        if last_page_element is not None:
+            return int(last_page_element.get("href").split("'")[1])
+
+        # 'page_last' 요소가 없는 경우 page_elements의 길이만큼 페이지를 반환
+        return len(page_elements)
+
+    except Exception as e:
+        print(f"페이지 탐색 중 오류 발생: {e}")
+        return 1
+
+
+### 검색 결과 문구에서 결과 건수를 추출하는 함수 (건수를 찾지 못하면 None)
+def get_result_count(result_text):
+    match = re.search(r'\((\d+)건\)', result_text)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+### 검색 결과 목록의 각 항목 문구에서 입찰공고번호를 추출하는 함수
+def extract_bidno(texts):
+    bidno = []
+    pattern = re.compile(r'\[([^\]]+)\]')
+
+    for text in texts:
+        match = pattern.search(text) # findall -> search 변경
+        split_values = match.group(1).split('-')
+        if len(split_values) == 2:
+            value1, value2 = split_values
+            bidno.append(value1.strip())
+        else:
+            pass
+
+    return bidno
+
+
+### 검색 결과 페이지 HTML을 파싱하여 (결과 건수, 입찰공고번호 리스트, 최대 페이지)를 반환하는 함수
+def parse_search_page(html):
+    from bs4 import BeautifulSoup as bs
+
+    soup = bs(html, "html.parser")
+
+    result_element = soup.select_one('h3.tit')
+    result_count = get_result_count(result_element.get_text()) if result_element is not None else None
+
+    # 한 페이지의 결과 리스트
+    li_elements = soup.select('#contents > div:nth-of-type(1) > ul.search_list > li')
+    bidno = extract_bidno(li.get_text() for li in li_elements)
+
+    return result_count, bidno, get_max_page_html(soup)
+
+
+### 검색 결과 페이지 url 생성 함수
+def get_search_url(query, page, start_date, end_date):
+    return SEARCH_URL.format(query=query, page=page, start_date=start_date, end_date=end_date)
+
+
+### 한 페이지의 입찰공고번호가 모두 이미 수집된 번호인지 확인하는 함수 (빈 페이지는 제외)
+def is_known_page(page_bidno, known_bidno):
+    return bool(page_bidno) and all(b in known_bidno for b in page_bidno)
+
+
+### 검색 결과 페이지 요청용 세션 생성 함수
+def create_search_session(pool_size=4):
+    from fetcher import create_session
+
+    # requests는 brotli(br) 응답을 기본으로 풀지 못하므로 gzip/deflate만 요청
+    return create_session(pool_size=pool_size, headers={**HEADERS, "Accept-Encoding": "gzip, deflate"})
+
+
+### HTTP 요청만으로 검색 결과 페이지를 수집하는 함수 (검색 결과가 없으면 None)
+# known_bidno가 주어지면 최신순 정렬을 이용해 모든 번호가 이미 수집된 페이지에서 페이지 탐색을 중단
+# session을 주면 그 세션을 사용하고 닫지 않음 (배치 실행에서 키워드 간 공유)
+def search_bidno_http(query, start_date, end_date, max_workers=4, max_rps=None, known_bidno=None, stats=None, session=None):
+    from fetcher import fetch_all
+
+    own_session = session is None
+    if own_session:
+        session = create_search_session(max_workers)
+    stats = {} if stats is None else stats
+
+    try:
+        # 첫 페이지에서 결과 건수와 최대 페이지 수 확인
+        first_pages, errors = fetch_all([get_search_url(query, 1, start_date, end_date)], session=session)
+        if first_pages[0] is None:
+            raise errors[0]
+
+        result_count, bidno, max_page = parse_search_page(first_pages[0])
+        stats.update(max_page=max_page, pages_fetched=1, pages_skipped=0)
+        if result_count is None:
+            print("⚠️검색 결과 개수를 확인할 수 없습니다.")
+            return None
+        if result_count == 0:
+            print("⚠️검색 결과가 없습니다.")
+            return None
+
+        stop = known_bidno is not None and is_known_page(bidno, known_bidno)
+        page_numbers = list(range(2, max_page + 1))
+
+        # 조기 중단이 필요 없으면 전체를, 필요하면 max_workers 페이지씩 나누어 동시에 요청
+        batch_size = len(page_numbers) if known_bidno is None else max_workers
+        for start in range(0, len(page_numbers), max(batch_size, 1)):
+            if stop:
+                break
+
+            batch = page_numbers[start:start + batch_size]
+            urls = [get_search_url(query, i, start_date, end_date) for i in batch]
+            pages, errors = fetch_all(urls, session=session, max_workers=max_workers, max_rps=max_rps, desc="페이지 크롤링 진행")
+            stats['pages_fetched'] += len(batch)
+
+            # 페이지 순서대로 확인하여 모두 수집된 페이지가 나오면 그 뒤 페이지는 버림
+            for page, error in zip(pages, errors):
+                if page is None:
+                    raise error
+                page_bidno = parse_search_page(page)[1]
+                bidno.extend(page_bidno)
+
+                if known_bidno is not None and is_known_page(page_bidno, known_bidno):
+                    stop = True
+                    break
+
+        stats['pages_skipped'] = max_page - stats['pages_fetched']
+        return bidno
+
+    finally:
+        if own_session:
+            session.close()
+
+
+### 브라우저(Selenium)로 검색 결과 페이지를 수집하는 함수 (검색 결과가 없으면 None)
+# 페이지 이동 간격은 HTTP 수집과 같은 검색 호스트 속도 제한을 따르고, 요소는 나타날 때까지 최대 10초 대기
+def search_bidno_browser(query, start_date, end_date, known_bidno=None, stats=None):
+    from tqdm import tqdm
+    from fetcher import get_limiter
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+
+    bidno = [] # 식별번호 저장 리스트
+    stats = {} if stats is None else stats
+
+    limiter = get_limiter(SEARCH_URL)
+    driver = webdriver.Chrome()
+    driver.implicitly_wait(10)
+    try:
+        limiter.acquire()
+        driver.get(get_search_url(query, 1, start_date, end_date))
+        time.sleep(3)  # 팝업창이 뜰 때까지 대기
+
+        # 팝업창이 뜨면 닫기
+        main = driver.window_handles
+        for i in main:
+            if i != main[0]:
+                driver.switch_to.window(i)
+                driver.close()
+
+        # 개찰결과 검색 결과가 0건인 경우 예외처리
+        result_element = driver.find_element(By.CSS_SELECTOR, 'h3.tit')
+        if result_element:
+            # 검색 결과 개수 추출
+            result_count = get_result_count(result_element.text)
+            if result_count == 0:
+                print("⚠️검색 결과가 없습니다.")
+                return None
+        else:
+            print("⚠️검색 결과 개수를 확인할 수 없습니다.")
+            return None
+
+        # 실제 검색 결과의 최대 페이지 수 탐색
+        max_page = get_max_page(driver)
+        stats.update(max_page=max_page, pages_fetched=0, pages_skipped=0)
+
+        for i in tqdm(range(1,max_page+1), desc="페이지 크롤링 진행"):
+            limiter.acquire()
+            driver.get(get_search_url(query, i, start_date, end_date))
+
+            # 팝업창이 뜨면 닫기
+            main = driver.window_handles
+            for handle in main:
+                if handle != main[0]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+
+            # 한 페이지의 결과 리스트
+            ul_element = driver.find_element(By.XPATH, '//*[@id="contents"]/div[1]/ul')
+            li_elements = ul_element.find_elements(By.CSS_SELECTOR, 'ul.search_list > li')
+            page_bidno = extract_bidno(li.text for li in li_elements)
+            stats['pages_fetched'] += 1
+            bidno.extend(page_bidno)
+            limiter.on_success()
+
+            # 모든 번호가 이미 수집된 페이지면 이후 페이지(더 오래된 공고)는 탐색하지 않음
+            if known_bidno is not None and is_known_page(page_bidno, known_bidno):
+                break
+
+        stats['pages_skipped'] = max_page - stats['pages_fetched']
+        return bidno
+
+    finally:
+        driver.quit()  # 드라이버 종료
+
+
+### 나라장터에서 검색 결과(개찰 공고) 확인 후 입찰공고번호 크롤링하는 함수
+# stop_at_known=True이면 기존 번호로만 이루어진 페이지에서 탐색을 중단하고, stats에 페이지 탐색 현황을 기록
+def nara_crawler(search_word, start_date, end_date, use_browser=False, stop_at_known=False, stats=None, session=None):
+    from bid_store import bid_lookup
+
+    search_query = search_word
+    file_prefix = search_word.replace(" ", "_")
+    data_dir = os.path.join('data', file_prefix)
+
+    # 데이터 디렉토리 존재 여부 확인 및 생성
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    # 기존 데이터의 입찰공고번호 ('-00'을 제거한 번호로 확인, 저장소는 입찰공고번호 인덱스를 사용하므로 파일을 읽지 않음)
+    try:
+        existing_bidno = bid_lookup(data_dir, file_prefix)
+    except Exception as e:
+        print(f"기존 데이터를 불러오는 중 오류 발생: {e}")
+        raise
+
+    euc_kr_encoded = search_query.encode('euc-kr') # 문자열을 EUC-KR로 인코딩
+    query = urllib.parse.quote(euc_kr_encoded) # URL 인코딩
+
+    known_bidno = existing_bidno if stop_at_known else None
+    stats = {} if stats is None else stats
+
+    # 기본은 HTTP 요청으로 수집하고, 브라우저는 명시적으로 요청한 경우에만 사용
+    with metrics.stage('search'):
+        try:
+            if use_browser:
+                bidno = search_bidno_browser(query, start_date, end_date, known_bidno, stats)
+            else:
+                bidno = search_bidno_http(query, start_date, end_date, known_bidno=known_bidno, stats=stats, session=session)
+        finally:
+            metrics.add('search', items=stats.get('pages_fetched', 0))  # 처리 건수 : 요청한 검색 결과 페이지 수
+
+    if bidno is None:
+        return None
+
+    # 중복되는 입찰공고번호 제거 및 정렬 (기존 데이터와 중복되는 공고 제거)
+    unique_bidno = [int(b) for b in bidno if b not in existing_bidno]
+    # unique_bidno_sorted = sorted(unique_bidno, reverse=True)
+
+    # 새로운 입찰공고가 없을 경우 None 반환
+    if not unique_bidno:
+        return None
+
+    return unique_bidno
+
+
+### CSV 저장 함수 (새 데이터는 기존 파일 뒤에 추가만 함, pyarrow가 없을 때 사용)
+# replace=True이면 기존 파일과 합치지 않고 새 데이터로 덮어씀 (캐시 재파싱용)
+def save_to_csv(data_dir, file_prefix, new_bid_df, new_result_df, replace=False):
+    from bid_store import BID_COLUMNS, RESULT_COLUMNS, read_bids, read_results
+    import pandas as pd
+
+    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+    result_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_result.csv')
+
+    # 데이터 디렉토리 존재 여부 확인 및 생성
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    try:
+        # 기존 파일이 있으면 뒤에 추가, 없으면 새로 저장
+        if not replace and os.path.exists(bid_file) and os.path.exists(result_file):
+            # Index로 연결된 기존 형식 파일은 한 번만 입찰공고번호 연결 형식으로 다시 저장
+            if 'Index' in pd.read_csv(bid_file, nrows=0).columns or 'Index' in pd.read_csv(result_file, nrows=0).columns:
+                existing_bid_df = read_bids(data_dir, file_prefix, dtype=str)
+                existing_result_df = read_results(data_dir, file_prefix, dtype=str)
+                existing_bid_df[BID_COLUMNS].to_csv(bid_file, index=False, encoding='utf-8-sig')
+                existing_result_df[RESULT_COLUMNS].to_csv(result_file, index=False, encoding='utf-8-sig')
+
+            new_bid_df[BID_COLUMNS].to_csv(bid_file, mode='a', header=False, index=False, encoding='utf-8')
+            new_result_df[RESULT_COLUMNS].to_csv(result_file, mode='a', header=False, index=False, encoding='utf-8')
+        else:
+            new_bid_df[BID_COLUMNS].to_csv(bid_file, index=False, encoding='utf-8-sig')
+            new_result_df[RESULT_COLUMNS].to_csv(result_file, index=False, encoding='utf-8-sig')
+    
+    except PermissionError as e:
+        if e.errno == errno.EACCES:
+            print(f"⚠️파일 접근 권한 오류: {e.filename}에 접근할 수 없습니다.")
+            print("⚠️다른 프로그램에서 파일을 열고 있는지 확인한 후 다시 시도하세요.")
+        else:
+            print(f"⚠️파일 저장 중 오류 발생: {e}")
+        return False
+    
+    except Exception as e:
+        print(f"⚠️파일 저장 중 오류 발생: {e}")
+        return False
+
+    return True
+
+
+### 전체 저장소에 개찰 데이터를 저장하는 함수 (키워드 저장소에는 소속 공고만 기록)
+# 기존 CSV나 공고 데이터를 직접 가진 키워드 저장소는 처음 저장할 때 전체 저장소로 옮기고,
+# replace=True이면 전체 저장소의 해당 공고를 새 데이터로 바꾸고 키워드의 소속 공고를 다시 만듦
+def save_to_store(data_dir, file_prefix, new_bid_df, new_result_df, replace=False):
+    from bid_store import append_bids, replace_bids, prepare_store
+
+    try:
+        prepare_store(data_dir, file_prefix)
+        if replace:
+            replace_bids(data_dir, new_bid_df, new_result_df)
+        else:
+            append_bids(data_dir, new_bid_df, new_result_df)
+
+    except PermissionError as e:
+        if e.errno == errno.EACCES:
+            print(f"⚠️파일 접근 권한 오류: {e.filename}에 접근할 수 없습니다.")
+            print("⚠️다른 프로그램에서 파일을 열고 있는지 확인한 후 다시 시도하세요.")
+        else:
+            print(f"⚠️파일 저장 중 오류 발생: {e}")
+        return False
+
+    except Exception as e:
+        print(f"⚠️파일 저장 중 오류 발생: {e}")
+        return False
+
+    return True
+
+
+### 개찰 데이터 저장 함수 (pyarrow가 있으면 월별 파티션 저장소, 없으면 기존 CSV 방식, 저장에 성공하면 True)
+def save_bid_data(data_dir, file_prefix, new_bid_df, new_result_df, replace=False):
+    from bid_store import STORE_ENABLED
+
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    with metrics.stage('save'):
+        save = save_to_store if STORE_ENABLED else save_to_csv
+        saved = save(data_dir, file_prefix, new_bid_df, new_result_df, replace)
+        metrics.add('save', items=len(new_bid_df) if saved else 0, errors=0 if saved else 1)
+    return saved
+
+
+### 공고 묶음의 상세 페이지를 가져오는 함수 (캐시에 있는 페이지는 다시 요청하지 않음)
+# 새로 받은 페이지는 캐시에 저장하지 않음 (파싱에 성공한 뒤 cache_parsed로 저장)
+# refresh=True이면 캐시를 읽지 않고 모두 요청
+# 반환값 : (입력 순서대로 페이지 원본 또는 None, {일시적인 오류로 실패한 공고: 오류}, 새로 요청한 위치 set)
+def fetch_details(batch, cache, max_workers=8, max_rps=None, session=None, refresh=False):
+    from fetcher import fetch_all, is_transient_error
+
+    with metrics.stage('detail_fetch'):
+        pages = [cache.get(bid, '00') if cache is not None and not refresh else None for bid in batch]
+        missing = [pos for pos, html in enumerate(pages) if html is None]
+        if cache is not None and not refresh:
+            metrics.cache('html_cache', hits=len(batch) - len(missing), misses=len(missing))
+
+        # 상세 페이지를 동시에 요청 (세션 재사용, 호스트별 요청 속도 제한)
+        detail_urls = [DETAIL_URL.format(bidno=batch[pos], bidseq='00') for pos in missing]
+        fetched, errors = fetch_all(detail_urls, session=session, max_workers=max_workers, max_rps=max_rps, desc="개찰 결과 크롤링 진행")
+
+        failed = {}
+        for pos, html, error in zip(missing, fetched, errors):
+            pages[pos] = html
+            if html is None and is_transient_error(error):
+                failed[batch[pos]] = error
+
+        # 처리 건수 : 새로 받은 페이지 수 (캐시에서 읽은 페이지는 html_cache 적중으로 기록)
+        metrics.add('detail_fetch', items=sum(html is not None for html in fetched), errors=sum(html is None for html in fetched))
+
+    return pages, failed, set(missing)
+
+
+### 파싱 결과에 따라 캐시를 갱신하는 함수
+# 점검 안내, 응답 일부만 받은 페이지처럼 파싱할 수 없는 페이지는 저장하지 않아 다음 실행과 재파싱에서 다시 요청하고,
+# 캐시에서 읽었는데 파싱할 수 없는 페이지(stale)는 삭제
+def cache_parsed(cache, batch, pages, parsed, fresh, stale=()):
+    if cache is None:
+        return
+    for pos in stale:
+        cache.delete(batch[pos], '00')
+    for pos in fresh:
+        if pages[pos] is not None and parsed[pos] is not None:
+            cache.put(batch[pos], '00', pages[pos])
+
+
+### 여러 키워드의 공고 상세 페이지를 미리 캐시에 저장하는 함수 (같은 공고는 한 번만 요청)
+# 이후 키워드별 process_bids는 같은 캐시에서 페이지를 읽으므로 여러 키워드에 걸친 공고도 네트워크 요청은 한 번뿐임
+# 반환값 : (새로 요청한 페이지 수, {일시적인 오류로 실패한 공고: 오류})
+# 파싱할 수 없는 페이지는 저장하지 않으므로 process_bids에서 다시 요청함
+def prefetch_details(bidno, cache, max_workers=8, max_rps=None, session=None, chunk_size=CHECKPOINT_SIZE, processes=None):
+    from detail_parser import parse_pages
+
+    cached = {bid for bid, bidseq in cache.keys() if bidseq == '00'}
+    requested = {str(bid) for bid in bidno}
+    todo = sorted(requested - cached)
+    metrics.cache('html_cache', hits=len(requested) - len(todo))  # 캐시에 없는 공고는 fetch_details에서 미적중으로 기록
+
+    fetched = 0
+    failed = {}
+    for start in range(0, len(todo), chunk_size):
+        batch = todo[start:start + chunk_size]
+        pages, batch_failed, fresh = fetch_details(batch, cache, max_workers, max_rps, session)
+        cache_parsed(cache, batch, pages, parse_pages(pages, processes=processes), fresh)
+        fetched += sum(html is not None for html in pages)
+        failed.update(batch_failed)
+    return fetched, failed
+
+
+### 공고 묶음 하나의 상세 페이지를 가져와 파싱하는 함수
+# 반환값 : (공고 정보 행, 개찰 순위 행, 저장할 공고, 개찰 결과가 없는 공고, {일시적인 오류로 실패한 공고: 오류})
+def crawl_batch(batch, cache, max_workers, max_rps, processes, session=None):
+    from detail_parser import parse_pages
+
+    pages, failed, fresh = fetch_details(batch, cache, max_workers, max_rps, session)
+
+    # 상세 페이지 파싱은 프로세스 풀에서 나누어 처리 (결과는 입력 순서 유지)
+    with metrics.stage('parse'):
+        parsed = parse_pages(pages, processes=processes)
+        metrics.add('parse', items=sum(html is not None for html in pages))
+
+    # 캐시에서 읽었는데 파싱할 수 없는 페이지는 일시적인 오류 페이지가 저장된 것일 수 있으므로 다시 요청
+    stale = [pos for pos, (html, result) in enumerate(zip(pages, parsed)) if html is not None and result is None and pos not in fresh]
+    if stale:
+        print(f"⏳ 캐시에서 읽은 페이지 중 파싱할 수 없는 {len(stale)}건을 다시 요청합니다.")
+        refetched, refetch_failed, _ = fetch_details([batch[pos] for pos in stale], cache, max_workers, max_rps, session, refresh=True)
+        with metrics.stage('parse'):
+            reparsed = parse_pages(refetched, processes=processes)
+            metrics.add('parse', items=sum(html is not None for html in refetched))
+        for pos, html, result in zip(stale, refetched, reparsed):
+            pages[pos], parsed[pos] = html, result
+        failed.update(refetch_failed)
+
+    cache_parsed(cache, batch, pages, parsed, fresh | set(stale), stale)
+
+    bid_list, result_list, done, passed = [], [], [], []
+    for bid, result in zip(batch, parsed):
+        if bid in failed:
+            continue
+
+        # 투찰한 모든 업체가 낙찰하한선 미달이거나 다시 요청해도 같은 오류(404 등)인 경우 예외처리
+        if result is None:
+            passed.append(bid)
+            continue
+
+        bid_row, result_rows = result
+        bid_list.append(bid_row)
+        result_list.extend(result_rows)
+        done.append(bid)
+
+    return bid_list, result_list, done, passed, failed
+
+
+### 입찰공고 번호 조회하여 개찰 결과를 크롤링하는 함수
+# 공고를 작업 큐(data/<키워드>/crawl_queue.sqlite)에 넣고 checkpoint_size개씩 수집할 때마다 저장하므로
+# 중단 후 다시 실행하면 저장을 마친 공고는 건너뛰고 남은 공고와 일시적인 오류로 실패한 공고만 수집함
+# processes : 상세 페이지 파싱에 사용할 프로세스 수 (None이면 CPU 코어 수)
+# retry_rounds : 한 번 실행에서 일시적인 오류를 다시 시도하는 횟수 (남은 공고는 다음 실행에서 재시도)
+# cache, session을 주면 그 캐시와 세션을 사용하고 닫지 않음 (배치 실행에서 키워드 간 공유)
+def process_bids(bidno, search_word, latest_mode=0, max_workers=8, max_rps=None, use_cache=True, processes=None,
+                 checkpoint_size=CHECKPOINT_SIZE, retry_rounds=RETRY_ROUNDS, cache=None, session=None):
+    import pandas as pd
+    from bid_store import STORE_ENABLED, BID_COLUMNS, RESULT_COLUMNS, link_global_bids, bid_lookup, apply_schema
+
+    file_prefix = search_word.replace(" ", "_")
+    data_dir = os.path.join('data', file_prefix)
+
+    bid_dfs = []
+    result_dfs = []
+    pass_list = []  # 유찰 등으로 개찰 결과가 없는 공고 (일시적인 오류는 작업 큐에서 재시도)
+
+    own_cache = cache is None
+    if own_cache:
+        cache = HtmlCache() if use_cache else None
+    queue = CrawlQueue(os.path.join(data_dir, QUEUE_FILE))
+    try:
+        queue.add(bidno)  # 다시 검색된 failed 공고는 처음부터 다시 시도
+
+        # 4번 모드(이어서 수집)는 재시도 횟수를 모두 사용한 공고도 다시 시도
+        if latest_mode == 4:
+            requeued = queue.requeue_failed()
+            if requeued:
+                print(f"⏳ 재시도 횟수를 모두 사용했던 공고 {requeued}건을 다시 시도합니다.")
+
+        # 저장은 마쳤지만 완료 표시 전에 중단된 공고는 다시 수집하지 않음
+        saved = bid_lookup(data_dir, file_prefix)
+        queue.mark_done([bid for bid in queue.due() if bid in saved])
+
+        # 다른 키워드에서 이미 수집한 공고는 요청하지 않고 이 키워드에 연결만 함
+        if STORE_ENABLED:
+            linked_bid_df, linked_result_df = link_global_bids(data_dir, queue.due())
+            if not linked_bid_df.empty:
+                print(f"⏩ 다른 키워드에서 이미 수집한 공고 {len(linked_bid_df)}건을 연결했습니다.")
+                queue.mark_done(linked_bid_df['입찰공고번호'].astype(str).str.split('-').str[0])
+                bid_dfs.append(linked_bid_df)
+                result_dfs.append(linked_result_df)
+
+        for retry_round in range(retry_rounds + 1):
+            if retry_round:
+                wait = queue.next_retry_in()
+                if wait is None:
+                    break
+                print(f"⏳ 일시적인 오류로 실패한 공고를 {wait:.1f}초 후 다시 시도합니다. ({retry_round}/{retry_rounds})")
+                time.sleep(wait)
+
+            todo = queue.due()
+            for start in range(0, len(todo), checkpoint_size):
+                batch = todo[start:start + checkpoint_size]
+                bid_list, result_list, done, passed, failed = crawl_batch(batch, cache, max_workers, max_rps, processes, session)
+
+                # 금액, 투찰률, 일시 등은 여기서 한 번만 타입 변환 (이후 단계는 변환된 값을 사용)
+                new_bid_df = apply_schema(pd.DataFrame(bid_list, columns=BID_COLUMNS))
+                new_result_df = apply_schema(pd.DataFrame(result_list, columns=RESULT_COLUMNS))
+
+                # 체크포인트 저장 (result는 입찰공고번호로 연결되므로 모든 모드에서 추가만 함)
+                if done and not save_bid_data(data_dir, file_prefix, new_bid_df, new_result_df):
+                    print("⚠️저장에 실패하여 수집을 멈춥니다. 남은 공고는 다음 실행에서 이어서 수집합니다.")
+                    return None
+
+                queue.mark_done(done)
+                queue.mark_passed(passed)
+                queue.mark_retry(failed)
+
+                if done:
+                    bid_dfs.append(new_bid_df)
+                    result_dfs.append(new_result_df)
+                pass_list.extend(int(bid) for bid in passed)
+
+        remaining = queue.remaining()
+        if remaining:
+            print(f"⚠️일시적인 오류로 수집하지 못한 공고 {remaining}건은 작업 큐에 남겨 다음 실행에서 다시 시도합니다.")
+        failed_count = queue.failed_count()
+        if failed_count:
+            print(f"⚠️재시도 횟수를 모두 사용한 공고 {failed_count}건은 다시 검색되거나 4번 모드로 이어서 수집할 때 다시 시도합니다.")
+    finally:
+        queue.close()
+        if own_cache and cache is not None:
+            cache.close()
+
+    if not bid_dfs:
+        return apply_schema(pd.DataFrame(columns=BID_COLUMNS)), pass_list, apply_schema(pd.DataFrame(columns=RESULT_COLUMNS))
+    return pd.concat(bid_dfs, ignore_index=True), pass_list, pd.concat(result_dfs, ignore_index=True)
+
+
+### 캐시된 상세 페이지 원본만으로 개찰결과 목록/result 파일을 다시 만드는 함수
+# bidno를 주지 않으면 기존 목록 파일의 공고를 입찰공고번호(차수 포함) 기준으로 재파싱하고, 캐시에 없는 공고는 기존 행을 유지
+# 캐시 페이지를 파싱할 수 없으면 일시적인 오류 페이지가 저장된 것일 수 있으므로 그 공고만 다시 요청하고,
+# 다시 받은 페이지도 파싱할 수 없으면 기존 행을 유지 (기존 행이 없는 공고만 개찰 결과가 없는 공고로 처리)
+def reparse_from_cache(search_word, bidno=None, processes=None):
+    import pandas as pd
+    from tqdm import tqdm
+    from detail_parser import parse_pages
+    from fetcher import fetch_all
+    from bid_store import BID_COLUMNS, RESULT_COLUMNS, read_bids, read_results, apply_schema
+
+    file_prefix = search_word.replace(" ", "_")
+    data_dir = os.path.join('data', file_prefix)
+
+    # 기존 데이터 (저장소 또는 기존 CSV)
+    existing_bid_df = read_bids(data_dir, file_prefix)
+    existing_result_df = read_results(data_dir, file_prefix)
+
+    # 재파싱 대상 (입찰공고번호, 차수)
+    if bidno is None:
+        if existing_bid_df.empty:
+            print(f"⚠️'{data_dir}'에 기존 개찰결과 목록이 없어 재파싱할 공고 목록을 알 수 없습니다.")
+            return None
+        targets = [tuple(str(number).split('-')) for number in existing_bid_df['입찰공고번호']]
+    else:
+        targets = [(str(bid), '00') for bid in bidno]
+
+    # 기존 데이터는 입찰공고번호(차수 포함)로 찾음
+    existing_bid_rows = {str(row[0]): list(row) for row in existing_bid_df[BID_COLUMNS].itertuples(index=False)}
+    existing_result_rows = {}
+    for row in existing_result_df[RESULT_COLUMNS].itertuples(index=False):
+        existing_result_rows.setdefault(str(row[0]), []).append(list(row))
+
+    bid_list = []
+    result_list = []
+    pass_list = []
+    missing_list = []  # 캐시에 원본이 없는 공고
+
+    with HtmlCache() as cache:
+        pages = [cache.get(number, bidseq) for number, bidseq in tqdm(targets, desc="캐시 원본 읽기")]
+        metrics.cache('html_cache', hits=sum(html is not None for html in pages), misses=sum(html is None for html in pages))
+
+        with metrics.stage('parse'):
+            parsed = parse_pages(pages, processes=processes)
+            metrics.add('parse', items=sum(html is not None for html in pages))
+
+        # 파싱할 수 없는 캐시 페이지는 삭제하고 다시 요청 (다시 받은 페이지는 파싱에 성공한 경우에만 캐시에 저장)
+        stale = [pos for pos, (html, result) in enumerate(zip(pages, parsed)) if html is not None and result is None]
+        if stale:
+            print(f"⏳ 캐시에서 읽은 페이지 중 파싱할 수 없는 {len(stale)}건을 다시 요청합니다.")
+            with metrics.stage('detail_fetch'):
+                urls = [DETAIL_URL.format(bidno=targets[pos][0], bidseq=targets[pos][1]) for pos in stale]
+                refetched, _ = fetch_all(urls, desc="상세 페이지 다시 요청")
+                metrics.add('detail_fetch', items=sum(html is not None for html in refetched), errors=sum(html is None for html in refetched))
+            with metrics.stage('parse'):
+                reparsed = parse_pages(refetched, processes=processes)
+                metrics.add('parse', items=sum(html is not None for html in refetched))
+
+            for pos, html, result in zip(stale, refetched, reparsed):
+                number, bidseq = targets[pos]
+                cache.delete(number, bidseq)
+                if result is not None:
+                    cache.put(number, bidseq, html)
+                pages[pos], parsed[pos] = html, result
+
+    for (number, bidseq), html, result in zip(targets, pages, parsed):
+        bid_key = f'{number}-{bidseq}'
+        if html is None or (result is None and bid_key in existing_bid_rows):
+            missing_list.append(number)
+            if bid_key in existing_bid_rows:  # 기존 데이터 유지
+                bid_list.append(existing_bid_rows[bid_key])
+                result_list.extend(existing_result_rows.get(bid_key, []))
+            continue
+
+        if result is None:  # 투찰한 모든 업체가 낙찰하한선 미달일 경우 예외처리
+            pass_list.append(int(number))
+            continue
+
+        bid_row, result_rows = result
+        bid_list.append(bid_row)
+        result_list.extend(result_rows)
+
+    if missing_list:
+        print(f"⚠️캐시에 원본이 없거나 파싱할 수 없는 공고 {len(missing_list)}건은 기존 데이터를 유지합니다.")
+
+    # 금액, 투찰률, 일시 등은 여기서 한 번만 타입 변환 (이후 단계는 변환된 값을 사용)
+    new_bid_df = apply_schema(pd.DataFrame(bid_list, columns=BID_COLUMNS))
+    new_result_df = apply_schema(pd.DataFrame(result_list, columns=RESULT_COLUMNS))
+
+    save_bid_data(data_dir, file_prefix, new_bid_df, new_result_df, replace=True)
+
+    return new_bid_df, pass_list, new_result_df
+
+
+### 키워드 입력 검증 및 형식 확인 함수
+def validate_keyword_input(keyword):
+    # 키워드의 앞뒤 공백 제거
+    keyword = keyword.strip()
+
+    # 1. 키워드가 한 글자만 입력된 경우
+    if len(keyword) < 2:
+        print("키워드는 최소 두 글자 이상이어야 합니다.")
+        return False
+
+    # 2. 키워드가 공백만으로 이루어진 경우
+    if not keyword:
+        print("키워드는 공백만 입력할 수 없습니다.")
+        return False
+
+    # 3. 키워드 형식이 올바르지 않은 경우 (한글, 영문, 숫자, 공백만 허용)
+    if not re.match(r"^[가-힣a-zA-Z0-9\s]+$", keyword):
+        print("키워드는 한글, 영문, 숫자, 공백만 포함해야 합니다.")
+        return False
+
+    # 모든 조건을 통과하면 True 반환
+    return True
+
+
+### 키워드 폴더 존재 여부 확인 및 모드 선택 함수
+def check_and_select_mode():
+    while True:
+        search_word = input(">>> 찾으시는 키워드를 입력하세요 (종료는 *): ").strip()
+
+        if search_word == '*':
+            print("\n프로그램을 종료합니다.")
+            return None, None
+
+        # 입력된 키워드에 대한 예외 처리
+        if not validate_keyword_input(search_word):
+            continue  # 키워드가 유효하지 않으면 다시 입력받음
+
+        file_prefix = search_word.replace(" ", "_")
+        data_dir = os.path.join('data', file_prefix)
+
+        if os.path.exists(data_dir):
+            # 최신 및 오래된 일시 둘 다 가져오기
+            bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+            recent_date, oldest_date = get_most_date(bid_file, mode=999)
+            print(f"\n'{data_dir}' 폴더가 존재합니다. 다음 메뉴에서 선택하세요:")
+            print(f"해당 키워드는 현재 {oldest_date}부터 {recent_date}까지 수집되어있습니다.")
+            print("1: 최신 데이터 추가")
+            print("2: 기존 데이터의 과거 데이터 추가")
+            print("3: 캐시된 원본으로 다시 파싱 (네트워크 요청 없음)")
+            remaining = queue_remaining(data_dir)
+            failed_count = queue_failed(data_dir)
+            if remaining or failed_count:
+                print(f"4: 중단된 수집 이어서 하기 (남은 공고 {remaining}건, 재시도 횟수를 모두 사용한 공고 {failed_count}건)")
+            print("*: 종료")
+            print("#: 키워드 재입력")
+            choices = ['1', '2', '3', '4'] if remaining or failed_count else ['1', '2', '3']
+            
+            while True:
+                menu_choice = input(f">>> 메뉴를 선택하세요 ({', '.join(choices)}, *, #): ").strip()
+
+                if menu_choice == '*':
+                    print("\n프로그램을 종료합니다.")
+                    return None, None
+                elif menu_choice == '#':
+                    break  # 재입력 시 다시 키워드 입력으로 돌아감
+                elif menu_choice in choices:
+                    return search_word, int(menu_choice)
+                else:
+                    print("올바른 메뉴를 선택하세요.")
+        else:
+            # 폴더가 없으면 새로운 데이터 크롤링 여부 물어보기
+            print(f"'{data_dir}' 폴더가 존재하지 않습니다.")
+            user_input = input(f">>> '{search_word}'에 대한 데이터를 새로 크롤링하시겠습니까? (Y/N): ").strip().upper()
+
+            if user_input in ['Y', 'y']:
+                return search_word, 0  # 0번 모드로 실행
+            else:
+                print("프로그램을 종료합니다.")
+                return None, None
+
+
+### 파일을 읽어 가장 최근/오래된 개찰일시를 가져오는 함수
+# 월별 저장소가 있으면 가장 오래된/최근 월 파티션만 읽음 (file_name이 있는 폴더 기준)
+def get_most_date(file_name, mode):
+    import pandas as pd
+    from bid_store import has_store, get_date_range, apply_schema
+
+    data_dir = os.path.dirname(file_name)
+    if has_store(data_dir):
+        recent_date, oldest_date = get_date_range(data_dir)
+        if recent_date is None:
+            return None if mode in [1, 2] else (None, None)
+
+        if mode == 1:
+            return recent_date.strftime('%Y%m%d')
+        elif mode == 2:
+            return oldest_date.strftime('%Y%m%d')
+        elif mode == 999: #모드가 아님
+            return recent_date.strftime('%Y%m%d'), oldest_date.strftime('%Y%m%d')
+
+    elif os.path.exists(file_name):
+        # 파일이 존재하면 데이터를 읽어 가장 최근/오래된 일시 확인 (읽을 때 datetime 타입으로 변환됨)
+        df = apply_schema(pd.read_csv(file_name, usecols=['실제개찰일시']))
+
+        if mode == 1:
+            # 최신 데이터 (가장 최근 일시)
+            return df['실제개찰일시'].max().strftime('%Y%m%d')
+        elif mode == 2:
+            # 오래된 데이터 (가장 오래된 일시)
+            return df['실제개찰일시'].min().strftime('%Y%m%d')
+        elif mode == 999: #모드가 아님
+            return df['실제개찰일시'].max().strftime('%Y%m%d'), df['실제개찰일시'].min().strftime('%Y%m%d')
+    else:
+        return None if mode in [1, 2] else (None, None)
+
+
+### 날짜 형식 검증 함수
+def validate_date_format(date_str):
+    try:
+        datetime.strptime(date_str, '%Y%m%d')
+        return True
+    except ValueError:
+        print("⚠️ 잘못된 날짜 형식입니다. 'YYYYMMDD' 형식으로 입력해 주세요.")
+        return False
+
+
+### 날짜 범위 검증 함수 (start_date가 end_date보다 이전인지 확인)
+def validate_date_range(start_date, end_date):
+    if start_date > end_date:
+        print("⚠️ 시작 날짜는 종료 날짜보다 나중일 수 없습니다.")
+        return False
+    return True
+
+
+### 새로 찾은 공고가 없을 때 작업 큐에 남은 공고가 있으면 그 공고만 수집하도록 빈 리스트 반환 (남은 공고도 없으면 None)
+def queued_only(data_dir):
+    remaining = queue_remaining(data_dir)
+    if not remaining:
+        return None
+    print(f"⏩ 작업 큐에 남은 공고 {remaining}건을 이어서 수집합니다.")
+    return []
+
+
+### 모드에 따라 수집할 입찰공고번호를 찾는 함수 (새로 수집할 공고와 작업 큐에 남은 공고가 모두 없으면 None, 4번 모드는 빈 리스트)
+# start_date, end_date를 주면 입력을 받지 않음 (0번 모드는 둘 다, 2번 모드는 start_date만 사용)
+# stats에 dict를 넘기면 검색 페이지 탐색 현황(max_page, pages_fetched, pages_skipped)이 기록됨
+def find_bidno(search_word, latest_mode=0, use_browser=False, stats=None, start_date=None, end_date=None, session=None):
+    # 기본 경로 설정
+    file_prefix = search_word.replace(" ", "_")
+    data_dir = os.path.join('data', file_prefix)
+    bid_file = os.path.join(data_dir, f'{file_prefix}_개찰결과_목록.csv')
+
+    # 오늘 날짜 계산
+    today = datetime.now().strftime('%Y%m%d')
+    stats = {} if stats is None else stats
+
+    # 0번 모드: 새로운 키워드에 대한 데이터 크롤링
+    if latest_mode == 0:
+        print("새로운 키워드에 대한 데이터를 생성합니다.")
+        if start_date is None:
+            start_date = input(">>> 시작 날짜를 입력하세요 (YYYYMMDD 형식): ").strip()
+        if end_date is None:
+            end_date = input(">>> 종료 날짜를 입력하세요 (YYYYMMDD 형식): ").strip()
+
+        # 날짜 형식과 범위 검증
+        if not (validate_date_format(start_date) and validate_date_format(end_date)) or not validate_date_range(start_date, end_date):
+            return None
+
+        print(f"새로운 키워드 수집: {start_date}부터 {end_date}까지 데이터를 크롤링합니다.")
+        bidno = nara_crawler(search_word, start_date, end_date, use_browser, stats=stats, session=session)
+
+        # 검색 결과가 없을 경우 작업 큐에 남은 공고만 수집하고, 남은 공고도 없으면 빈 폴더만 삭제하고 None 반환
+        if bidno is None:
+            print(f"⚠️검색 결과가 없습니다.")
+            bidno = queued_only(data_dir)
+            if bidno is None:
+                remove_empty_dir(data_dir)
+                return None
+
+    # 1번 모드: 가장 최근 데이터 이후부터 오늘까지 추가 크롤링
+    elif latest_mode == 1:
+        most_recent_date = get_most_date(bid_file, latest_mode)
+
+        if not most_recent_date:
+            print(f"'{bid_file}' 파일이 비어있거나 데이터에 문제가 있습니다.")
+            return None
+        # start_date = most_recent_date.strftime('%Y%m%d')
+        print(f"최신 데이터 추가: {most_recent_date}부터 {today}까지 크롤링합니다.")
+        # 최신순 정렬이므로 이미 수집된 공고만 있는 페이지에 도달하면 페이지 탐색 중단
+        bidno = nara_crawler(search_word, most_recent_date, today, use_browser, stop_at_known=True, stats=stats, session=session)
+        if stats.get('pages_skipped'):
+            print(f"⏩ 이미 수집된 페이지에 도달하여 {stats['pages_skipped']}/{stats['max_page']} 페이지를 건너뛰었습니다.")
+
+        # 검색 결과가 없을 경우 작업 큐에 남은 공고만 수집
+        if bidno is None:
+            print("⚠️이미 최신화 상태입니다.")
+            bidno = queued_only(data_dir)
+            if bidno is None:
+                return None
+
+    # 2번 모드: 기존 데이터의 과거 데이터 추가 크롤링
+    elif latest_mode == 2:
+        most_old_date = get_most_date(bid_file, latest_mode)
+        if not most_old_date:
+            print(f"'{bid_file}' 파일이 비어있거나 데이터에 문제가 있습니다.")
+            return None
+        # end_date = most_old_date.strftime('%Y%m%d')
+        if start_date is None:
+            start_date = input(">>> 추가할 데이터의 시작 날짜를 입력하세요 (YYYYMMDD 형식): ").strip()
+
+        # 날짜 형식과 범위 검증
+        if not validate_date_format(start_date) or not validate_date_range(start_date, most_old_date):
+            return None
+
+        print(f"기존보다 오래된 데이터 추가: {start_date}부터 {most_old_date}까지 크롤링합니다.")
+        bidno = nara_crawler(search_word, start_date, most_old_date, use_browser, stats=stats, session=session)
+
+        # 검색 결과가 없을 경우 작업 큐에 남은 공고만 수집
+        if bidno is None:
+            print("⚠️해당하는 기간의 데이터가 없습니다.")
+            bidno = queued_only(data_dir)
+            if bidno is None:
+                return None
+
+    # 4번 모드: 작업 큐에 남은 공고만 이어서 수집 (검색 없음)
+    elif latest_mode == 4:
+        print(f"중단된 수집을 이어서 진행합니다: 남은 공고 {queue_remaining(data_dir)}건, 재시도 횟수를 모두 사용한 공고 {queue_failed(data_dir)}건")
+        bidno = []
+
+    else:
+        print(f"'{latest_mode}'는 올바른 모드가 아닙니다.")
+        return None
+
+    return bidno
+
+
+### 파일 업데이트 모드 설정
+# start_date, end_date, stats는 find_bidno와 같음
+def update_mode(search_word, latest_mode=0, use_browser=False, stats=None, start_date=None, end_date=None):
+    data_dir = os.path.join('data', search_word.replace(" ", "_"))
+
+    try:
+        # 3번 모드: 캐시된 상세 페이지 원본으로 기존 데이터 재생성 (크롤링 없음)
+        if latest_mode == 3:
+            print("캐시된 원본으로 개찰결과 파일을 다시 만듭니다.")
+            return reparse_from_cache(search_word)
+
+        bidno = find_bidno(search_word, latest_mode, use_browser, stats, start_date, end_date)
+        if bidno is None:
+            return None
+
+        # 새로운 데이터 처리 및 반환 (작업 큐에 남아 있던 공고도 함께 수집)
+        return process_bids(bidno, search_word, latest_mode)
+        
+    except Exception as e:
+        # 체크포인트로 저장된 데이터와 작업 큐는 이어서 수집할 수 있도록 남기고, 아무것도 없는 폴더만 삭제
+        if latest_mode == 0:
+            remove_empty_dir(data_dir)
+        print(f"오류 발생: {e}")
+        return None
+
+
+### 빈 폴더 삭제 함수 (저장된 파일이 있으면 그대로 둠)
+def remove_empty_dir(data_dir):
+    if os.path.isdir(data_dir) and not os.listdir(data_dir):
+        os.rmdir(data_dir)
\ No newline at end of file
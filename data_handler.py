@@ -1,92 +1,192 @@
-'''
-나라장터 개찰 데이터 분석 처리 파일
-- calcul_winrate : 개찰 데이터에서 업체별 참여 횟수와 낙찰 횟수를 기반으로 낙찰률과 가중 낙찰률을 계산하는 함수
-- filtering_underone : 낙찰 횟수가 0보다 큰 업체만 필터링하는 함수
-- rankclass : 가중 낙찰률을 기반으로 업체에 클래스(S, A, B, C, D)를 할당하고 순위를 부여하는 함수
-- get_final_df : 기존 데이터와 새로운 업체 정보를 통합하여 주소, 사업 형태, 위치 정보를 업데이트하고 최종 데이터 프레임을 생성하는 함수
-'''
-
-import pandas as pd
-import numpy as np
-
-### 낙찰률 계산 함수
-def calcul_winrate(result_df):
-    result_filter = result_df[(result_df['순위'] == 1) | (result_df['순위'] == '1')] # 낙찰에 성공한 데이터만 추출
-
-    df1 = pd.DataFrame(result_df[['업체명','사업자등록번호']].value_counts()) # 참여횟수
-    df2 = pd.DataFrame(result_filter[['업체명','사업자등록번호']].value_counts()) # 낙찰횟수
-
-    winrate_df = pd.merge(df1, df2, on=['업체명','사업자등록번호'], how='outer') # 아우터조인으로 새로운 데이터프레임 생성
-    winrate_df.columns = ['참여횟수', '낙찰횟수']
-
-    winrate_df.fillna(0, inplace=True)  # 결측치를 0으로 대체
-    winrate_df = winrate_df.astype(int)  # 모든 열을 정수형으로 변환
-    winrate_df['낙찰률(%)'] = ((winrate_df['낙찰횟수']/winrate_df['참여횟수'])*100).round(3) # 낙찰률 계산 후 반올림
-    winrate_df = winrate_df.sort_values(by='낙찰률(%)', ascending=False) # 낙찰률 기준으로 내림차순 정렬
-
-    # mean1 = np.mean(winrate_df['낙찰률(%)'] /100) # 평균 낙찰률
-    # mean2 = np.mean(winrate_df['참여횟수']) # 평균 참여횟수
-
-    winrate_df['가중 낙찰률'] = ((winrate_df['낙찰횟수']/winrate_df['참여횟수']) * np.log(winrate_df['참여횟수']+1)).round(3)
-    # winrate_df['성과 정규화 지수'] = ((winrate_df['낙찰횟수']/winrate_df['참여횟수']) / np.sqrt(winrate_df['참여횟수'])).round(3)
-    # winrate_df['상대적 성과 지수'] = ((winrate_df['낙찰률(%)'] /100)/mean1) * (mean2/winrate_df['참여횟수'])
-
-    winrate_df = winrate_df.reset_index()
-
-    return winrate_df
-
-
-### 가중 낙찰률 필터링
-def filtering_underone(winrate_df):
-    return winrate_df[winrate_df['낙찰횟수'] > 0]
-
-
-### 가중 낙찰률 기반 클래스 할당
-def rankclass(filtered_df):
-    # filtered_df의 명시적 복사본 생성
-    filtered_df = filtered_df.copy()
-
-    percentiles = np.percentile(filtered_df['가중 낙찰률'].values, [20, 40, 60, 80])
-    labels = ['D', 'C', 'B', 'A', 'S']
-
-    def classify(weight, percentiles):
-        for idx, percentile in enumerate(percentiles):
-            if weight <= percentile:
-                return labels[idx]
-        return labels[-1]
-
-    filtered_df.loc[:, '가중낙찰률 클래스'] = filtered_df['가중 낙찰률'].apply(lambda x: classify(x, percentiles))
-    filtered_df.loc[:, '순위'] = filtered_df.groupby('가중낙찰률 클래스')['가중 낙찰률'].rank(method='min', ascending=False).astype(int)
-    filtered_df.loc[:, 'rank_class'] = filtered_df['가중낙찰률 클래스'] + filtered_df['순위'].astype(str)
-    filtered_df = filtered_df.drop(columns=['순위'])
-    
-    return filtered_df
-
-
-def get_final_df(ranked_df, old_df , newcompany_info):
-    ranked_df['사업자등록번호'] = ranked_df['사업자등록번호'].astype(str)
-    old_df['사업자등록번호'] = old_df['사업자등록번호'].astype(str)
-    newcompany_info['사업자등록번호'] = newcompany_info['사업자등록번호'].astype(str)
-    
-    if not old_df.empty:
-        updated_df = ranked_df.merge(old_df[['사업자등록번호', '주소', '사업형태', '위도', '경도', '전화번호']], on='사업자등록번호', how='left')
-    else:
-        updated_df = ranked_df.copy()
-
-    if newcompany_info.empty:
-        return updated_df
-    
-    for idx, row in newcompany_info.iterrows():
-        biznonumber = row['사업자등록번호']
-        mask = updated_df['사업자등록번호'] == biznonumber
-
-        if mask.any():
-            updated_df.loc[mask, '주소'] = row['주소']
-            updated_df.loc[mask, '사업형태'] = row['사업형태']
-            updated_df.loc[mask, '위도'] = row['위도']
-            updated_df.loc[mask, '경도'] = row['경도']
-            updated_df.loc[mask, '전화번호'] = row['전화번호']
-
-    updated_df = updated_df.sort_values(by='가중 낙찰률', ascending=False) # 가중낙찰률 기준 내림차순 정렬
-
-    return updated_df
\ No newline at end of file
+'''
+나라장터 개찰 데이터 분석 처리 파일
+- to_bizno : 사업자등록번호를 정수로 변환하는 함수 (123-45-67890 형식의 기존 문자열 데이터도 허용)
+- count_wins : 개찰 result 행에서 사업자등록번호별 참여 횟수와 낙찰 횟수를 집계하는 함수
+- update_win_counts : 저장된 업체별 집계에 새로 수집한 result 행의 횟수만 더하는 함수
+- load_win_counts / save_win_counts : 업체별 집계와 집계 기준(반영된 소속 공고 파일 목록, 데이터 버전)을 읽고 저장하는 함수
+- winrate_from_counts : 업체별 집계로 낙찰률과 가중 낙찰률을 계산하는 함수
+- calcul_winrate : 개찰 데이터 전체를 다시 집계하여 낙찰률과 가중 낙찰률을 계산하는 함수 (전체 재계산)
+- verify_win_counts : 증분 집계가 전체 재계산 결과와 같은지 확인하는 함수
+- filtering_underone : 낙찰 횟수가 0보다 큰 업체만 필터링하는 함수
+- classify_scores : 점수를 백분위 경계로 한 번에 나누어(searchsorted) 등급을 붙이는 함수
+- rankclass : 가중 낙찰률(또는 지정한 점수 컬럼)을 기반으로 업체에 클래스(S, A, B, C, D)를 할당하고 순위를 부여하는 함수
+- get_final_df : 기존 데이터와 새로운 업체 정보를 사업자등록번호 기준으로 한 번에 통합하여 주소, 사업 형태, 위치 정보를 업데이트하고 최종 데이터 프레임을 생성하는 함수
+'''
+
+import os
+import json
+import pandas as pd
+import numpy as np
+
+WIN_COUNT_COLUMNS = ['사업자등록번호', '업체명', '참여횟수', '낙찰횟수']
+CLASS_PERCENTILES = [20, 40, 60, 80]  # 등급 경계 백분위 (오름차순)
+CLASS_LABELS = ['D', 'C', 'B', 'A', 'S']  # 낮은 구간부터의 등급 (경계 수 + 1개)
+
+# 기본 등급 방식 (score : 점수 컬럼, class_column : 등급 컬럼, rank_column : 등급+등급 내 순위 컬럼)
+DEFAULT_RANK_SCHEME = {'score': '가중 낙찰률', 'percentiles': CLASS_PERCENTILES, 'labels': CLASS_LABELS, 'class_column': '가중낙찰률 클래스', 'rank_column': 'rank_class'}
+
+INFO_COLUMNS = ['주소', '사업형태', '위도', '경도', '전화번호']  # get_final_df에서 합치는 업체 정보 (컬럼 순서 유지)
+
+### 사업자등록번호를 정수로 변환 (수집 시 변환된 값은 그대로, 기존 문자열 데이터는 123-45-67890 형식도 허용)
+def to_bizno(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    return pd.to_numeric(values.astype('string').str.replace('-', '', regex=False).str.strip(), errors='coerce')
+
+
+### 업체별 참여/낙찰 횟수 집계 함수 (사업자등록번호 기준, 업체명은 마지막으로 나온 이름 사용)
+def count_wins(result_df):
+    df = pd.DataFrame({
+        '사업자등록번호': to_bizno(result_df['사업자등록번호']),
+        '업체명': result_df['업체명'].astype(object),
+        '낙찰': pd.to_numeric(result_df['순위'], errors='coerce').eq(1).fillna(False).astype(int),  # 수집 시 정수로 변환된 순위 (기존 문자열 데이터도 허용)
+    }).dropna(subset=['사업자등록번호', '업체명'])
+
+    grouped = df.groupby('사업자등록번호', sort=False)
+    counts_df = pd.DataFrame({'업체명': grouped['업체명'].last(), '참여횟수': grouped.size(), '낙찰횟수': grouped['낙찰'].sum()}).reset_index()
+    counts_df['사업자등록번호'] = counts_df['사업자등록번호'].astype('int64')
+    return counts_df[WIN_COUNT_COLUMNS]
+
+
+### 기존 집계에 새로 수집한 result 행의 횟수만 더하는 함수 (counts_df가 None이면 새로 집계, result를 나누어 읽을 때도 사용)
+def update_win_counts(counts_df, new_result_df):
+    if counts_df is None:
+        return count_wins(new_result_df)
+
+    merged = pd.concat([counts_df[WIN_COUNT_COLUMNS], count_wins(new_result_df)], ignore_index=True)
+
+    grouped = merged.groupby('사업자등록번호', sort=False)
+    counts_df = pd.DataFrame({'업체명': grouped['업체명'].last(), '참여횟수': grouped['참여횟수'].sum(), '낙찰횟수': grouped['낙찰횟수'].sum()}).reset_index()
+    return counts_df[WIN_COUNT_COLUMNS]
+
+
+### 저장된 업체별 집계 읽기 (파일이 없거나 읽을 수 없으면 (None, None))
+# 반환값 : (집계 DataFrame, 집계 기준 dict(bid_store.count_marker 형식) 또는 None)
+def load_win_counts(counts_file):
+    if not os.path.exists(counts_file):
+        return None, None
+
+    try:
+        with open(counts_file, encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️낙찰 집계 파일을 읽을 수 없어 전체 재계산합니다: {e}")
+        return None, None
+
+    counts_df = pd.DataFrame(saved['counts'], columns=WIN_COUNT_COLUMNS)
+    counts_df['사업자등록번호'] = counts_df['사업자등록번호'].astype('int64')
+    return counts_df, saved.get('marker')  # 입찰공고번호 목록을 저장하던 이전 형식은 기준이 없으므로 전체 재계산
+
+
+### 업체별 집계 저장 (임시 파일에 쓴 뒤 교체)
+def save_win_counts(counts_file, counts_df, marker):
+    saved = {'marker': marker, 'counts': counts_df[WIN_COUNT_COLUMNS].values.tolist()}
+    tmp_file = f'{counts_file}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(saved, f, ensure_ascii=False, default=int)
+    os.replace(tmp_file, counts_file)
+
+
+### 업체별 집계로 낙찰률과 가중 낙찰률을 계산하는 함수
+def winrate_from_counts(counts_df):
+    winrate_df = counts_df[['업체명', '사업자등록번호', '참여횟수', '낙찰횟수']].copy()
+    winrate_df[['참여횟수', '낙찰횟수']] = winrate_df[['참여횟수', '낙찰횟수']].astype(int)
+    winrate_df['낙찰률(%)'] = ((winrate_df['낙찰횟수']/winrate_df['참여횟수'])*100).round(3) # 낙찰률 계산 후 반올림
+    winrate_df = winrate_df.sort_values(by='낙찰률(%)', ascending=False) # 낙찰률 기준으로 내림차순 정렬
+
+    # mean1 = np.mean(winrate_df['낙찰률(%)'] /100) # 평균 낙찰률
+    # mean2 = np.mean(winrate_df['참여횟수']) # 평균 참여횟수
+
+    winrate_df['가중 낙찰률'] = ((winrate_df['낙찰횟수']/winrate_df['참여횟수']) * np.log(winrate_df['참여횟수']+1)).round(3)
+    # winrate_df['성과 정규화 지수'] = ((winrate_df['낙찰횟수']/winrate_df['참여횟수']) / np.sqrt(winrate_df['참여횟수'])).round(3)
+    # winrate_df['상대적 성과 지수'] = ((winrate_df['낙찰률(%)'] /100)/mean1) * (mean2/winrate_df['참여횟수'])
+
+    winrate_df = winrate_df.reset_index(drop=True)
+
+    return winrate_df
+
+
+### 낙찰률 계산 함수 (전체 result를 다시 집계, 증분 집계 검증용)
+def calcul_winrate(result_df):
+    return winrate_from_counts(count_wins(result_df))
+
+
+### 증분 집계와 전체 재계산 집계를 비교하는 함수 (횟수가 다른 업체 반환, 비어 있으면 일치)
+def verify_win_counts(counts_df, full_df):
+    compare_df = counts_df.merge(full_df, on='사업자등록번호', how='outer', suffixes=('', '_전체'))
+    compare_df = compare_df.fillna({'참여횟수': 0, '낙찰횟수': 0, '참여횟수_전체': 0, '낙찰횟수_전체': 0})
+    mismatch = (compare_df['참여횟수'] != compare_df['참여횟수_전체']) | (compare_df['낙찰횟수'] != compare_df['낙찰횟수_전체'])
+    return compare_df[mismatch]
+
+
+### 가중 낙찰률 필터링
+def filtering_underone(winrate_df):
+    return winrate_df[winrate_df['낙찰횟수'] > 0]
+
+
+### 점수를 백분위 경계로 나누어 등급을 붙이는 함수 (경계 이하인 첫 구간의 등급, 모든 경계보다 크면 마지막 등급)
+def classify_scores(scores, percentiles=CLASS_PERCENTILES, labels=CLASS_LABELS):
+    if len(labels) != len(percentiles) + 1:
+        raise ValueError(f"등급 수({len(labels)})는 백분위 경계 수({len(percentiles)}) + 1이어야 합니다.")
+
+    scores = np.asarray(scores, dtype=float)
+    cut_points = np.percentile(scores, percentiles)
+    return np.asarray(labels, dtype=object)[np.searchsorted(cut_points, scores, side='left')]
+
+
+### 점수 기반 클래스 할당 및 클래스 내 순위 부여
+# schemes : 등급 방식 목록 (기본은 가중 낙찰률 5등급 하나), 방식마다 등급/순위 컬럼이 추가됨
+# group_by : 키워드 컬럼 등을 주면 그룹마다 따로 백분위 경계를 구하고 순위를 매김 (여러 키워드를 한 번에 처리)
+def rankclass(filtered_df, schemes=None, group_by=None):
+    # filtered_df의 명시적 복사본 생성
+    filtered_df = filtered_df.copy()
+    schemes = [DEFAULT_RANK_SCHEME] if schemes is None else schemes
+
+    if group_by is None:
+        groups = [np.arange(len(filtered_df))]
+    else:
+        groups = filtered_df.groupby(group_by, sort=False, dropna=False).indices.values()
+    group_keys = [] if group_by is None else ([group_by] if isinstance(group_by, str) else list(group_by))
+
+    for scheme in schemes:
+        scheme = {**DEFAULT_RANK_SCHEME, **scheme}
+        score, class_column = scheme['score'], scheme['class_column']
+        scores = filtered_df[score].to_numpy(dtype=float)
+
+        classes = np.empty(len(filtered_df), dtype=object)
+        for rows in groups:
+            classes[rows] = classify_scores(scores[rows], scheme['percentiles'], scheme['labels'])
+
+        filtered_df.loc[:, class_column] = classes
+        rank = filtered_df.groupby(group_keys + [class_column])[score].rank(method='min', ascending=False).astype(int)
+        filtered_df.loc[:, scheme['rank_column']] = filtered_df[class_column] + rank.astype(str)
+    
+    return filtered_df
+
+
+### 기존 업체 정보와 새로 조회한 업체 정보를 순위 데이터에 합치는 함수 (새로 조회한 정보가 기존 정보보다 우선)
+def get_final_df(ranked_df, old_df , newcompany_info):
+    ranked_df['사업자등록번호'] = ranked_df['사업자등록번호'].astype(str)
+    old_df['사업자등록번호'] = old_df['사업자등록번호'].astype(str)
+    newcompany_info['사업자등록번호'] = newcompany_info['사업자등록번호'].astype(str)
+    
+    if not old_df.empty:
+        updated_df = ranked_df.merge(old_df[['사업자등록번호'] + INFO_COLUMNS], on='사업자등록번호', how='left')
+    else:
+        updated_df = ranked_df.copy()
+
+    if newcompany_info.empty:
+        return updated_df
+
+    # 사업자등록번호로 새 정보의 행 위치를 한 번에 찾음 (같은 번호가 여러 번 있으면 마지막 정보 사용)
+    new_info = newcompany_info.drop_duplicates('사업자등록번호', keep='last').set_index('사업자등록번호')
+    position = new_info.index.get_indexer(updated_df['사업자등록번호'])
+    mask = position >= 0
+
+    if mask.any():
+        for column in INFO_COLUMNS:
+            updated_df.loc[mask, column] = new_info[column].to_numpy()[position[mask]]
+
+    updated_df = updated_df.sort_values(by='가중 낙찰률', ascending=False) # 가중낙찰률 기준 내림차순 정렬
+
+    return updated_df
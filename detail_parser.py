@@ -0,0 +1,116 @@
+'''
+개찰결과 상세 페이지 파서
+- parse_bid_detail_bs4 : BeautifulSoup(html.parser)으로 상세 페이지를 파싱하는 함수 (기존 방식, 비교 기준)
+- parse_bid_detail_lxml : lxml로 필요한 항목만 골라 상세 페이지를 파싱하는 함수
+- parse_bid_detail : 사용 가능한 가장 빠른 파서로 상세 페이지를 파싱하는 함수
+- parse_pages : 여러 상세 페이지를 프로세스 풀에서 나누어 파싱하는 함수
+
+두 파서는 모두 (공고 정보 행, 개찰 순위 행 리스트)를 반환하고, 필수 항목이 없으면 예외를 발생시킴
+개찰 순위 행의 첫 번째 값은 해당 공고의 입찰공고번호(차수 포함, 예: 20240000000-00)이며 공고 정보 행과의 연결 키로 사용됨
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup as bs
+
+try:
+    import lxml.html
+    import lxml.etree
+    HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+except ImportError:  # lxml이 없으면 BeautifulSoup 파서 사용
+    HTML_PARSER = None
+
+# 공고 정보 항목 (th 문구 순서대로 행에 들어감)
+BID_LABELS = ["입찰공고번호", "공고명", "수요기관", "집행관", "실제개찰일시"]
+
+# 이 개수보다 적은 페이지는 프로세스 풀을 띄우지 않고 바로 파싱
+MIN_POOL_PAGES = 64
+
+
+### BeautifulSoup으로 상세 페이지 하나를 파싱하는 함수 (기존 방식)
+def parse_bid_detail_bs4(html):
+    soup = bs(html, "html.parser")
+
+    bid_row = []
+    for label in BID_LABELS:
+        bid_row.append(soup.find('th', string=label).find_next('td').get_text(strip=True))
+    bid_key = bid_row[0]
+
+    result_rows = []
+    rows = soup.find_all('tr')  # 결과 테이블 데이터
+    for row in rows:
+        row_data = [cell.get_text(strip=True) for cell in row.find_all('td')]
+        if len(row_data) >= 9:  # 개찰 순위 데이터만 추가
+            row_data.insert(0, bid_key)  # 리스트 맨 앞에 입찰공고번호 추가
+            result_rows.append(row_data)
+
+    return bid_row, result_rows
+
+
+### BeautifulSoup의 tag.string과 같은 규칙으로 요소의 단일 문자열을 구하는 함수 (없으면 None)
+def element_string(element):
+    children = list(element)
+    if element.text and not children:
+        return element.text
+    if not element.text and len(children) == 1 and not children[0].tail and isinstance(children[0].tag, str):
+        return element_string(children[0])
+    return None
+
+
+### get_text(strip=True)와 같은 결과를 만드는 함수 (script/style은 파싱 직후 제거되어 있음)
+def element_text(element):
+    return ''.join(text.strip() for text in element.itertext())
+
+
+### lxml로 상세 페이지 하나를 파싱하는 함수 (th는 한 번만 순회하고 필요한 td만 찾음)
+def parse_bid_detail_lxml(html):
+    root = lxml.html.fromstring(html.encode('utf-8'), parser=HTML_PARSER)
+
+    # get_text()가 건너뛰는 script/style/template 내부 문자열을 미리 제거 (뒤따르는 문자열은 유지)
+    lxml.etree.strip_elements(root, 'script', 'style', 'template', with_tail=False)
+
+    # 항목별로 문서 순서상 첫 번째 th만 기록
+    label_th = {}
+    for th in root.iter('th'):
+        label = element_string(th)
+        if label in BID_LABELS and label not in label_th:
+            label_th[label] = th
+            if len(label_th) == len(BID_LABELS):
+                break
+
+    bid_row = [element_text(label_th[label].xpath('following::td[1]')[0]) for label in BID_LABELS]
+    bid_key = bid_row[0]
+
+    result_rows = []
+    for row in root.iter('tr'):
+        cells = list(row.iter('td'))
+        if len(cells) >= 9:  # 개찰 순위 데이터만 추가
+            result_rows.append([bid_key] + [element_text(cell) for cell in cells])
+
+    return bid_row, result_rows
+
+
+### 사용 가능한 가장 빠른 파서로 상세 페이지를 파싱하는 함수
+def parse_bid_detail(html):
+    if HTML_PARSER is not None:
+        return parse_bid_detail_lxml(html)
+    return parse_bid_detail_bs4(html)
+
+
+### 프로세스 풀 작업 단위 (파싱 실패는 None으로 반환해 풀이 멈추지 않도록 함)
+def parse_page(html):
+    if html is None:
+        return None
+    try:
+        return parse_bid_detail(html)
+    except Exception:
+        return None
+
+
+### 여러 상세 페이지를 파싱하는 함수 (결과는 입력 순서 유지, 실패한 페이지는 None)
+def parse_pages(pages, processes=None, chunksize=16):
+    if processes == 1 or len(pages) < MIN_POOL_PAGES:
+        return [parse_page(html) for html in pages]
+
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as executor:
+        return list(executor.map(parse_page, pages, chunksize=chunksize))
@@ -0,0 +1,260 @@
+'''
+HTTP 요청 처리 파일
+- create_session : 커넥션을 재사용(keep-alive)하는 requests 세션을 생성하는 함수
+- HostLimiter : 호스트 하나의 요청 속도를 토큰 버킷으로 제한하고 응답에 따라 속도를 조절(AIMD)하는 클래스
+    - acquire : 요청 하나를 보낼 수 있을 때까지 대기
+    - on_success : 요청이 성공하면 속도를 조금씩 올림 (additive increase)
+    - on_throttled : 429/5xx/타임아웃이면 속도를 절반으로 줄이고, 서버가 요청한 시간(Retry-After) 동안 요청을 멈춤 (multiplicative decrease)
+    - limit : with 블록 안에서만 호출한 쪽에서 지정한 최대 속도 적용 (블록을 벗어나면 원래 최대 속도로 복원)
+- get_limiter : URL 또는 호스트 이름에 해당하는 HostLimiter를 반환하는 함수 (프로그램 전체에서 호스트별로 하나만 생성)
+- backoff_delay : 재시도 횟수에 따른 대기 시간(지수 백오프 + 무작위 지연)을 계산하는 함수
+- retry_after : 오류 응답의 Retry-After 값(초)을 구하는 함수
+- is_transient_error : 다시 시도하면 성공할 수 있는 오류(타임아웃, 연결 오류, 429/5xx)인지 확인하는 함수
+- call_with_retry : 호스트 속도 제한을 지키며 요청을 실행하고, 일시적인 오류는 백오프 후 재시도하는 함수
+- get_with_retry : call_with_retry로 GET 요청을 보내고 응답을 반환하는 함수 (시도마다 응답 시간과 크기를 metrics에 기록)
+- fetch_all : URL 리스트를 동시에 요청하고 입력 순서대로 응답 본문을 반환하는 함수
+
+나라장터 검색/상세 페이지, 조달청 API, Nominatim 위경도 변환 요청은 모두 get_limiter의 호스트별 제한을 공유함
+requests, tqdm은 요청을 보내는 함수 안에서 불러오므로 이 파일을 불러오는 것만으로는 로드되지 않음
+'''
+
+import threading
+import time
+import random
+import contextvars
+from contextlib import contextmanager, ExitStack
+from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from metrics import observe_http
+
+RETRIES = 2  # 요청 하나당 일시적인 오류 재시도 횟수
+BACKOFF_BASE = 1.0  # 첫 재시도 대기 시간 (초)
+BACKOFF_MAX = 30.0  # 재시도 대기 시간 상한 (초)
+
+# 호스트별 속도 설정 (시작 속도, 최소 속도, 최대 속도 : 초당 요청 수)
+HOST_LIMITS = {
+    'www.g2b.go.kr:8340': (1.0, 0.2, 4.0),  # 나라장터 입찰공고 검색
+    'www.g2b.go.kr:8101': (4.0, 0.5, 16.0),  # 나라장터 개찰결과 상세
+    'apis.data.go.kr': (4.0, 0.5, 16.0),  # 조달청 사용자정보 서비스 API
+    'nominatim.openstreetmap.org': (1.0, 0.1, 1.0),  # Nominatim 이용 정책상 초당 1건 이하
+}
+DEFAULT_LIMIT = (2.0, 0.2, 8.0)  # HOST_LIMITS에 없는 호스트
+
+LIMITERS = {}  # 호스트 이름 → HostLimiter
+LIMITERS_LOCK = threading.Lock()
+
+
+### 커넥션 풀을 가진 세션 생성 함수 (재시도는 call_with_retry에서 호스트 속도 제한과 함께 처리)
+def create_session(pool_size=8, headers=None):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+
+    # 동시 요청 수만큼 커넥션을 유지하도록 어댑터 설정
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if headers:
+        session.headers.update(headers)
+
+    return session
+
+
+### 호스트별 요청 속도 제한 클래스 (모든 스레드가 하나의 토큰 버킷을 공유)
+# burst : 쉬는 동안 모아 둘 수 있는 최대 토큰 수 (1이면 요청 간격을 일정하게 유지)
+class HostLimiter:
+    def __init__(self, rate=2.0, min_rate=0.2, max_rate=8.0, burst=1.0, increase=0.05, decrease=0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.ceiling = max_rate  # 호스트 설정의 최대 속도 (limit 적용 전)
+        self.caps = []  # limit으로 적용 중인 최대 속도 목록 (동시에 여러 호출이 적용하면 가장 낮은 값 사용)
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.lock = threading.Lock()
+
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0  # Retry-After 등으로 요청을 멈추는 시각
+        self.decreased_at = 0.0  # 마지막으로 속도를 줄인 시각
+
+    ### 토큰 하나를 얻을 때까지 대기 (토큰은 초당 rate개씩 채워짐)
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                delay = self.paused_until - now
+                if delay <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+
+    ### 요청 성공 시 속도를 조금씩 올림
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    ### 요청 제한/서버 오류 시 속도를 줄임
+    # 동시에 실패한 요청들이 속도를 여러 번 줄이지 않도록, 직전 감소 후 한 요청 간격 안의 실패는 한 번으로 봄
+    def on_throttled(self, pause=None):
+        with self.lock:
+            now = time.monotonic()
+            if now - self.decreased_at >= 1.0 / self.rate:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.decreased_at = now
+            if pause:
+                self.paused_until = max(self.paused_until, now + pause)
+
+    ### with 블록 안에서만 최대 속도 지정 (현재 속도가 더 빠르면 바로 낮춤)
+    # 같은 호스트를 공유하는 다른 호출도 블록이 끝날 때까지 낮춘 속도를 따르고, 블록을 벗어나면 남은 제한 중 가장 낮은 값으로 복원
+    @contextmanager
+    def limit(self, max_rate):
+        cap = max(self.min_rate, max_rate)
+        with self.lock:
+            self.caps.append(cap)
+            self._apply_caps()
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.caps.remove(cap)
+                self._apply_caps()
+
+    def _apply_caps(self):
+        self.max_rate = min([self.ceiling] + self.caps)
+        self.rate = min(self.rate, self.max_rate)
+
+
+### 호스트별 속도 제한 반환 함수 (URL 또는 호스트 이름을 받음)
+def get_limiter(url):
+    host = urlparse(url).netloc if '://' in url else url
+    with LIMITERS_LOCK:
+        if host not in LIMITERS:
+            rate, min_rate, max_rate = HOST_LIMITS.get(host, DEFAULT_LIMIT)
+            LIMITERS[host] = HostLimiter(rate, min_rate, max_rate)
+        return LIMITERS[host]
+
+
+### 재시도 대기 시간 계산 함수 (시도 횟수마다 2배, 상한 적용 후 50~100% 사이 무작위 값)
+def backoff_delay(attempts, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    return min(cap, base * 2 ** max(attempts - 1, 0)) * random.uniform(0.5, 1.0)
+
+
+### 오류 응답의 Retry-After 값 (초 또는 HTTP 날짜 형식, 없으면 None)
+def retry_after(error):
+    seconds = getattr(error, 'retry_after', None)  # geopy GeocoderRateLimited
+    if seconds is not None:
+        return float(seconds)
+
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+### 일시적인 오류 여부 확인 함수 (404 등 나머지 HTTP 오류는 다시 시도해도 같은 결과)
+def is_transient_error(error):
+    import requests
+
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+### 호스트 속도 제한을 지키며 call()을 실행하는 함수
+# transient(오류)가 True인 오류는 속도를 줄이고 백오프 후 최대 retries번 재시도, 나머지 오류는 바로 발생시킴
+def call_with_retry(limiter, call, retries=RETRIES, transient=is_transient_error):
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            result = call()
+        except Exception as e:
+            if not transient(e):
+                raise
+            pause = retry_after(e)
+            limiter.on_throttled(pause)
+            if attempt == retries:
+                raise
+            time.sleep(max(pause or 0.0, backoff_delay(attempt + 1)))
+            continue
+
+        limiter.on_success()
+        return result
+
+
+### GET 요청 함수 (오류 응답은 HTTPError로 발생시킴)
+def get_with_retry(session, url, timeout=10, retries=RETRIES):
+    def call():
+        start = time.perf_counter()
+        try:
+            response = session.get(url, timeout=timeout)
+        except Exception:
+            observe_http(url, time.perf_counter() - start, status='error')
+            raise
+        observe_http(url, time.perf_counter() - start, len(response.content), response.status_code)  # 시도마다 응답 시간 기록
+        response.raise_for_status()
+        return response
+
+    return call_with_retry(get_limiter(url), call, retries)
+
+
+### URL 리스트를 동시에 요청하는 함수 (결과는 입력 순서 유지, 실패한 요청은 None)
+# max_rps를 주면 이 호출이 끝날 때까지 요청하는 호스트들의 최대 속도를 그 값으로 제한
+def fetch_all(urls, session=None, max_workers=8, max_rps=None, timeout=10, desc=None, retries=RETRIES):
+    from tqdm import tqdm
+
+    own_session = session is None
+    if own_session:
+        session = create_session(pool_size=max_workers)
+
+    pages = [None] * len(urls)
+    errors = [None] * len(urls)
+
+    def fetch(url):
+        response = get_with_retry(session, url, timeout, retries)
+
+        # 응답 헤더에 문자셋이 없으면 본문에서 추정 (나라장터 일부 페이지는 EUC-KR)
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = response.apparent_encoding
+        return response.text
+
+    try:
+        with ExitStack() as limits, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if max_rps:
+                for host in {urlparse(url).netloc for url in urls}:
+                    limits.enter_context(get_limiter(host).limit(max_rps))
+
+            # 호출한 쪽의 실행 단계(metrics)를 작업 스레드에서도 이어서 사용
+            futures = {executor.submit(contextvars.copy_context().run, fetch, url): pos for pos, url in enumerate(urls)}
+
+            for future in tqdm(as_completed(futures), desc=desc, total=len(futures), disable=desc is None):
+                pos = futures[future]
+                try:
+                    pages[pos] = future.result()
+                except Exception as e:  # 요청 실패 시 해당 위치는 None으로 남김
+                    errors[pos] = e
+    finally:
+        if own_session:
+            session.close()
+
+    return pages, errors
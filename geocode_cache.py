@@ -0,0 +1,63 @@
+'''
+주소 위경도 변환 결과 캐시
+- normalize_address : 공백을 정리하고 호수/층수 접미사를 제거해 캐시 키로 쓸 주소를 만드는 함수
+- GeocodeCache : 정규화된 주소를 키로 위경도 변환 결과를 저장하는 SQLite 캐시 클래스
+    - get : 캐시된 결과를 (위도, 경도)로 반환 (없거나 실패 결과의 유효기간이 지났으면 None)
+    - put : 변환 결과를 저장 (위치를 찾지 못한 결과도 (None, None)으로 저장)
+
+같은 건물에 있는 업체나 여러 키워드에 반복해서 나오는 업체는 네트워크 요청 없이 캐시에서 처리됨
+'''
+
+import os
+import re
+import time
+import sqlite3
+import threading
+
+CACHE_FILE = os.path.join('data', 'geocode_cache.sqlite')
+NEGATIVE_TTL = 30 * 24 * 3600  # 위치를 찾지 못한 결과는 30일 후 다시 조회
+
+
+### 캐시 키로 쓸 주소 정규화 함수
+def normalize_address(address):
+    address = re.sub(r'\s+', ' ', str(address)).strip()  # 연속 공백 정리
+    return re.sub(r'\s\d+층?\s?\d*호$', '', address)  # 예: '1120호' 또는 '11층 120호' 제거
+
+
+class GeocodeCache:
+    def __init__(self, cache_file=CACHE_FILE, negative_ttl=NEGATIVE_TTL):
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS geocode (address TEXT PRIMARY KEY, lat REAL, lng REAL, updated_at REAL)')
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    ### 캐시된 (위도, 경도) 반환 (캐시에 없거나 만료된 실패 결과는 None)
+    def get(self, address):
+        with self.lock:
+            row = self.conn.execute('SELECT lat, lng, updated_at FROM geocode WHERE address=?', (normalize_address(address),)).fetchone()
+
+        if row is None:
+            return None
+
+        lat, lng, updated_at = row
+        if lat is None and time.time() - updated_at > self.negative_ttl:
+            return None
+        return lat, lng
+
+    ### 변환 결과 저장 (위치를 찾지 못한 경우 lat, lng는 None)
+    def put(self, address, lat, lng):
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)', (normalize_address(address), lat, lng, time.time()))
+            self.conn.commit()
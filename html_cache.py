@@ -0,0 +1,142 @@
+'''
+개찰결과 상세 페이지 원본 HTML 캐시
+- HtmlCache : 입찰공고번호와 차수(bidseq)를 키로 상세 페이지 원본을 압축 저장하는 디스크 캐시 클래스
+    - get : 캐시된 페이지 원본을 반환 (없으면 None)
+    - put : 페이지 원본을 내용 해시(sha256) 기준으로 압축 저장하고 키와 연결
+    - delete : 키에 연결된 페이지 원본을 삭제 (파싱할 수 없는 페이지를 다시 요청할 때 사용)
+    - keys : 캐시된 (입찰공고번호, 차수) 목록을 반환
+    - evict : 전체 용량이 상한을 넘으면 가장 오래 사용하지 않은 페이지부터 삭제
+
+저장 구조
+- data/_html_cache/index.sqlite : 키 → 내용 해시, 마지막 사용 시각
+- data/_html_cache/objects/ab/abcdef....gz : 내용 해시별 gzip 압축 원본 (같은 내용은 한 번만 저장)
+'''
+
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import threading
+
+CACHE_DIR = os.path.join('data', '_html_cache')
+MAX_BYTES = 1024 ** 3  # 캐시 용량 상한 (압축 후 기준 1GB)
+
+
+class HtmlCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite'), check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS pages (
+                bidno TEXT, bidseq TEXT, digest TEXT, fetched_at REAL, accessed_at REAL,
+                PRIMARY KEY (bidno, bidseq));
+            CREATE TABLE IF NOT EXISTS objects (digest TEXT PRIMARY KEY, size INTEGER);
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+            CREATE INDEX IF NOT EXISTS pages_digest ON pages (digest);
+        ''')
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    ### 내용 해시에 해당하는 압축 파일 경로
+    def object_path(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], f'{digest}.gz')
+
+    ### 캐시된 페이지 원본 반환 (없거나 파일이 손상된 경우 None)
+    def get(self, bidno, bidseq='00'):
+        with self.lock:
+            row = self.conn.execute('SELECT digest FROM pages WHERE bidno=? AND bidseq=?', (str(bidno), bidseq)).fetchone()
+            if row is None:
+                return None
+
+            try:
+                with gzip.open(self.object_path(row[0]), 'rb') as f:
+                    html = f.read().decode('utf-8')
+            except (OSError, EOFError):
+                self.conn.execute('DELETE FROM pages WHERE bidno=? AND bidseq=?', (str(bidno), bidseq))
+                self.conn.commit()
+                return None
+
+            self.conn.execute('UPDATE pages SET accessed_at=? WHERE bidno=? AND bidseq=?', (time.time(), str(bidno), bidseq))
+            self.conn.commit()
+            return html
+
+    ### 페이지 원본 저장 (같은 내용이 이미 있으면 파일은 다시 쓰지 않음)
+    def put(self, bidno, bidseq, html):
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        now = time.time()
+
+        with self.lock:
+            if self.conn.execute('SELECT 1 FROM objects WHERE digest=?', (digest,)).fetchone() is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f'{path}.tmp'
+                with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self.conn.execute('INSERT INTO objects VALUES (?, ?)', (digest, os.path.getsize(path)))
+
+            old = self.conn.execute('SELECT digest FROM pages WHERE bidno=? AND bidseq=?', (str(bidno), bidseq)).fetchone()
+            self.conn.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)', (str(bidno), bidseq, digest, now, now))
+            if old is not None and old[0] != digest:
+                self.drop_unreferenced(old[0])
+            self.conn.commit()
+
+        self.evict()
+
+    ### 페이지 원본 삭제 (다른 키가 같은 내용을 참조하면 파일은 유지)
+    def delete(self, bidno, bidseq='00'):
+        with self.lock:
+            row = self.conn.execute('SELECT digest FROM pages WHERE bidno=? AND bidseq=?', (str(bidno), bidseq)).fetchone()
+            if row is None:
+                return
+            self.conn.execute('DELETE FROM pages WHERE bidno=? AND bidseq=?', (str(bidno), bidseq))
+            self.drop_unreferenced(row[0])
+            self.conn.commit()
+
+    ### 캐시된 (입찰공고번호, 차수) 목록
+    def keys(self):
+        with self.lock:
+            return self.conn.execute('SELECT bidno, bidseq FROM pages').fetchall()
+
+    ### 어떤 키도 참조하지 않는 압축 파일 삭제 (lock을 잡은 상태에서 호출)
+    def drop_unreferenced(self, digest):
+        if self.conn.execute('SELECT 1 FROM pages WHERE digest=? LIMIT 1', (digest,)).fetchone() is not None:
+            return
+        self.conn.execute('DELETE FROM objects WHERE digest=?', (digest,))
+        try:
+            os.remove(self.object_path(digest))
+        except FileNotFoundError:
+            pass
+
+    ### 용량 상한을 넘으면 가장 오래 사용하지 않은 페이지부터 상한의 90%까지 삭제
+    def evict(self):
+        with self.lock:
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM objects').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            target = self.max_bytes * 0.9
+            rows = self.conn.execute('SELECT bidno, bidseq, digest FROM pages ORDER BY accessed_at').fetchall()
+            for bidno, bidseq, digest in rows:
+                if total <= target:
+                    break
+                size = self.conn.execute('SELECT size FROM objects WHERE digest=?', (digest,)).fetchone()
+                self.conn.execute('DELETE FROM pages WHERE bidno=? AND bidseq=?', (bidno, bidseq))
+                self.drop_unreferenced(digest)
+                if size is not None and self.conn.execute('SELECT 1 FROM objects WHERE digest=?', (digest,)).fetchone() is None:
+                    total -= size[0]
+            self.conn.commit()
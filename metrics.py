@@ -0,0 +1,306 @@
+'''
+파이프라인 단계별 실행 지표 수집 및 내보내기
+- peak_rss : 프로세스 최대 메모리 사용량(바이트)을 반환하는 함수 (측정할 수 없으면 None)
+- Histogram : 값의 분포를 구간(버킷)별 개수로 기록하는 클래스 (Prometheus 히스토그램과 같은 누적 구간)
+- Metrics : 단계별 시간/처리 건수/바이트, 호스트별 HTTP 응답 시간, 캐시 적중 횟수를 모으는 클래스
+    - stage : with 블록의 실행 시간과 메모리를 단계 지표에 기록하는 컨텍스트 관리자
+    - add : 단계의 처리 건수, 바이트, 오류 건수 추가
+    - observe_http : HTTP 요청 하나의 응답 시간, 응답 크기, 상태 코드 기록 (실행 중인 단계의 요청 수와 바이트에도 더함)
+    - cache : 캐시 적중/미적중 횟수 추가
+    - report : 지금까지의 지표를 dict로 반환
+- stage / add / observe_http / cache : 프로그램 전체에서 공유하는 Metrics의 같은 이름 메서드를 호출하는 함수
+- reset_metrics : 공유 Metrics를 새로 만드는 함수 (새 실행 시작)
+- to_prometheus : report를 Prometheus 텍스트 형식(node exporter textfile collector)으로 변환하는 함수
+- export_metrics : JSON 보고서와 Prometheus textfile을 저장하는 함수 (임시 파일에 쓴 뒤 교체)
+
+단계 (STAGES)
+- search : 검색 결과 페이지 수집 / detail_fetch : 상세 페이지 요청 / parse : 상세 페이지 파싱
+- enrichment : 업체 기본 정보 조회 / geocoding : 위경도 변환 / spatial_match : 시군구 매칭 및 집계 / save : 결과 저장
+
+단계 지표
+- seconds : 단계가 하나라도 실행 중이던 시간 (배치 실행 등에서 여러 스레드가 동시에 실행해도 겹치는 시간은 한 번만 셈)
+- busy_seconds : 블록별 실행 시간 합계 (스레드 수만큼 늘어남)
+- peak_rss_bytes : 단계가 끝난 시점까지의 프로세스 최대 메모리, rss_growth_bytes : 블록 하나가 최대 메모리를 늘린 양 중 최댓값
+'''
+
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+try:
+    import resource
+except ImportError:  # Windows (psutil이 있으면 psutil 사용)
+    resource = None
+
+METRICS_DIR = os.path.join('data', '_metrics')  # 실행별 JSON 보고서 저장 폴더
+TEXTFILE_NAME = 'nara_pipeline.prom'  # Prometheus textfile (node exporter의 --collector.textfile.directory에 두면 수집됨)
+STAGES = ['search', 'detail_fetch', 'parse', 'enrichment', 'geocoding', 'spatial_match', 'save']
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]  # HTTP 응답 시간 구간 (초)
+STAGE_FIELDS = ['seconds', 'busy_seconds', 'calls', 'items', 'bytes', 'requests', 'errors', 'peak_rss_bytes', 'rss_growth_bytes']
+
+CURRENT_STAGE = contextvars.ContextVar('metrics_stage', default=None)  # 지금 실행 중인 단계 (HTTP 바이트를 단계에 더할 때 사용)
+
+
+### 프로세스 최대 메모리 사용량 (바이트)
+def peak_rss():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # macOS는 바이트, 그 외는 KB 단위
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', info.rss)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        pos = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[pos] += 1
+        self.sum += value
+        self.count += 1
+
+    ### 누적 구간별 개수 ({'0.05': n, ..., '+Inf': count})
+    def cumulative(self):
+        result, total = {}, 0
+        for bound, count in zip(self.buckets + ['+Inf'], self.counts):
+            total += count
+            result[str(bound)] = total
+        return result
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.http = {}
+        self.caches = {}
+
+    ### 단계 지표 (lock을 잡은 상태에서 호출, 없으면 생성)
+    def stage_stats(self, name):
+        if name not in self.stages:
+            self.stages[name] = dict.fromkeys(STAGE_FIELDS, 0)
+            self.stages[name].update(seconds=0.0, busy_seconds=0.0, active=0, active_since=None)
+        return self.stages[name]
+
+    ### with 블록 하나를 단계 실행으로 기록 (블록에서 예외가 발생하면 오류 건수에 더하고 예외는 그대로 전달)
+    @contextmanager
+    def stage(self, name):
+        start, rss_start = time.perf_counter(), peak_rss()
+        with self.lock:
+            stats = self.stage_stats(name)
+            stats['calls'] += 1
+            if not stats['active']:
+                stats['active_since'] = start
+            stats['active'] += 1
+
+        token = CURRENT_STAGE.set(name)
+        try:
+            yield
+        except Exception:
+            self.add(name, errors=1)
+            raise
+        finally:
+            CURRENT_STAGE.reset(token)
+            end, rss_end = time.perf_counter(), peak_rss()
+            with self.lock:
+                stats['busy_seconds'] += end - start
+                stats['active'] -= 1
+                if not stats['active']:
+                    stats['seconds'] += end - stats['active_since']
+                if rss_end is not None:
+                    stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'], rss_end)
+                    stats['rss_growth_bytes'] = max(stats['rss_growth_bytes'], rss_end - rss_start)
+
+    ### 단계의 처리 건수, 바이트, 오류 건수 추가
+    def add(self, name, items=0, nbytes=0, errors=0):
+        with self.lock:
+            stats = self.stage_stats(name)
+            stats['items'] += items
+            stats['bytes'] += nbytes
+            stats['errors'] += errors
+
+    ### HTTP 요청 하나 기록 (status : 상태 코드, 응답을 받지 못했으면 'error')
+    def observe_http(self, url, seconds, nbytes=0, status=None):
+        host = urlparse(url).netloc or url
+        name = CURRENT_STAGE.get()
+        with self.lock:
+            http = self.http.setdefault(host, {'latency': Histogram(), 'bytes': 0, 'statuses': {}})
+            http['latency'].observe(seconds)
+            http['bytes'] += nbytes
+            http['statuses'][str(status)] = http['statuses'].get(str(status), 0) + 1
+            if name is not None:
+                stats = self.stage_stats(name)
+                stats['requests'] += 1
+                stats['bytes'] += nbytes
+
+    ### 캐시 적중/미적중 횟수 추가
+    def cache(self, name, hits=0, misses=0):
+        with self.lock:
+            counts = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+            counts['hits'] += hits
+            counts['misses'] += misses
+
+    ### 지금까지의 지표 (실행 중인 단계의 시간은 지금까지 실행된 만큼 포함)
+    def report(self):
+        now = time.perf_counter()
+        with self.lock:
+            stages = {}
+            for name in STAGES + sorted(set(self.stages) - set(STAGES)):
+                if name not in self.stages:
+                    continue
+                stats = self.stages[name]
+                entry = {field: stats[field] for field in STAGE_FIELDS}
+                if stats['active']:
+                    entry['seconds'] += now - stats['active_since']
+                entry['seconds'] = round(entry['seconds'], 3)
+                entry['busy_seconds'] = round(entry['busy_seconds'], 3)
+                entry['items_per_second'] = round(entry['items'] / entry['seconds'], 3) if entry['seconds'] else None
+                stages[name] = entry
+
+            http = {}
+            for host, stats in sorted(self.http.items()):
+                latency = stats['latency']
+                http[host] = {
+                    'requests': latency.count,
+                    'errors': sum(count for status, count in stats['statuses'].items() if not status.startswith(('2', '3'))),
+                    'bytes': stats['bytes'],
+                    'statuses': dict(sorted(stats['statuses'].items())),
+                    'latency_mean_seconds': round(latency.sum / latency.count, 4) if latency.count else None,
+                    'latency_sum_seconds': round(latency.sum, 4),
+                    'latency_buckets': latency.cumulative(),
+                }
+
+            caches = {}
+            for name, counts in sorted(self.caches.items()):
+                lookups = counts['hits'] + counts['misses']
+                caches[name] = dict(counts, hit_ratio=round(counts['hits'] / lookups, 4) if lookups else None)
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_seconds': round(now - self.start, 3),
+            'peak_rss_bytes': peak_rss(),
+            'stages': stages,
+            'http': http,
+            'caches': caches,
+        }
+
+
+METRICS = Metrics()  # 프로그램 전체에서 공유 (reset_metrics로 새로 시작)
+
+
+def stage(name):
+    return METRICS.stage(name)
+
+
+def add(name, items=0, nbytes=0, errors=0):
+    METRICS.add(name, items, nbytes, errors)
+
+
+def observe_http(url, seconds, nbytes=0, status=None):
+    METRICS.observe_http(url, seconds, nbytes, status)
+
+
+def cache(name, hits=0, misses=0):
+    METRICS.cache(name, hits, misses)
+
+
+### 새 실행 시작 (이전 지표는 버림)
+def reset_metrics():
+    global METRICS
+    METRICS = Metrics()
+    return METRICS
+
+
+### Prometheus 레이블 값 이스케이프
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+### report를 Prometheus 텍스트 형식으로 변환 (값은 모두 마지막 실행 기준, labels는 모든 지표에 붙는 레이블)
+def to_prometheus(report, labels=None):
+    lines = []
+    base = ''.join(f',{key}="{escape_label(value)}"' for key, value in (labels or {}).items())
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for suffix, sample_labels, value in samples:
+            label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in sample_labels.items()) + base
+            label_text = label_text.lstrip(',')
+            lines.append(f'{name}{suffix}{{{label_text}}} {value}' if label_text else f'{name}{suffix} {value}')
+
+    metric('nara_run_timestamp_seconds', 'gauge', '마지막 실행 시작 시각 (unix time)',
+           [('', {}, datetime.fromisoformat(report['started_at']).timestamp())])
+    metric('nara_run_duration_seconds', 'gauge', '마지막 실행 전체 시간', [('', {}, report['elapsed_seconds'])])
+    if report['peak_rss_bytes'] is not None:
+        metric('nara_run_peak_rss_bytes', 'gauge', '마지막 실행의 프로세스 최대 메모리', [('', {}, report['peak_rss_bytes'])])
+
+    stages = report['stages']
+    for field, help_text in [('seconds', '단계가 실행 중이던 시간 (동시 실행은 한 번만 셈)'),
+                             ('busy_seconds', '단계 블록 실행 시간 합계'),
+                             ('calls', '단계 실행 횟수'),
+                             ('items', '단계 처리 건수'),
+                             ('bytes', '단계에서 받은 바이트'),
+                             ('requests', '단계에서 보낸 HTTP 요청 수'),
+                             ('errors', '단계 오류 건수'),
+                             ('peak_rss_bytes', '단계가 끝난 시점까지의 프로세스 최대 메모리')]:
+        metric(f'nara_stage_{field}', 'gauge', help_text, [('', {'stage': name}, stats[field]) for name, stats in stages.items()])
+
+    http = report['http']
+    samples = []
+    for host, stats in http.items():
+        samples += [('_bucket', {'host': host, 'le': bound}, count) for bound, count in stats['latency_buckets'].items()]
+        samples += [('_sum', {'host': host}, stats['latency_sum_seconds']), ('_count', {'host': host}, stats['requests'])]
+    metric('nara_http_request_duration_seconds', 'histogram', '호스트별 HTTP 응답 시간', samples)
+    metric('nara_http_response_bytes', 'gauge', '호스트별 받은 바이트', [('', {'host': host}, stats['bytes']) for host, stats in http.items()])
+    metric('nara_http_responses', 'gauge', '호스트/상태 코드별 응답 수',
+           [('', {'host': host, 'status': status}, count) for host, stats in http.items() for status, count in stats['statuses'].items()])
+
+    caches = report['caches']
+    metric('nara_cache_hits', 'gauge', '캐시 적중 횟수', [('', {'cache': name}, counts['hits']) for name, counts in caches.items()])
+    metric('nara_cache_misses', 'gauge', '캐시 미적중 횟수', [('', {'cache': name}, counts['misses']) for name, counts in caches.items()])
+    metric('nara_cache_hit_ratio', 'gauge', '캐시 적중률',
+           [('', {'cache': name}, counts['hit_ratio']) for name, counts in caches.items() if counts['hit_ratio'] is not None])
+
+    return '\n'.join(lines) + '\n'
+
+
+### 임시 파일에 쓴 뒤 교체 (node exporter가 쓰는 중인 파일을 읽지 않도록)
+def write_atomic(path, text):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+### JSON 보고서(metrics_dir/metrics_<시각>.json)와 Prometheus textfile(textfile_dir/nara_pipeline.prom) 저장
+# run_info는 보고서에 그대로 기록 (실행 방식, 키워드 등), 반환값 : (JSON 파일 경로, textfile 경로)
+def export_metrics(run_info=None, metrics_dir=METRICS_DIR, textfile_dir=None):
+    report = METRICS.report()
+    report['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    report['run'] = run_info or {}
+
+    json_file = os.path.join(metrics_dir, f"metrics_{METRICS.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    write_atomic(json_file, json.dumps(report, ensure_ascii=False, indent=2))
+
+    textfile = os.path.join(textfile_dir or metrics_dir, TEXTFILE_NAME)
+    labels = {'run': report['run']['mode']} if 'mode' in report['run'] else None
+    write_atomic(textfile, to_prometheus(report, labels))
+    return json_file, textfile